@@ -0,0 +1,13 @@
+from django.apps import AppConfig
+
+
+class AnalyserConfig(AppConfig):
+    name = 'analyser'
+
+    def ready(self):
+        from ml_model.metrics import register_collector
+        from ml_model.warmup import register_warm_up
+        from . import parse_cache, parse_pool
+
+        register_collector('resume_parse_cache', parse_cache.cache_stats)
+        register_warm_up('parse_pool', parse_pool.start_parse_pool)
@@ -0,0 +1,129 @@
+import os
+import random
+import tempfile
+import time
+import docx
+from django.core.management.base import BaseCommand, CommandError
+from analyser.utils import EXTRACTORS, parse_resume
+
+WORDS = [
+    'python', 'java', 'kubernetes', 'aws', 'sql', 'react', 'django', 'designed', 'developed',
+    'implemented', 'managed', 'delivered', 'scalable', 'distributed', 'systems', 'services',
+    'platform', 'customers', 'team', 'engineering', 'performance', 'migration', 'architecture',
+    'the', 'and', 'with', 'for', 'of', 'to', 'in', 'on', 'using', 'across',
+]
+LINES_PER_PAGE = 45
+
+def _lines(rng, count):
+    return [' '.join(rng.choices(WORDS, k=10)) for _ in range(count)]
+
+def _pdf_escape(text):
+    return text.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+def write_pdf(path, pages):
+    """Write a minimal text-only PDF with one content stream per page."""
+    objects = ['<< /Type /Catalog /Pages 2 0 R >>', None, '<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>']
+    page_ids = []
+    for lines in pages:
+        text = ' T* '.join(f'({_pdf_escape(line)}) Tj' for line in lines)
+        stream = f'BT /F1 10 Tf 14 TL 50 780 Td {text} ET'
+        objects.append(f'<< /Length {len(stream)} >>\nstream\n{stream}\nendstream')
+        objects.append(f'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] '
+                       f'/Resources << /Font << /F1 3 0 R >> >> /Contents {len(objects)} 0 R >>')
+        page_ids.append(len(objects))
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(f'{i} 0 R' for i in page_ids)}] /Count {len(page_ids)} >>"
+
+    body = b'%PDF-1.4\n'
+    offsets = []
+    for number, obj in enumerate(objects, start=1):
+        offsets.append(len(body))
+        body += f'{number} 0 obj\n{obj}\nendobj\n'.encode('latin-1')
+    xref = len(body)
+    body += f'xref\n0 {len(objects) + 1}\n0000000000 65535 f \n'.encode('latin-1')
+    body += ''.join(f'{offset:010d} 00000 n \n' for offset in offsets).encode('latin-1')
+    body += f'trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n'.encode('latin-1')
+    with open(path, 'wb') as file:
+        file.write(body)
+
+def write_docx(path, pages, rng):
+    """Write a DOCX whose content alternates between paragraphs and layout tables."""
+    document = docx.Document()
+    for lines in pages:
+        half = len(lines) // 2
+        for line in lines[:half]:
+            document.add_paragraph(line)
+        table = document.add_table(rows=0, cols=2)
+        for line in lines[half:]:
+            cells = table.add_row().cells
+            cells[0].text = rng.choice(WORDS).title()
+            cells[1].text = line
+    document.save(path)
+
+def write_txt(path, pages):
+    with open(path, 'w', encoding='utf-8') as file:
+        file.write('\n'.join(line for lines in pages for line in lines))
+
+def build_corpus(directory, page_counts, files_per_size, seed):
+    """Generate a synthetic PDF/DOCX/TXT corpus and return the file paths."""
+    rng = random.Random(seed)
+    paths = []
+    for pages in page_counts:
+        for index in range(files_per_size):
+            content = [_lines(rng, LINES_PER_PAGE) for _ in range(pages)]
+            stem = os.path.join(directory, f'resume_{pages}p_{index}')
+            write_pdf(stem + '.pdf', content)
+            write_docx(stem + '.docx', content, rng)
+            write_txt(stem + '.txt', content)
+            paths.extend([stem + '.pdf', stem + '.docx', stem + '.txt'])
+    return paths
+
+class Command(BaseCommand):
+    help = 'Measure resume text extraction throughput per file format'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--corpus', help='Directory of sample resumes (default: generate a synthetic corpus)')
+        parser.add_argument('--pages', type=int, nargs='+', default=[1, 3, 10, 50],
+                            help='Page counts for the synthetic corpus')
+        parser.add_argument('--files-per-size', type=int, default=3)
+        parser.add_argument('--max-pages', type=int, help='Override RESUME_MAX_PAGES')
+        parser.add_argument('--max-chars', type=int, help='Override RESUME_MAX_CHARS')
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            if options['corpus']:
+                if not os.path.isdir(options['corpus']):
+                    raise CommandError(f"Corpus directory not found: {options['corpus']}")
+                paths = sorted(
+                    entry.path for entry in os.scandir(options['corpus'])
+                    if os.path.splitext(entry.name)[1].lower() in EXTRACTORS
+                )
+            else:
+                self.stdout.write('Generating synthetic corpus...')
+                paths = build_corpus(temp_dir, options['pages'], options['files_per_size'], options['seed'])
+            
+            stats = {}
+            for path in paths:
+                extension = os.path.splitext(path)[1].lower()
+                size = os.path.getsize(path)
+                start = time.perf_counter()
+                try:
+                    text = parse_resume(path, max_pages=options['max_pages'], max_chars=options['max_chars'])
+                except Exception as e:
+                    self.stderr.write(f'{os.path.basename(path)}: {str(e)}')
+                    continue
+                elapsed = time.perf_counter() - start
+                
+                entry = stats.setdefault(extension, {'files': 0, 'bytes': 0, 'chars': 0, 'seconds': 0.0})
+                entry['files'] += 1
+                entry['bytes'] += size
+                entry['chars'] += len(text)
+                entry['seconds'] += elapsed
+        
+        self.stdout.write(f"{'format':<7} {'files':>6} {'MB':>8} {'files/s':>9} {'MB/s':>8} {'chars/s':>12}")
+        for extension, entry in sorted(stats.items()):
+            seconds = entry['seconds'] or float('inf')
+            self.stdout.write(
+                f"{extension:<7} {entry['files']:>6} {entry['bytes'] / 1e6:>8.2f} {entry['files'] / seconds:>9.1f} "
+                f"{entry['bytes'] / 1e6 / seconds:>8.2f} {entry['chars'] / seconds:>12,.0f}"
+            )
@@ -0,0 +1,212 @@
+import html
+import json
+import math
+import os
+import random
+import re
+import statistics
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urljoin
+
+import requests
+from django.core.management.base import BaseCommand, CommandError
+
+from ml_model.utils import get_skill_matcher
+
+SCENARIOS = ('index', 'generate')
+FINISHED_JOB_STATUSES = ('succeeded', 'failed')
+# The result page hands the section evaluation stream to its script via this attribute
+STREAM_URL_RE = re.compile(r'data-stream-url="([^"]+)"')
+FILLER = [
+    'designed', 'developed', 'implemented', 'managed', 'delivered', 'scalable', 'distributed',
+    'systems', 'services', 'platform', 'customers', 'team', 'engineering', 'performance',
+    'the', 'and', 'with', 'for', 'of', 'to', 'in', 'using',
+]
+
+
+def synthetic_resume(rng, skills, lines=60):
+    """Resume text with section headers and taxonomy skills mixed into filler prose."""
+    sections = ['Summary', 'Experience', 'Education', 'Skills', 'Projects']
+    step = max(1, lines // len(sections))
+    out = []
+    for index in range(lines):
+        if index % step == 0 and index // step < len(sections):
+            out.append(sections[index // step])
+        words = rng.choices(FILLER, k=10) + rng.sample(skills, 2)
+        rng.shuffle(words)
+        out.append(' '.join(words) + '.')
+    return '\n'.join(out)
+
+
+def percentile(ordered, fraction):
+    if not ordered:
+        return None
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(fraction * len(ordered)) - 1))]
+
+
+class LoadTestClient:
+    """One simulated user: a session with its own CSRF token and connection."""
+
+    def __init__(self, base_url, timeout):
+        self.base_url = base_url
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.get(urljoin(base_url, '/'), timeout=timeout).raise_for_status()
+        self.csrf_token = self.session.cookies.get('csrftoken', '')
+
+    def _post(self, path, **kwargs):
+        url = urljoin(self.base_url, path)
+        data = dict(kwargs.pop('data', {}), csrfmiddlewaretoken=self.csrf_token)
+        headers = dict(kwargs.pop('headers', {}), Referer=url)
+        return self.session.post(url, data=data, headers=headers, timeout=self.timeout,
+                                 allow_redirects=False, **kwargs)
+
+    def analyse(self, filename, content, job_description):
+        """
+        Upload a resume to the index view, then read its section evaluation
+        stream to the end when the result page has one, as the browser would.
+        """
+        response = self._post('/', data={'job_description': job_description},
+                              files={'resume': (filename, content)})
+        if response.status_code != 200:
+            return f'HTTP {response.status_code}'
+        match = STREAM_URL_RE.search(response.text)
+        if match is None:
+            return None
+        return self.read_evaluation_stream(urljoin(self.base_url, html.unescape(match.group(1))))
+
+    def read_evaluation_stream(self, url):
+        """Consume server-sent section evaluations until ``done``; return the first error event."""
+        with self.session.get(url, stream=True, timeout=self.timeout) as response:
+            if response.status_code != 200:
+                return f'stream HTTP {response.status_code}'
+            event, error = None, None
+            for line in response.iter_lines(decode_unicode=True):
+                if line.startswith('event: '):
+                    event = line[len('event: '):]
+                    if event == 'done':
+                        return error
+                elif line.startswith('data: ') and event == 'error' and error is None:
+                    error = f"stream error: {json.loads(line[len('data: '):])['error']}"
+        return 'stream ended before done'
+
+    def generate(self, resume_text, job_description, wait, poll_interval, job_timeout):
+        """Queue an improved resume; optionally poll until the job finishes or ``job_timeout`` passes."""
+        response = self._post('/generate/', data={'resume_text': resume_text, 'job_description': job_description},
+                              headers={'Accept': 'application/json'})
+        if response.status_code != 202:
+            return f'HTTP {response.status_code}'
+        if not wait:
+            return None
+        status_url = urljoin(self.base_url, response.json()['status_url'])
+        deadline = time.monotonic() + job_timeout
+        while True:
+            status = self.session.get(status_url, timeout=self.timeout).json()
+            if status['status'] in FINISHED_JOB_STATUSES:
+                return None if status['status'] == 'succeeded' else f"job failed: {status['error']}"
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return 'job timed out'
+            time.sleep(min(poll_interval, remaining))
+
+
+class Command(BaseCommand):
+    help = 'Fire concurrent resume uploads and improve requests at a running server and report latency'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', default='http://127.0.0.1:8000', help='Base URL of the running app')
+        parser.add_argument('--scenario', choices=SCENARIOS, nargs='+', default=list(SCENARIOS))
+        parser.add_argument('--requests', type=int, default=100, help='Requests per scenario')
+        parser.add_argument('--concurrency', type=int, default=10, help='Concurrent simulated users')
+        parser.add_argument('--resume', nargs='*', default=[],
+                            help='Resume files to upload (default: synthetic TXT resumes)')
+        parser.add_argument('--jd', default=None, help='Job description text (default: synthetic)')
+        parser.add_argument('--wait-jobs', action='store_true',
+                            help='Time generate/ requests until their job finishes (needs run_job_worker)')
+        parser.add_argument('--poll-interval', type=float, default=0.5)
+        parser.add_argument('--job-timeout', type=float, default=600.0,
+                            help='With --wait-jobs, count jobs still pending after this many seconds as failures')
+        parser.add_argument('--timeout', type=float, default=600.0, help='Per-request timeout in seconds')
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--output', default=None, help='Also write the report to this JSON file')
+
+    def _documents(self, options, rng, skills):
+        if options['resume']:
+            documents = []
+            for path in options['resume']:
+                if not os.path.exists(path):
+                    raise CommandError(f'Resume not found: {path}')
+                with open(path, 'rb') as file:
+                    content = file.read()
+                documents.append((os.path.basename(path), content, content.decode('utf-8', 'ignore')))
+            return documents
+        documents = []
+        for index in range(20):
+            text = synthetic_resume(rng, skills)
+            documents.append((f'resume_{index}.txt', text.encode('utf-8'), text))
+        return documents
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        skills = sorted(get_skill_matcher().aliases)
+        documents = self._documents(options, rng, skills)
+        job_description = options['jd'] or ' '.join(rng.choices(FILLER, k=120) + rng.sample(skills, 15))
+
+        clients = threading.local()
+
+        def client():
+            if not hasattr(clients, 'client'):
+                clients.client = LoadTestClient(options['url'], options['timeout'])
+            return clients.client
+
+        def run_one(scenario, index):
+            filename, content, text = documents[index % len(documents)]
+            start = time.perf_counter()
+            try:
+                if scenario == 'index':
+                    error = client().analyse(filename, content, job_description)
+                else:
+                    error = client().generate(text, job_description, options['wait_jobs'],
+                                              options['poll_interval'], options['job_timeout'])
+            except (requests.RequestException, ValueError, KeyError) as e:
+                error = type(e).__name__
+            return time.perf_counter() - start, error
+
+        report = {'url': options['url'], 'concurrency': options['concurrency'], 'scenarios': {}}
+        for scenario in options['scenario']:
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=options['concurrency']) as executor:
+                outcomes = list(executor.map(lambda i: run_one(scenario, i), range(options['requests'])))
+            elapsed = time.perf_counter() - start
+
+            latencies = sorted(latency for latency, error in outcomes if error is None)
+            errors = Counter(error for _, error in outcomes if error is not None)
+            summary = {
+                'requests': len(outcomes),
+                'succeeded': len(latencies),
+                'error_rate': round(sum(errors.values()) / len(outcomes), 4) if outcomes else 0.0,
+                'errors': dict(errors),
+                'elapsed_s': round(elapsed, 3),
+                'throughput_rps': round(len(latencies) / elapsed, 3) if elapsed else 0.0,
+            }
+            for name, fraction in (('p50', 0.5), ('p90', 0.9), ('p95', 0.95), ('p99', 0.99)):
+                value = percentile(latencies, fraction)
+                summary[f'{name}_ms'] = round(value * 1000, 1) if value is not None else None
+            summary['mean_ms'] = round(statistics.mean(latencies) * 1000, 1) if latencies else None
+            summary['max_ms'] = round(latencies[-1] * 1000, 1) if latencies else None
+            report['scenarios'][scenario] = summary
+
+            self.stdout.write(
+                f"{scenario:<9} {summary['succeeded']}/{summary['requests']} ok  "
+                f"{summary['throughput_rps']:.2f} req/s  p50 {summary['p50_ms']} ms  "
+                f"p95 {summary['p95_ms']} ms  p99 {summary['p99_ms']} ms  "
+                f"errors {summary['error_rate']:.1%} {dict(errors) or ''}"
+            )
+
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as file:
+                json.dump(report, file, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Wrote report to {options['output']}"))
@@ -0,0 +1,171 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+
+from django.conf import settings
+from django.db import DatabaseError
+from django.db.models import Sum
+from django.utils import timezone
+
+from ml_model.lru import LRUCache
+from ml_model.models import ParsedResume
+from ml_model.utils import extract_skills, get_skill_matcher
+
+from .utils import PARSER_VERSION, parse_limits
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MEMORY_ENTRIES = 256
+DEFAULT_MAX_BYTES = 100 * 1024 * 1024
+DEFAULT_EVICT_EVERY = 50
+
+
+def _memory_entries():
+    return getattr(settings, 'PARSE_CACHE_MEMORY_ENTRIES', DEFAULT_MEMORY_ENTRIES)
+
+
+_lock = threading.Lock()
+_memory = LRUCache(max_entries=_memory_entries)
+_stats = {
+    'memory_hits': 0,
+    'db_hits': 0,
+    'misses': 0,
+    'stores': 0,
+    'evictions': 0,
+}
+# Stores by this process since the persistent tier was last evicted
+_stores_since_evict = 0
+
+
+def cache_enabled():
+    return getattr(settings, 'PARSE_CACHE_ENABLED', True)
+
+
+def make_cache_key(digest, filename):
+    """
+    Key a parse by the upload's SHA-256 plus everything that shapes the output:
+    the file type, the parser version and the extraction limits.
+    """
+    max_pages, max_chars = parse_limits()
+    payload = json.dumps({
+        'digest': digest,
+        'extension': os.path.splitext(filename)[1].lower(),
+        'parser_version': PARSER_VERSION,
+        'max_pages': max_pages,
+        'max_chars': max_chars,
+    }, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def _current_skills(text, skills, skills_version):
+    """Re-extract skills if the taxonomy changed since they were cached."""
+    if skills_version == get_skill_matcher().version:
+        return skills
+    return extract_skills(text)
+
+
+def get(key):
+    """Return the cached ``(text, skills)`` for ``key`` or None."""
+    if not cache_enabled():
+        return None
+
+    entry = _memory.get(key)
+    if entry is not None:
+        with _lock:
+            _stats['memory_hits'] += 1
+        text, skills, skills_version = entry
+        return text, _current_skills(text, skills, skills_version)
+
+    try:
+        record = ParsedResume.objects.filter(key=key).only('text', 'skills', 'skills_version').first()
+        if record is not None:
+            ParsedResume.objects.filter(pk=record.pk).update(last_accessed=timezone.now())
+    except DatabaseError as e:
+        logger.warning("Parse cache lookup failed: %s", e)
+        record = None
+
+    if record is None:
+        with _lock:
+            _stats['misses'] += 1
+        return None
+
+    with _lock:
+        _stats['db_hits'] += 1
+    skills = _current_skills(record.text, record.skills, record.skills_version)
+    _memory.set(key, (record.text, skills, get_skill_matcher().version))
+    return record.text, skills
+
+
+def _evict_due():
+    global _stores_since_evict
+    with _lock:
+        _stores_since_evict += 1
+        if _stores_since_evict < getattr(settings, 'PARSE_CACHE_EVICT_EVERY', DEFAULT_EVICT_EVERY):
+            return False
+        _stores_since_evict = 0
+        return True
+
+
+def store(key, text, skills):
+    """
+    Store a parsed resume in both tiers. Every PARSE_CACHE_EVICT_EVERY stores
+    the persistent tier's size limit is enforced, so it can briefly hold that
+    many resumes over PARSE_CACHE_MAX_BYTES.
+    """
+    if not cache_enabled():
+        return
+
+    skills = list(skills)
+    skills_version = get_skill_matcher().version
+    _memory.set(key, (text, skills, skills_version))
+    with _lock:
+        _stats['stores'] += 1
+
+    try:
+        ParsedResume.objects.update_or_create(
+            key=key,
+            defaults={
+                'text': text,
+                'skills': skills,
+                'skills_version': skills_version,
+                'size': len(text.encode('utf-8')),
+                'last_accessed': timezone.now(),
+            }
+        )
+        if _evict_due():
+            evict()
+    except DatabaseError as e:
+        logger.warning("Parse cache store failed: %s", e)
+
+
+def evict():
+    """Drop least recently used entries until the persistent tier is under its size limit."""
+    max_bytes = getattr(settings, 'PARSE_CACHE_MAX_BYTES', DEFAULT_MAX_BYTES)
+    total = ParsedResume.objects.aggregate(total=Sum('size'))['total'] or 0
+    if total <= max_bytes:
+        return
+
+    stale_ids = []
+    for pk, size in ParsedResume.objects.order_by('last_accessed').values_list('pk', 'size').iterator():
+        if total <= max_bytes:
+            break
+        stale_ids.append(pk)
+        total -= size
+    ParsedResume.objects.filter(pk__in=stale_ids).delete()
+    with _lock:
+        _stats['evictions'] += len(stale_ids)
+
+
+def clear():
+    """Empty the in-memory tier (the persistent tier is left untouched)."""
+    _memory.clear()
+
+
+def cache_stats():
+    """Return a snapshot of the cache counters."""
+    with _lock:
+        stats = dict(_stats)
+    stats['memory_entries'] = len(_memory)
+    return stats
@@ -0,0 +1,251 @@
+import atexit
+import logging
+import multiprocessing
+import os
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+
+from .utils import (
+    PARSE_MEMORY_LIMIT, PARSE_TIMEOUT, PARSE_UNAVAILABLE, PARSE_WORKER_CRASHED,
+    ResumeParseError, load_extractors, parse_limits, parse_resume,
+)
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POOL_SIZE = 2
+DEFAULT_TIMEOUT = 30
+DEFAULT_ACQUIRE_TIMEOUT = 10
+DEFAULT_MAX_TASKS_PER_WORKER = 100
+DEFAULT_MEMORY_LIMIT = 1024 * 1024 * 1024
+
+
+def _worker_main(conn, memory_limit):
+    """Parse files sent over ``conn`` until told to stop."""
+    load_extractors()
+    if memory_limit and resource is not None:
+        resource.setrlimit(resource.RLIMIT_AS, (memory_limit, memory_limit))
+
+    while True:
+        try:
+            task = conn.recv()
+        except (EOFError, OSError):
+            return
+        if task is None:
+            return
+        file_path, max_pages, max_chars = task
+        try:
+            conn.send(('ok', parse_resume(file_path, max_pages, max_chars)))
+        except ResumeParseError as e:
+            conn.send(('error', e.code, e.message))
+
+
+class _Worker:
+    def __init__(self, context, memory_limit):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(
+            target=_worker_main, args=(child_conn, memory_limit), daemon=True, name='resume-parser'
+        )
+        self.process.start()
+        child_conn.close()
+        self.tasks = 0
+
+    def stop(self):
+        try:
+            self.conn.send(None)
+        except (OSError, ValueError):
+            pass
+        self.process.join(1)
+        self.kill()
+
+    def kill(self):
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+
+class ParsePool:
+    """
+    Warm pool of parser processes supervised from the calling threads.
+
+    PDF extraction is pure Python and holds the GIL, so parses run in
+    separate processes while the web thread waits on a pipe. Each worker
+    runs under an address-space limit, is killed and replaced if a parse
+    exceeds ``timeout`` seconds or crashes, and is recycled after
+    ``max_tasks_per_worker`` parses.
+
+    Retired workers are stopped and replaced on a background thread, not
+    the request thread. If a replacement cannot be started its slot stays
+    empty and the next ``parse`` retries, so the pool never shrinks; a parse
+    that waits more than ``acquire_timeout`` seconds for a worker fails.
+    """
+
+    def __init__(self, size=DEFAULT_POOL_SIZE, timeout=DEFAULT_TIMEOUT,
+                 max_tasks_per_worker=DEFAULT_MAX_TASKS_PER_WORKER, memory_limit=DEFAULT_MEMORY_LIMIT,
+                 acquire_timeout=DEFAULT_ACQUIRE_TIMEOUT):
+        self.size = size
+        self.timeout = timeout
+        self.max_tasks_per_worker = max_tasks_per_worker
+        self.memory_limit = memory_limit
+        self.acquire_timeout = acquire_timeout
+        # spawn: forking a threaded web worker can copy held locks into the child
+        self._context = multiprocessing.get_context('spawn')
+        # Idle workers, and None for an empty slot whose worker failed to start
+        self._idle = queue.Queue()
+        self._closed = False
+        self._pid = os.getpid()
+        self._respawner = ThreadPoolExecutor(max_workers=1, thread_name_prefix='parse-pool-respawn')
+        for _ in range(size):
+            self._idle.put(self._new_worker())
+
+    def _new_worker(self):
+        return _Worker(self._context, self.memory_limit)
+
+    def _release(self, worker, replace=False):
+        if self._closed:
+            worker.kill()
+        elif replace or worker.tasks >= self.max_tasks_per_worker:
+            self._respawner.submit(self._replace, worker, graceful=not replace)
+        else:
+            self._idle.put(worker)
+
+    def _replace(self, worker, graceful):
+        """Retire ``worker`` and fill its slot (runs on the respawner thread)."""
+        if graceful:
+            worker.stop()
+        else:
+            worker.kill()
+        if self._closed:
+            return
+        try:
+            worker = self._new_worker()
+        except Exception:
+            logger.exception("Could not start a parser process; retrying on the next parse")
+            worker = None
+        self._idle.put(worker)
+
+    def _acquire(self):
+        try:
+            worker = self._idle.get(timeout=self.acquire_timeout)
+        except queue.Empty:
+            raise ResumeParseError(
+                PARSE_UNAVAILABLE, f'Error parsing resume: no parser process free after {self.acquire_timeout} seconds'
+            )
+        if worker is not None:
+            return worker
+        try:
+            return self._new_worker()
+        except Exception as e:
+            self._idle.put(None)
+            logger.exception("Could not start a parser process")
+            raise ResumeParseError(PARSE_UNAVAILABLE, f'Error parsing resume: could not start a parser process: {str(e)}')
+
+    def parse(self, file_path, max_pages=None, max_chars=None):
+        """Parse ``file_path`` in a worker process; raises ResumeParseError."""
+        if self._closed:
+            raise RuntimeError('ParsePool is closed')
+        default_pages, default_chars = parse_limits()
+        task = (
+            file_path,
+            default_pages if max_pages is None else max_pages,
+            default_chars if max_chars is None else max_chars,
+        )
+
+        worker = self._acquire()
+        replace = True
+        try:
+            worker.tasks += 1
+            try:
+                # An idle worker can die while it waits (OOM killer, external kill)
+                worker.conn.send(task)
+                if not worker.conn.poll(self.timeout):
+                    logger.warning("Parsing %s timed out after %ss", file_path, self.timeout)
+                    raise ResumeParseError(
+                        PARSE_TIMEOUT, f'Error parsing resume: timed out after {self.timeout} seconds'
+                    )
+                message = worker.conn.recv()
+            except (EOFError, OSError):
+                exitcode = worker.process.exitcode
+                logger.warning("Parser worker died parsing %s (exit code %s)", file_path, exitcode)
+                raise ResumeParseError(PARSE_WORKER_CRASHED, 'Error parsing resume: parser process crashed')
+
+            if message[0] == 'ok':
+                replace = False
+                return message[1]
+            _, code, error = message
+            # A worker that ran out of memory may be left in a bad state
+            replace = code == PARSE_MEMORY_LIMIT
+            raise ResumeParseError(code, error)
+        finally:
+            self._release(worker, replace=replace)
+
+    def close(self):
+        """Stop all idle workers (only in the process that started them)."""
+        if os.getpid() != self._pid:
+            return
+        self._closed = True
+        self._respawner.shutdown()
+        while True:
+            try:
+                worker = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            if worker is not None:
+                worker.stop()
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_parse_pool():
+    """Return the process-wide ParsePool configured from settings, starting it on first use."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ParsePool(
+                    size=getattr(settings, 'PARSE_POOL_SIZE', DEFAULT_POOL_SIZE),
+                    timeout=getattr(settings, 'PARSE_TIMEOUT', DEFAULT_TIMEOUT),
+                    max_tasks_per_worker=getattr(settings, 'PARSE_WORKER_MAX_TASKS', DEFAULT_MAX_TASKS_PER_WORKER),
+                    memory_limit=getattr(settings, 'PARSE_WORKER_MEMORY_LIMIT', DEFAULT_MEMORY_LIMIT),
+                    acquire_timeout=getattr(settings, 'PARSE_ACQUIRE_TIMEOUT', DEFAULT_ACQUIRE_TIMEOUT),
+                )
+                atexit.register(_pool.close)
+    return _pool
+
+
+def _forget_pool_after_fork():
+    # A forked child (gunicorn --preload) must not share the parent's pipes; it starts its own pool
+    global _pool, _pool_lock
+    _pool = None
+    _pool_lock = threading.Lock()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_forget_pool_after_fork)
+
+
+def start_parse_pool():
+    """Spawn the parser processes ahead of the first upload (warm-up step)."""
+    if getattr(settings, 'PARSE_POOL_ENABLED', True):
+        get_parse_pool()
+
+
+def parse_resume_isolated(file_path, max_pages=None, max_chars=None):
+    """
+    Parse a resume in the supervised process pool.
+
+    Falls back to parsing in-process when PARSE_POOL_ENABLED is off.
+    """
+    if not getattr(settings, 'PARSE_POOL_ENABLED', True):
+        return parse_resume(file_path, max_pages, max_chars)
+    return get_parse_pool().parse(file_path, max_pages, max_chars)
@@ -0,0 +1,235 @@
+import hashlib
+import os
+import tempfile
+from unittest import mock
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+
+from . import parse_cache, views
+from .management.commands.load_test import LoadTestClient
+from .parse_pool import ParsePool
+from .utils import (
+    PARSE_FAILED, PARSE_TIMEOUT, PARSE_UNAVAILABLE, PARSE_UNSUPPORTED_FORMAT, PARSE_WORKER_CRASHED, ResumeParseError,
+)
+from ml_model.models import ParsedResume
+
+
+@override_settings(PARSE_POOL_ENABLED=False)
+class ParseCacheTests(TestCase):
+    def setUp(self):
+        parse_cache.clear()
+        self.addCleanup(parse_cache.clear)
+
+    def _upload(self, content, name='resume.txt'):
+        request = RequestFactory().post('/', {'resume': SimpleUploadedFile(name, content)})
+        return request, request.FILES['resume']
+
+    def test_upload_is_hashed_while_streaming(self):
+        request, _ = self._upload(b'Python developer')
+        self.assertEqual(request.upload_digests['resume'], hashlib.sha256(b'Python developer').hexdigest())
+
+    def test_repeat_upload_skips_parser(self):
+        request, upload = self._upload(b'Python and Django developer')
+        text, skills = views._parse_upload(request, upload)
+        self.assertEqual(text, 'Python and Django developer')
+        self.assertIn('python', skills)
+
+        parse_cache.clear()  # force the persistent tier
+        request, upload = self._upload(b'Python and Django developer', name='copy.txt')
+        with mock.patch.object(views, 'parse_resume_isolated') as parse_resume:
+            self.assertEqual(views._parse_upload(request, upload), (text, skills))
+            self.assertEqual(views._parse_upload(request, upload), (text, skills))
+        parse_resume.assert_not_called()
+        self.assertEqual(ParsedResume.objects.count(), 1)
+
+    def test_key_depends_on_parser_version_and_limits(self):
+        key = parse_cache.make_cache_key('abc', 'resume.pdf')
+        self.assertNotEqual(key, parse_cache.make_cache_key('abc', 'resume.docx'))
+        with mock.patch.object(parse_cache, 'PARSER_VERSION', parse_cache.PARSER_VERSION + 1):
+            self.assertNotEqual(key, parse_cache.make_cache_key('abc', 'resume.pdf'))
+        with self.settings(RESUME_MAX_CHARS=10):
+            self.assertNotEqual(key, parse_cache.make_cache_key('abc', 'resume.pdf'))
+
+    def test_stale_skills_are_re_extracted(self):
+        parse_cache.store('key', 'Senior Python engineer', ['java'])
+        ParsedResume.objects.update(skills_version='outdated')
+        parse_cache.clear()
+        self.assertEqual(parse_cache.get('key'), ('Senior Python engineer', ['python']))
+
+    @override_settings(PARSE_CACHE_EVICT_EVERY=3)
+    def test_eviction_is_amortised_over_stores(self):
+        self.addCleanup(setattr, parse_cache, '_stores_since_evict', 0)
+        parse_cache._stores_since_evict = 0
+        with mock.patch.object(parse_cache, 'evict') as evict:
+            for n in range(7):
+                parse_cache.store(f'key{n}', 'Python developer', ['python'])
+        self.assertEqual(evict.call_count, 2)
+
+    @override_settings(PARSE_CACHE_MEMORY_ENTRIES=1)
+    def test_memory_limit_is_read_from_current_settings(self):
+        parse_cache.store('first', 'Python developer', ['python'])
+        parse_cache.store('second', 'Java developer', ['java'])
+        self.assertEqual(parse_cache.cache_stats()['memory_entries'], 1)
+
+
+@override_settings(PARSE_POOL_ENABLED=False, STORE_ANALYSED_RESUMES=False)
+class IndexViewTests(TestCase):
+    SCORE = {'prediction': 80.0, 'confidence': 80.0, 'skills_found': ['python']}
+
+    def setUp(self):
+        parse_cache.clear()
+        self.addCleanup(parse_cache.clear)
+        for name, value in [('score_resume', self.SCORE), ('evaluate_sections', {'section_evaluations': {}})]:
+            patcher = mock.patch.object(views, name, return_value=value)
+            setattr(self, name, patcher.start())
+            self.addCleanup(patcher.stop)
+
+    def _post(self):
+        upload = SimpleUploadedFile('resume.txt', b'Python developer with Django experience')
+        return self.client.post('/', {'resume': upload, 'job_description': 'Python engineer'})
+
+    @override_settings(STREAM_SECTION_EVALUATIONS=True)
+    def test_streaming_mode_leaves_evaluation_to_the_stream(self):
+        response = self._post()
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('evaluation_stream_url', response.context)
+        self.evaluate_sections.assert_not_called()
+
+    @override_settings(STREAM_SECTION_EVALUATIONS=False)
+    def test_concurrent_mode_waits_for_evaluation(self):
+        self.evaluate_sections.return_value = {'section_evaluations': {'skills': {'score': 8}}}
+        response = self._post()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['section_evaluations'], {'skills': {'score': 8}})
+        self.assertNotIn('evaluation_stream_url', response.context)
+
+    @override_settings(STREAM_SECTION_EVALUATIONS=False)
+    def test_no_evaluation_is_started_when_scoring_fails(self):
+        self.score_resume.return_value = {'error': 'No active model found.'}
+        with mock.patch.object(views, 'submit') as submit:
+            self.assertRedirects(self._post(), '/')
+        submit.assert_not_called()
+
+    @override_settings(STREAM_SECTION_EVALUATIONS=False)
+    def test_evaluation_is_cancelled_when_the_view_fails(self):
+        with mock.patch.object(views, 'submit') as submit, \
+                mock.patch.object(views, 'analyze_keywords', side_effect=ValueError('boom')):
+            self.assertRedirects(self._post(), '/')
+        submit.return_value.cancel.assert_called_once_with()
+
+
+class ParsePoolTests(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.pool = ParsePool(size=1, timeout=2, max_tasks_per_worker=3)
+        cls.tmpdir = tempfile.mkdtemp()
+        cls.resume_path = os.path.join(cls.tmpdir, 'resume.txt')
+        with open(cls.resume_path, 'w') as f:
+            f.write('Python developer\n')
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.pool.close()
+        super().tearDownClass()
+
+    def _worker_pid(self):
+        # Retired workers are replaced in the background; wait for that first
+        self.pool._respawner.submit(lambda: None).result()
+        return self.pool._idle.queue[0].process.pid
+
+    def test_parse_and_structured_errors(self):
+        self.assertEqual(self.pool.parse(self.resume_path), 'Python developer')
+        cases = [
+            (os.path.join(self.tmpdir, 'resume.xyz'), PARSE_UNSUPPORTED_FORMAT),
+            (os.path.join(self.tmpdir, 'missing.pdf'), PARSE_FAILED),
+        ]
+        for path, code in cases:
+            with self.assertRaises(ResumeParseError) as ctx:
+                self.pool.parse(path)
+            self.assertEqual(ctx.exception.code, code)
+
+    def test_timeout_replaces_worker(self):
+        # Opening a FIFO with no writer blocks forever
+        fifo = os.path.join(self.tmpdir, 'stuck.txt')
+        os.mkfifo(fifo)
+        pid = self._worker_pid()
+        with self.assertRaises(ResumeParseError) as ctx:
+            self.pool.parse(fifo)
+        self.assertEqual(ctx.exception.code, PARSE_TIMEOUT)
+        self.assertNotEqual(self._worker_pid(), pid)
+        self.assertEqual(self.pool.parse(self.resume_path), 'Python developer')
+
+    def test_idle_worker_killed_while_waiting(self):
+        self._worker_pid()
+        worker = self.pool._idle.queue[0]
+        worker.process.kill()
+        worker.process.join()
+        with self.assertRaises(ResumeParseError) as ctx:
+            self.pool.parse(self.resume_path)
+        self.assertEqual(ctx.exception.code, PARSE_WORKER_CRASHED)
+        self.assertNotEqual(self._worker_pid(), worker.process.pid)
+        self.assertEqual(self.pool.parse(self.resume_path), 'Python developer')
+
+    def test_worker_recycled_after_max_tasks(self):
+        pid = self._worker_pid()
+        for _ in range(self.pool.max_tasks_per_worker):
+            self.pool.parse(self.resume_path)
+        self.assertNotEqual(self._worker_pid(), pid)
+
+    def test_respawn_failure_is_retried_on_next_parse(self):
+        pool = ParsePool(size=1, timeout=2, max_tasks_per_worker=1)
+        self.addCleanup(pool.close)
+        with mock.patch.object(pool, '_new_worker', side_effect=OSError('Too many open files')), \
+                self.assertLogs('analyser.parse_pool', 'ERROR'):
+            # The worker is recycled after one parse and its replacement fails to start
+            self.assertEqual(pool.parse(self.resume_path), 'Python developer')
+            pool._respawner.submit(lambda: None).result()
+        self.assertEqual(list(pool._idle.queue), [None])
+        self.assertEqual(pool.parse(self.resume_path), 'Python developer')
+
+    def test_waiting_for_a_worker_times_out(self):
+        pool = ParsePool(size=1, timeout=2, acquire_timeout=0.1)
+        self.addCleanup(pool.close)
+        busy = pool._idle.get()
+        self.addCleanup(pool._idle.put, busy)
+        with self.assertRaises(ResumeParseError) as ctx:
+            pool.parse(self.resume_path)
+        self.assertEqual(ctx.exception.code, PARSE_UNAVAILABLE)
+
+
+class LoadTestClientTests(SimpleTestCase):
+    def _client(self, session_class):
+        session = session_class.return_value
+        session.cookies.get.return_value = 'token'
+        return LoadTestClient('http://testserver', timeout=1), session
+
+    def _stream(self, *events):
+        stream = mock.MagicMock(status_code=200)
+        stream.__enter__.return_value = stream
+        stream.iter_lines.return_value = [
+            line for event, data in events for line in (f'event: {event}', f'data: {data}', '')
+        ]
+        return stream
+
+    def test_index_reads_evaluation_stream_until_done(self):
+        with mock.patch('analyser.management.commands.load_test.requests.Session') as session_class:
+            client, session = self._client(session_class)
+            session.post.return_value = mock.Mock(
+                status_code=200, text='<div id="sectionEvaluations" data-stream-url="/evaluations/abc/stream/">',
+            )
+            session.get.return_value = self._stream(('section', '{}'), ('done', '{}'))
+            self.assertIsNone(client.analyse('resume.txt', b'Python', 'job'))
+            session.get.assert_called_with('http://testserver/evaluations/abc/stream/', stream=True, timeout=1)
+
+            session.get.return_value = self._stream(('error', '{"error": "Ollama down"}'), ('done', '{}'))
+            self.assertEqual(client.analyse('resume.txt', b'Python', 'job'), 'stream error: Ollama down')
+
+    def test_pending_job_is_reported_after_job_timeout(self):
+        with mock.patch('analyser.management.commands.load_test.requests.Session') as session_class:
+            client, session = self._client(session_class)
+            session.post.return_value = mock.Mock(status_code=202, json=lambda: {'status_url': '/jobs/abc/status/'})
+            session.get.return_value.json.return_value = {'status': 'running'}
+            self.assertEqual(client.generate('resume', 'job', True, 0.01, 0.05), 'job timed out')
+        self.assertGreater(session.get.call_count, 2)
@@ -4,5 +4,11 @@ from . import views
 urlpatterns = [
     path('', views.index, name='index'),
     path('generate/', views.generate_improved_resume_view, name='generate_improved'),
+    path('evaluations/<str:token>/stream/', views.stream_section_evaluations_view, name='stream_section_evaluations'),
+    path('jobs/<uuid:token>/', views.job_result_view, name='job_result'),
+    path('jobs/<uuid:token>/status/', views.job_status_view, name='job_status'),
+    path('search/', views.search_resumes_view, name='search_resumes'),
     path('download/', views.download_improved_resume, name='download_improved_resume'),
+    path('metrics', views.metrics_view, name='metrics'),
+    path('healthz/ready', views.readiness_view, name='readiness'),
 ]
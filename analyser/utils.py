@@ -1,57 +1,179 @@
 import os
-import docx
-import PyPDF2
+from django.conf import settings
 from django.core.files.storage import FileSystemStorage
 
-def parse_resume(file_path):
+# Bump whenever extraction output changes, so cached parses are not reused
+PARSER_VERSION = 1
+
+DEFAULT_MAX_PAGES = 20
+DEFAULT_MAX_CHARS = 100000
+
+# ResumeParseError codes
+PARSE_UNSUPPORTED_FORMAT = 'unsupported_format'
+PARSE_FAILED = 'parse_failed'
+PARSE_TIMEOUT = 'timeout'
+PARSE_MEMORY_LIMIT = 'memory_limit'
+PARSE_WORKER_CRASHED = 'worker_crashed'
+PARSE_UNAVAILABLE = 'unavailable'
+
+class ResumeParseError(Exception):
+    """
+    Raised when a resume cannot be parsed.
+
+    ``code`` is one of the PARSE_* constants, so callers can tell a bad
+    document from a timeout or a crashed parse worker.
+    """
+    def __init__(self, code, message):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+
+    def as_dict(self):
+        return {'code': self.code, 'message': self.message}
+
+# Registered text extractors, keyed by file extension: (label, extractor)
+EXTRACTORS = {}
+
+def register_extractor(extension, label):
+    """
+    Register a text extractor for a file extension.
+
+    An extractor is a generator ``extractor(file_path, max_pages)`` that yields
+    text chunks (pages, paragraphs or table rows) lazily; ``parse_resume``
+    joins them with newlines and stops consuming once its limits are reached.
+    """
+    def decorator(extractor):
+        EXTRACTORS[extension.lower()] = (label, extractor)
+        return extractor
+    return decorator
+
+def _collect(chunks, max_chars=None):
+    """Join extracted chunks once, stopping after ``max_chars`` characters."""
+    parts = []
+    total = 0
+    try:
+        for chunk in chunks:
+            if max_chars is not None and total + len(chunk) >= max_chars:
+                parts.append(chunk[:max_chars - total])
+                break
+            parts.append(chunk)
+            total += len(chunk) + 1  # account for the joining newline
+    finally:
+        chunks.close()
+    return '\n'.join(parts).strip()
+
+def _extract(file_path, extension, max_pages=None, max_chars=None):
+    label, extractor = EXTRACTORS[extension]
+    try:
+        return _collect(extractor(file_path, max_pages), max_chars)
+    except MemoryError:
+        raise
+    except Exception as e:
+        raise Exception(f'Error parsing {label}: {str(e)}')
+
+def parse_limits():
+    """Return the configured (max_pages, max_chars) extraction limits."""
+    return (
+        getattr(settings, 'RESUME_MAX_PAGES', DEFAULT_MAX_PAGES),
+        getattr(settings, 'RESUME_MAX_CHARS', DEFAULT_MAX_CHARS),
+    )
+
+def parse_resume(file_path, max_pages=None, max_chars=None):
     """
     Parse resume content from various file formats (PDF, DOCX, TXT)
+
+    Extraction stops after ``max_pages`` PDF pages and ``max_chars``
+    characters (defaults: the RESUME_MAX_PAGES and RESUME_MAX_CHARS settings).
     """
+    default_pages, default_chars = parse_limits()
+    if max_pages is None:
+        max_pages = default_pages
+    if max_chars is None:
+        max_chars = default_chars
+
+    file_extension = os.path.splitext(file_path)[1].lower()
+    if file_extension not in EXTRACTORS:
+        raise ResumeParseError(
+            PARSE_UNSUPPORTED_FORMAT, f'Error parsing resume: Unsupported file format: {file_extension}'
+        )
+
     try:
-        file_extension = os.path.splitext(file_path)[1].lower()
-        
-        if file_extension == '.pdf':
-            return parse_pdf(file_path)
-        elif file_extension == '.docx':
-            return parse_docx(file_path)
-        elif file_extension == '.txt':
-            return parse_txt(file_path)
-        else:
-            raise ValueError(f'Unsupported file format: {file_extension}')
-            
+        return _extract(file_path, file_extension, max_pages, max_chars)
+    except MemoryError:
+        raise ResumeParseError(PARSE_MEMORY_LIMIT, 'Error parsing resume: memory limit exceeded')
     except Exception as e:
-        raise Exception(f'Error parsing resume: {str(e)}')
+        raise ResumeParseError(PARSE_FAILED, f'Error parsing resume: {str(e)}')
+
+def load_extractors():
+    """
+    Import the PDF and DOCX libraries. Extractors import them on first use so
+    that loading this module stays cheap; parse workers call this up front.
+    """
+    import docx  # noqa: F401
+    import PyPDF2  # noqa: F401
+
+@register_extractor('.pdf', 'PDF')
+def extract_pdf(file_path, max_pages=None):
+    """Yield the text of each PDF page, up to ``max_pages``"""
+    import PyPDF2
+
+    with open(file_path, 'rb') as file:
+        pdf_reader = PyPDF2.PdfReader(file)
+        page_count = len(pdf_reader.pages)
+        if max_pages is not None:
+            page_count = min(page_count, max_pages)
+        for index in range(page_count):
+            yield pdf_reader.pages[index].extract_text() or ''
+
+def _table_rows(table):
+    """Yield each table row as text, skipping repeated merged cells."""
+    for row in table.rows:
+        cells = []
+        seen = set()
+        for cell in row.cells:
+            if cell._tc in seen:
+                continue
+            seen.add(cell._tc)
+            text = cell.text.strip()
+            if text:
+                cells.append(text)
+            for nested in cell.tables:
+                cells.extend(_table_rows(nested))
+        if cells:
+            yield ' | '.join(cells)
+
+@register_extractor('.docx', 'DOCX')
+def extract_docx(file_path, max_pages=None):
+    """Yield DOCX paragraphs and table rows in document order"""
+    import docx
+    from docx.table import Table
+    from docx.text.paragraph import Paragraph
+
+    doc = docx.Document(file_path)
+    for element in doc.element.body.iterchildren():
+        if element.tag.endswith('}p'):
+            yield Paragraph(element, doc).text
+        elif element.tag.endswith('}tbl'):
+            yield from _table_rows(Table(element, doc))
+
+@register_extractor('.txt', 'TXT')
+def extract_txt(file_path, max_pages=None):
+    """Yield TXT file lines"""
+    with open(file_path, 'r', encoding='utf-8') as file:
+        for line in file:
+            yield line.rstrip('\n')
 
 def parse_pdf(file_path):
     """Parse PDF file content"""
-    try:
-        with open(file_path, 'rb') as file:
-            pdf_reader = PyPDF2.PdfReader(file)
-            text = ''
-            for page in pdf_reader.pages:
-                text += page.extract_text() + '\n'
-            return text.strip()
-    except Exception as e:
-        raise Exception(f'Error parsing PDF: {str(e)}')
+    return _extract(file_path, '.pdf')
 
 def parse_docx(file_path):
     """Parse DOCX file content"""
-    try:
-        doc = docx.Document(file_path)
-        text = ''
-        for paragraph in doc.paragraphs:
-            text += paragraph.text + '\n'
-        return text.strip()
-    except Exception as e:
-        raise Exception(f'Error parsing DOCX: {str(e)}')
+    return _extract(file_path, '.docx')
 
 def parse_txt(file_path):
     """Parse TXT file content"""
-    try:
-        with open(file_path, 'r', encoding='utf-8') as file:
-            return file.read().strip()
-    except Exception as e:
-        raise Exception(f'Error parsing TXT: {str(e)}')
+    return _extract(file_path, '.txt')
 
 def calculate_tfidf_score(resume_text, job_description):
     """
@@ -59,4 +181,4 @@ def calculate_tfidf_score(resume_text, job_description):
     """
     # This is a placeholder for the actual TF-IDF calculation
     # You would typically use scikit-learn or similar for this
-    return 0.75  # Placeholder score 
\ No newline at end of file
+    return 0.75  # Placeholder score
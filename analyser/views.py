@@ -1,13 +1,39 @@
 from django.shortcuts import render
 from .forms import ResumeUploadForm
-from .utils import parse_resume, calculate_tfidf_score
-from ml_model.services import predict_resume_success, analyze_keywords, generate_improved_resume, create_pdf_from_text
-from django.http import HttpResponse
+from . import parse_cache
+from .parse_pool import parse_resume_isolated
+from .utils import calculate_tfidf_score
+from ml_model.concurrency import submit
+from ml_model.metrics import render_metrics, stage_timer
+from ml_model.jobs import JOB_IMPROVE_RESUME, enqueue
+from ml_model import warmup
+from ml_model.models import Job, StoredResume
+from ml_model.search import QueryError, get_skill_index, search_resumes, store_resume
+from ml_model.utils import extract_skills
+from ml_model.services import score_resume, evaluate_sections, stream_section_evaluations, analyze_keywords, create_pdf_from_text
+from django.conf import settings
+from django.http import Http404, HttpResponse
 from django.http import JsonResponse
+from django.http import StreamingHttpResponse
 from django.core.files.storage import FileSystemStorage
+from django.core.paginator import Paginator
+from django.db import DatabaseError
 from django.contrib import messages
 from django.urls import reverse
 from django.shortcuts import redirect
+from django.shortcuts import get_object_or_404
+import json
+import logging
+import uuid
+
+logger = logging.getLogger(__name__)
+
+# Maximum number of not-yet-streamed evaluations kept in a session
+MAX_PENDING_EVALUATIONS = 5
+
+# Candidate search page sizes
+DEFAULT_SEARCH_PAGE_SIZE = 20
+MAX_SEARCH_PAGE_SIZE = 100
 
 def index(request):
     if request.method == 'POST':
@@ -16,30 +42,49 @@ def index(request):
             # Get the uploaded file
             resume_file = request.FILES['resume']
             job_description = form.cleaned_data['job_description']
-            
-            # Save the file temporarily
-            fs = FileSystemStorage()
-            filename = fs.save(resume_file.name, resume_file)
-            file_path = fs.path(filename)
+            stream_evaluations = getattr(settings, 'STREAM_SECTION_EVALUATIONS', False)
+            evaluation_future = None
             
             try:
-                # Extract text from the resume
-                resume_text = parse_resume(file_path)
+                # Extract text and skills from the resume (cached by content hash)
+                resume_text, resume_skills = _parse_upload(request, resume_file)
                 
-                # Get prediction and section evaluations
-                prediction_result = predict_resume_success(resume_text, job_description)
+                # Get ML prediction (fast, and fails fast without an active model)
+                prediction_result = score_resume(resume_text, job_description, resume_skills=resume_skills)
                 
                 if 'error' in prediction_result:
                     messages.error(request, prediction_result['error'])
                     return redirect('index')
                 
+                # Start the LLM section evaluation so it runs while the keywords
+                # are analysed. In streaming mode (the default) the result page
+                # streams it from stream_section_evaluations_view instead.
+                if not stream_evaluations:
+                    evaluation_future = submit(evaluate_sections, resume_text, job_description)
+                
                 # Get keyword analysis
                 keyword_analysis = analyze_keywords(resume_text, job_description)
                 
-                # Debug print
-                print("\n=== Prediction Result ===")
-                print(prediction_result)
-                print("=== End Prediction Result ===\n")
+                # Wait for the section evaluations
+                if evaluation_future is not None:
+                    evaluation_result = evaluation_future.result()
+                    if 'error' in evaluation_result:
+                        messages.error(request, evaluation_result['error'])
+                        return redirect('index')
+                    prediction_result['section_evaluations'] = evaluation_result['section_evaluations']
+                
+                # Keep the parsed resume for candidate search
+                if getattr(settings, 'STORE_ANALYSED_RESUMES', False):
+                    try:
+                        store_resume(
+                            resume_file.name, resume_text,
+                            prediction_result['skills_found'],
+                            list(keyword_analysis['resume_keywords'])
+                        )
+                    except DatabaseError as e:
+                        logger.warning("Error storing resume: %s", e)
+                
+                logger.debug("Prediction result: %s", prediction_result)
                 
                 # Prepare context with all necessary data
                 context = {
@@ -55,28 +100,104 @@ def index(request):
                     'debug': True  # Enable debug mode
                 }
                 
-                # Debug print
-                print("\n=== Context ===")
-                print(context)
-                print("=== End Context ===\n")
-                
-                # Clean up the uploaded file
-                fs.delete(filename)
+                if stream_evaluations:
+                    token = _store_pending_evaluation(request, resume_text, job_description)
+                    context['evaluation_stream_url'] = reverse('stream_section_evaluations', args=[token])
                 
-                return render(request, 'analyser/result.html', context)
+                with stage_timer('render'):
+                    return render(request, 'analyser/result.html', context)
                 
             except Exception as e:
+                # Don't leave an evaluation nobody will read queued on the shared pool
+                if evaluation_future is not None:
+                    evaluation_future.cancel()
                 messages.error(request, f'Error processing resume: {str(e)}')
-                if fs.exists(filename):
-                    fs.delete(filename)
                 return redirect('index')
     else:
         form = ResumeUploadForm()
     
     return render(request, 'analyser/index.html', {'form': form})
 
+def _parse_upload(request, resume_file):
+    """
+    Return ``(resume_text, skills)`` for an uploaded resume.
+
+    The upload's SHA-256 is computed while it streams in (see
+    analyser.upload_handlers), so a resume that was parsed before is served
+    from the parse cache without being written to disk or parsed again.
+    """
+    digest = getattr(request, 'upload_digests', {}).get('resume')
+    cache_key = parse_cache.make_cache_key(digest, resume_file.name) if digest else None
+    if cache_key:
+        cached = parse_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+    # Save the file temporarily
+    fs = FileSystemStorage()
+    with stage_timer('upload_save'):
+        filename = fs.save(resume_file.name, resume_file)
+    try:
+        # Parsed in a separate process so a pathological file can't stall this worker
+        with stage_timer('parse'):
+            resume_text = parse_resume_isolated(fs.path(filename))
+    finally:
+        fs.delete(filename)
+
+    skills = extract_skills(resume_text)
+    if cache_key:
+        parse_cache.store(cache_key, resume_text, skills)
+    return resume_text, skills
+
+def _store_pending_evaluation(request, resume_text, job_description):
+    """Keep the inputs for a streamed evaluation in the session and return its token."""
+    pending = request.session.get('pending_evaluations', {})
+    while len(pending) >= MAX_PENDING_EVALUATIONS:
+        pending.pop(next(iter(pending)))
+    
+    token = uuid.uuid4().hex
+    pending[token] = {
+        'resume_text': resume_text,
+        'job_description': job_description
+    }
+    request.session['pending_evaluations'] = pending
+    return token
+
+def _sse_event(event, data):
+    """Format a server-sent event."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+def stream_section_evaluations_view(request, token):
+    """Stream LLM section evaluations to the result page as server-sent events."""
+    pending = request.session.get('pending_evaluations', {})
+    evaluation = pending.pop(token, None)
+    if evaluation is None:
+        return JsonResponse({'error': 'Unknown or expired evaluation'}, status=404)
+    # Consume the token now; the session is saved before the stream starts
+    request.session['pending_evaluations'] = pending
+    
+    def event_stream():
+        try:
+            for section_name, section_evaluation in stream_section_evaluations(
+                evaluation['resume_text'], evaluation['job_description']
+            ):
+                yield _sse_event('section', {'name': section_name, 'evaluation': section_evaluation})
+        except Exception as e:
+            yield _sse_event('error', {'error': f'Error evaluating sections: {str(e)}'})
+        yield _sse_event('done', {})
+    
+    response = StreamingHttpResponse(event_stream(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
 def generate_improved_resume_view(request):
-    """View for generating an improved version of the resume."""
+    """
+    Queue generation of an improved version of the resume.
+
+    Returns the job id and its status/result URLs as JSON when the client asks
+    for JSON; otherwise redirects to the job page, which polls until done.
+    """
     if request.method == 'POST':
         resume_text = request.POST.get('resume_text', '')
         job_description = request.POST.get('job_description', '')
@@ -84,32 +205,96 @@ def generate_improved_resume_view(request):
         if not resume_text or not job_description:
             return JsonResponse({'error': 'Resume text and job description are required'})
         
-        # Generate improved resume
-        result = generate_improved_resume(resume_text, job_description)
-        if isinstance(result, tuple) and result[0] is None:
-            return JsonResponse({'error': result[1]})
+        job = enqueue(JOB_IMPROVE_RESUME, {
+            'resume_text': resume_text,
+            'job_description': job_description
+        })
         
-        # Re-analyze the improved resume
-        prediction_result, error = predict_resume_success(result['improved_resume'], job_description)
-        if error:
-            return JsonResponse({'error': error})
-        
-        # Get keyword analysis
-        keyword_analysis = analyze_keywords(result['improved_resume'], job_description)
-        
-        context = {
-            'resume_text': result['improved_resume'],
-            'job_description': job_description,
-            'prediction': prediction_result,
-            'keyword_analysis': keyword_analysis,
-            'changes_made': result['changes'],
-            'section_evaluations': result['section_evaluations']
-        }
-        
-        return render(request, 'analyser/result.html', context)
+        if 'application/json' in request.headers.get('Accept', ''):
+            return JsonResponse(_job_status(job), status=202)
+        return redirect('job_result', token=job.token)
     
     return JsonResponse({'error': 'Invalid request method'})
 
+def _job_status(job):
+    return {
+        'job_id': str(job.token),
+        'status': job.status,
+        'error': job.error,
+        'status_url': reverse('job_status', args=[job.token]),
+        'result_url': reverse('job_result', args=[job.token])
+    }
+
+def job_status_view(request, token):
+    """Report the status of a background job as JSON."""
+    job = get_object_or_404(Job, token=token)
+    return JsonResponse(_job_status(job))
+
+def job_result_view(request, token):
+    """Show a finished job's result, or a page that polls until it finishes."""
+    job = get_object_or_404(Job, token=token)
+    
+    if job.status == Job.STATUS_SUCCEEDED:
+        return render(request, 'analyser/result.html', job.result)
+    
+    if job.status == Job.STATUS_FAILED:
+        messages.error(request, job.error)
+        return redirect('index')
+    
+    return render(request, 'analyser/job_pending.html', {
+        'job': job,
+        'status_url': reverse('job_status', args=[job.token])
+    })
+
+def search_resumes_view(request):
+    """
+    Search stored resumes with a boolean skill query.
+
+    ``q`` takes queries like ``python AND (k8s OR aws) NOT java``; results are
+    paginated with ``page`` and ``per_page``, newest first.
+    """
+    # Stored resumes are other candidates' data: staff with the model permission only
+    if not request.user.has_perm('ml_model.view_storedresume'):
+        return JsonResponse({'error': 'You do not have permission to search resumes'}, status=403)
+    
+    query = request.GET.get('q', '').strip()
+    if not query:
+        return JsonResponse({'error': 'A skill query is required, e.g. python AND kubernetes'}, status=400)
+    
+    try:
+        resume_ids = search_resumes(query)
+    except QueryError as e:
+        return JsonResponse({'error': f'Invalid query: {str(e)}'}, status=400)
+    
+    try:
+        per_page = min(int(request.GET.get('per_page', DEFAULT_SEARCH_PAGE_SIZE)), MAX_SEARCH_PAGE_SIZE)
+    except ValueError:
+        per_page = DEFAULT_SEARCH_PAGE_SIZE
+    paginator = Paginator(resume_ids, max(per_page, 1))
+    page = paginator.get_page(request.GET.get('page'))
+    
+    page_ids = [int(resume_id) for resume_id in page.object_list]
+    resumes = StoredResume.objects.only('name', 'skills', 'created_at').in_bulk(page_ids)
+    deleted_ids = set(page_ids) - set(resumes)
+    if deleted_ids:
+        get_skill_index(sync=False).discard(deleted_ids)
+    
+    return JsonResponse({
+        'query': query,
+        'total': paginator.count,
+        'page': page.number,
+        'num_pages': paginator.num_pages,
+        'results': [
+            {
+                'id': resumes[resume_id].pk,
+                'name': resumes[resume_id].name,
+                'skills': resumes[resume_id].skills,
+                'created_at': resumes[resume_id].created_at.isoformat()
+            }
+            for resume_id in page_ids if resume_id in resumes
+        ]
+    })
+
 def download_improved_resume(request):
     if request.method == 'POST':
         resume_text = request.POST.get('resume_text')
@@ -130,3 +315,14 @@ def download_improved_resume(request):
     return JsonResponse({'error': 'Invalid request method'}, status=400)
 
 
+
+def metrics_view(request):
+    """Per-process stage latencies and cache/registry counters in Prometheus text format."""
+    if not getattr(settings, 'METRICS_ENABLED', True):
+        raise Http404
+    return HttpResponse(render_metrics(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+def readiness_view(request):
+    """Readiness probe: 503 until this worker has finished warming up."""
+    state = warmup.readiness()
+    return JsonResponse(state, status=200 if state['ready'] else 503)
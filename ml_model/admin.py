@@ -1,3 +1,22 @@
 from django.contrib import admin
 
-# Register your models here.
+from .models import ResumePredictor
+from .registry import activate
+
+
+@admin.register(ResumePredictor)
+class ResumePredictorAdmin(admin.ModelAdmin):
+    list_display = ('name', 'family', 'accuracy', 'latency_p95_ms', 'is_active', 'created_at')
+    actions = ['activate_model']
+
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        if obj.is_active:
+            activate(obj)
+
+    @admin.action(description='Activate the selected model (deactivates all others)')
+    def activate_model(self, request, queryset):
+        if queryset.count() != 1:
+            self.message_user(request, 'Select exactly one model to activate.', level='error')
+            return
+        activate(queryset.get())
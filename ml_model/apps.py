@@ -4,3 +4,11 @@ from django.apps import AppConfig
 class MlModelConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'ml_model'
+
+    def ready(self):
+        from . import llm_cache, prompt_budget, registry, signals, warmup  # noqa: F401
+        from .metrics import register_collector
+
+        register_collector('resume_model_registry', registry.registry_stats)
+        register_collector('resume_llm_cache', llm_cache.cache_stats)
+        register_collector('resume_llm_prompt_budget', prompt_budget.budget_stats)
@@ -0,0 +1,36 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import connections
+
+DEFAULT_WORKERS = 8
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    """Return the process-wide thread pool used for blocking I/O such as LLM calls."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=getattr(settings, 'BACKGROUND_IO_WORKERS', DEFAULT_WORKERS),
+                    thread_name_prefix='ml-io',
+                )
+    return _executor
+
+
+def _run_and_close_connections(fn, args, kwargs):
+    try:
+        return fn(*args, **kwargs)
+    finally:
+        # Pool threads outlive the request, so don't leave their DB connections open
+        connections.close_all()
+
+
+def submit(fn, *args, **kwargs):
+    """Run ``fn(*args, **kwargs)`` on the shared pool and return its Future."""
+    return get_executor().submit(_run_and_close_connections, fn, args, kwargs)
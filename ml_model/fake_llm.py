@@ -0,0 +1,147 @@
+import json
+import re
+import time
+
+from .utils import extract_skills
+
+# Canned Ollama responses for benchmarks and load tests, in the formats the
+# prompts in ml_model.services ask for so they exercise the real parsers
+
+SECTION_NAMES = ['Summary/Objective', 'Experience', 'Skills', 'Education']
+
+SECTION_EVALUATION_RESPONSE = """SECTION EVALUATION:
+{sections}
+Overall Resume Score: 7/10
+"""
+SECTION_TEMPLATE = """{name} (Score: {score}/10):
+- Strengths:
+  * Clear description of {skill} experience
+  * Quantified delivery outcomes
+- Areas for Improvement:
+  * Limited detail on {skill} at scale
+  * Some duties listed without results
+- Recommendations:
+  * Lead with the {skill} projects most relevant to the role
+  * Add metrics to each role
+"""
+IMPROVED_RESUME_RESPONSE = """=== SECTION EVALUATION ===
+{sections}
+Overall Resume Score: 7/10
+
+=== CHANGES MADE ===
+1. Moved the most relevant experience to the top
+2. Added measurable outcomes to each role
+3. Grouped skills by category
+4. Tightened the summary
+5. Removed outdated technologies
+
+=== IMPROVED RESUME ===
+{resume}
+
+=== EXPLANATION ===
+The changes put the skills the job asks for first and back them with results.
+"""
+
+PROMPT_RESUME_RE = re.compile(r'Original Resume:\s*(?P<resume>.*?)\s*Job Description:', re.DOTALL)
+
+
+def _sections(skills):
+    return '\n'.join(
+        SECTION_TEMPLATE.format(name=name, score=7, skill=skills[index % len(skills)] if skills else 'core')
+        for index, name in enumerate(SECTION_NAMES)
+    )
+
+
+def section_evaluation_response(skills):
+    return SECTION_EVALUATION_RESPONSE.format(sections=_sections(skills))
+
+
+def improved_resume_response(resume_text, skills):
+    sections = _sections(skills).replace('(Score', '**(Score').replace('/10):', '/10)**')
+    return IMPROVED_RESUME_RESPONSE.format(sections=sections, resume=resume_text)
+
+
+def _section_objects(skills):
+    sections = []
+    for index, name in enumerate(SECTION_NAMES):
+        skill = skills[index % len(skills)] if skills else 'core'
+        sections.append({
+            'name': name,
+            'score': 7,
+            'strengths': [f'Clear description of {skill} experience', 'Quantified delivery outcomes'],
+            'improvements': [f'Limited detail on {skill} at scale', 'Some duties listed without results'],
+            'recommendations': [f'Lead with the {skill} projects most relevant to the role', 'Add metrics to each role'],
+        })
+    return sections
+
+
+def section_evaluation_json(skills):
+    return json.dumps({'sections': _section_objects(skills), 'overall_score': 7}, indent=2)
+
+
+def improved_resume_json(resume_text, skills):
+    return json.dumps({
+        'sections': _section_objects(skills),
+        'overall_score': 7,
+        'changes': [
+            'Moved the most relevant experience to the top',
+            'Added measurable outcomes to each role',
+            'Grouped skills by category',
+            'Tightened the summary',
+            'Removed outdated technologies',
+        ],
+        'improved_resume': resume_text,
+        'explanation': 'The changes put the skills the job asks for first and back them with results.',
+    }, indent=2)
+
+
+def wants_improved_resume(prompt, format=None):
+    """Whether a request asks for an improved resume rather than a section evaluation."""
+    if isinstance(format, dict):
+        return 'improved_resume' in format.get('properties', {})
+    return '=== IMPROVED RESUME ===' in prompt
+
+
+def response_for_prompt(prompt, format=None):
+    """
+    Return a canned response matching the kind of prompt, built from the
+    resume it contains; JSON when the request carries a ``format`` schema.
+    """
+    match = PROMPT_RESUME_RE.search(prompt)
+    resume_text = match.group('resume') if match else ''
+    skills = extract_skills(resume_text)
+    if wants_improved_resume(prompt, format):
+        return improved_resume_json(resume_text, skills) if format else improved_resume_response(resume_text, skills)
+    return section_evaluation_json(skills) if format else section_evaluation_response(skills)
+
+
+class FakeOllamaClient:
+    """
+    Stand-in for OllamaClient that returns canned responses after a fixed
+    delay, so full LLM flows can be timed without a model server.
+    """
+
+    def __init__(self, resume_text, skills, latency=0.0):
+        self.model = 'benchmark-stub'
+        self.latency = latency
+        self.section_evaluation = section_evaluation_response(skills)
+        self.improved_resume = improved_resume_response(resume_text, skills)
+        self.section_evaluation_json = section_evaluation_json(skills)
+        self.improved_resume_json = improved_resume_json(resume_text, skills)
+        self.calls = 0
+
+    def _respond(self, prompt, format):
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        if wants_improved_resume(prompt, format):
+            return self.improved_resume_json if format else self.improved_resume
+        return self.section_evaluation_json if format else self.section_evaluation
+
+    def generate(self, prompt, options, format=None):
+        return self._respond(prompt, format)
+
+    def generate_stream(self, prompt, options, format=None):
+        response = self._respond(prompt, format)
+        for index in range(0, len(response), 16):
+            yield response[index:index + 16]
@@ -0,0 +1,86 @@
+import logging
+from datetime import timedelta
+
+from django.db import close_old_connections
+from django.utils import timezone
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+JOB_IMPROVE_RESUME = 'improve_resume'
+
+
+class JobError(Exception):
+    """Raised by a job handler to fail the job with a user-facing message."""
+
+
+def _improve_resume(payload):
+    from .services import improve_resume
+
+    result = improve_resume(payload['resume_text'], payload['job_description'])
+    if 'error' in result:
+        raise JobError(result['error'])
+    return result
+
+
+JOB_HANDLERS = {
+    JOB_IMPROVE_RESUME: _improve_resume,
+}
+
+
+def enqueue(kind, payload):
+    """Create a pending job and return it."""
+    if kind not in JOB_HANDLERS:
+        raise ValueError(f'Unknown job kind: {kind}')
+    return Job.objects.create(kind=kind, payload=payload)
+
+
+def claim_next_job():
+    """
+    Atomically claim the oldest pending job, or return None.
+
+    Claiming is a conditional UPDATE on the job's status, so several worker
+    processes can poll the same table without a broker or row locks.
+    """
+    while True:
+        job = Job.objects.filter(status=Job.STATUS_PENDING).order_by('created_at').first()
+        if job is None:
+            return None
+        now = timezone.now()
+        claimed = Job.objects.filter(pk=job.pk, status=Job.STATUS_PENDING).update(
+            status=Job.STATUS_RUNNING, started_at=now
+        )
+        if claimed:
+            job.status = Job.STATUS_RUNNING
+            job.started_at = now
+            return job
+
+
+def run_job(job):
+    """Run a claimed job and record its result or error."""
+    close_old_connections()
+    try:
+        result = JOB_HANDLERS[job.kind](job.payload)
+    except JobError as e:
+        job.status = Job.STATUS_FAILED
+        job.error = str(e)
+    except Exception as e:
+        logger.exception("Job %s failed", job.pk)
+        job.status = Job.STATUS_FAILED
+        job.error = f"Error running job: {str(e)}"
+    else:
+        job.status = Job.STATUS_SUCCEEDED
+        job.result = result
+    job.finished_at = timezone.now()
+    job.save(update_fields=['status', 'result', 'error', 'finished_at'])
+    close_old_connections()
+    return job
+
+
+def requeue_stale_jobs(max_age):
+    """Return jobs stuck in ``running`` for longer than ``max_age`` seconds to the queue."""
+    cutoff = timezone.now() - timedelta(seconds=max_age)
+    return Job.objects.filter(status=Job.STATUS_RUNNING, started_at__lt=cutoff).update(
+        status=Job.STATUS_PENDING, started_at=None
+    )
@@ -0,0 +1,182 @@
+import hashlib
+import json
+import logging
+import threading
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import DatabaseError
+from django.db.models import Sum
+from django.utils import timezone
+
+from .lru import LRUCache
+from .models import CachedLLMResponse
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MEMORY_ENTRIES = 128
+DEFAULT_TTL = 7 * 24 * 60 * 60
+DEFAULT_MAX_BYTES = 50 * 1024 * 1024
+DEFAULT_EVICT_EVERY = 50
+
+
+def _memory_entries():
+    return getattr(settings, 'LLM_CACHE_MEMORY_ENTRIES', DEFAULT_MEMORY_ENTRIES)
+
+
+def _ttl():
+    return getattr(settings, 'LLM_CACHE_TTL', DEFAULT_TTL)
+
+
+_lock = threading.Lock()
+_memory = LRUCache(max_entries=_memory_entries, ttl=_ttl)
+_stats = {
+    'memory_hits': 0,
+    'db_hits': 0,
+    'misses': 0,
+    'stores': 0,
+    'evictions': 0,
+}
+# Stores by this process since the persistent tier was last evicted
+_stores_since_evict = 0
+
+
+def cache_enabled():
+    """
+    Responses are only cached with LLM_DETERMINISTIC on: a sampled answer
+    (temperature 0.7) is one draw of many, and serving it for the whole TTL
+    would freeze it.
+    """
+    return getattr(settings, 'LLM_CACHE_ENABLED', True) and getattr(settings, 'LLM_DETERMINISTIC', False)
+
+
+def normalise_text(text):
+    """Collapse whitespace so cosmetic differences don't change the cache key."""
+    return ' '.join((text or '').split())
+
+
+def make_cache_key(kind, resume_text, job_description, prompt_version, model_name, options):
+    """Hash everything that determines an LLM response into a cache key."""
+    payload = json.dumps({
+        'kind': kind,
+        'resume': normalise_text(resume_text),
+        'job': normalise_text(job_description),
+        'prompt_version': prompt_version,
+        'model': model_name,
+        'options': options,
+    }, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def get(key):
+    """Return the cached response for ``key`` or None."""
+    if not cache_enabled():
+        return None
+
+    response = _memory.get(key)
+    if response is not None:
+        with _lock:
+            _stats['memory_hits'] += 1
+        return response
+
+    ttl = _ttl()
+
+    now = timezone.now()
+    try:
+        entry = CachedLLMResponse.objects.filter(
+            key=key, created_at__gte=now - timedelta(seconds=ttl)
+        ).only('response', 'created_at').first()
+        if entry is not None:
+            CachedLLMResponse.objects.filter(pk=entry.pk).update(last_accessed=now)
+    except DatabaseError as e:
+        logger.warning("LLM cache lookup failed: %s", e)
+        entry = None
+
+    if entry is None:
+        with _lock:
+            _stats['misses'] += 1
+        return None
+
+    with _lock:
+        _stats['db_hits'] += 1
+    _memory.set(key, entry.response, stored_at=entry.created_at.timestamp())
+    return entry.response
+
+
+def _evict_due():
+    global _stores_since_evict
+    with _lock:
+        _stores_since_evict += 1
+        if _stores_since_evict < getattr(settings, 'LLM_CACHE_EVICT_EVERY', DEFAULT_EVICT_EVERY):
+            return False
+        _stores_since_evict = 0
+        return True
+
+
+def store(key, response, kind='', model_name=''):
+    """
+    Store a response in both tiers. Every LLM_CACHE_EVICT_EVERY stores the
+    persistent tier's limits are enforced, so it can briefly hold that many
+    responses over LLM_CACHE_MAX_BYTES (expired rows are never served).
+    """
+    if not cache_enabled():
+        return
+
+    _memory.set(key, response)
+    with _lock:
+        _stats['stores'] += 1
+
+    try:
+        CachedLLMResponse.objects.update_or_create(
+            key=key,
+            defaults={
+                'kind': kind,
+                'model_name': model_name,
+                'response': response,
+                'size': len(response.encode('utf-8')),
+                'created_at': timezone.now(),
+                'last_accessed': timezone.now(),
+            }
+        )
+        if _evict_due():
+            evict()
+    except DatabaseError as e:
+        logger.warning("LLM cache store failed: %s", e)
+
+
+def evict():
+    """Drop expired entries, then least recently used ones until under the size limit."""
+    ttl = _ttl()
+    max_bytes = getattr(settings, 'LLM_CACHE_MAX_BYTES', DEFAULT_MAX_BYTES)
+
+    expired, _ = CachedLLMResponse.objects.filter(
+        created_at__lt=timezone.now() - timedelta(seconds=ttl)
+    ).delete()
+    evicted = expired
+
+    total = CachedLLMResponse.objects.aggregate(total=Sum('size'))['total'] or 0
+    if total > max_bytes:
+        stale_ids = []
+        for pk, size in CachedLLMResponse.objects.order_by('last_accessed').values_list('pk', 'size').iterator():
+            if total <= max_bytes:
+                break
+            stale_ids.append(pk)
+            total -= size
+        CachedLLMResponse.objects.filter(pk__in=stale_ids).delete()
+        evicted += len(stale_ids)
+
+    with _lock:
+        _stats['evictions'] += evicted
+
+
+def clear():
+    """Empty the in-memory tier (the persistent tier is left untouched)."""
+    _memory.clear()
+
+
+def cache_stats():
+    """Return a snapshot of the cache counters."""
+    with _lock:
+        stats = dict(_stats)
+        stats['memory_entries'] = len(_memory)
+        return stats
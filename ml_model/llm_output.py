@@ -0,0 +1,192 @@
+import json
+
+OVERALL_SECTION = 'Overall Resume Score'
+CATEGORIES = ('strengths', 'improvements', 'recommendations')
+MAX_SCORE = 10
+
+_STRING_LIST = {'type': 'array', 'items': {'type': 'string'}}
+_SECTION_SCHEMA = {
+    'type': 'object',
+    'properties': {
+        'name': {'type': 'string'},
+        'score': {'type': 'integer', 'minimum': 0, 'maximum': MAX_SCORE},
+        'strengths': _STRING_LIST,
+        'improvements': _STRING_LIST,
+        'recommendations': _STRING_LIST,
+    },
+    'required': ['name', 'score', 'strengths', 'improvements', 'recommendations'],
+}
+
+# JSON schemas passed as Ollama's ``format`` so generation is constrained to them
+SECTION_EVALUATION_SCHEMA = {
+    'type': 'object',
+    'properties': {
+        'sections': {'type': 'array', 'items': _SECTION_SCHEMA},
+        'overall_score': {'type': 'integer', 'minimum': 0, 'maximum': MAX_SCORE},
+    },
+    'required': ['sections', 'overall_score'],
+}
+IMPROVED_RESUME_SCHEMA = {
+    'type': 'object',
+    'properties': {
+        'sections': {'type': 'array', 'items': _SECTION_SCHEMA},
+        'overall_score': {'type': 'integer', 'minimum': 0, 'maximum': MAX_SCORE},
+        'changes': _STRING_LIST,
+        'improved_resume': {'type': 'string'},
+        'explanation': {'type': 'string'},
+    },
+    'required': ['sections', 'overall_score', 'changes', 'improved_resume'],
+}
+
+
+class LLMOutputError(ValueError):
+    """Raised when a structured LLM response does not match its schema."""
+
+
+def looks_like_json(content):
+    return content.lstrip().startswith('{')
+
+
+def _load(content):
+    try:
+        data = json.loads(content)
+    except ValueError as e:
+        raise LLMOutputError(f'Response is not valid JSON: {str(e)}') from e
+    if not isinstance(data, dict):
+        raise LLMOutputError('Response is not a JSON object')
+    return data
+
+
+def _score(value, field):
+    # Models sometimes quote numbers ("7") or use floats despite the schema
+    if isinstance(value, str) and value.strip().replace('.', '', 1).isdigit():
+        value = float(value)
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or not 0 <= value <= MAX_SCORE:
+        raise LLMOutputError(f'{field} must be a number from 0 to {MAX_SCORE}')
+    return int(round(value))
+
+
+def _string_list(value, field):
+    if not isinstance(value, list) or not all(isinstance(item, str) for item in value):
+        raise LLMOutputError(f'{field} must be a list of strings')
+    return [item.strip() for item in value if item.strip()]
+
+
+def decode_section(data):
+    """Validate one section object and return ``(name, evaluation)``."""
+    if not isinstance(data, dict):
+        raise LLMOutputError('Section must be a JSON object')
+    name = data.get('name')
+    if not isinstance(name, str) or not name.strip():
+        raise LLMOutputError('Section name is missing')
+    evaluation = {'score': str(_score(data.get('score'), f'{name} score'))}
+    for category in CATEGORIES:
+        evaluation[category] = _string_list(data.get(category, []), f'{name} {category}')
+    return name.strip(), evaluation
+
+
+def _decode_sections(data):
+    sections = data.get('sections')
+    if not isinstance(sections, list):
+        raise LLMOutputError('sections must be a list')
+    section_evaluations = dict(decode_section(section) for section in sections)
+    if 'overall_score' in data:
+        section_evaluations[OVERALL_SECTION] = {
+            'score': f"{_score(data['overall_score'], 'overall_score')}/{MAX_SCORE}",
+            'strengths': [],
+            'improvements': [],
+            'recommendations': [],
+        }
+    return section_evaluations
+
+
+def decode_section_evaluations(content):
+    """Decode a JSON section evaluation into the dict the text parser produces."""
+    return _decode_sections(_load(content))
+
+
+def decode_improved_resume(content):
+    """Decode a JSON improved resume into ``(improved_resume, changes, section_evaluations)``."""
+    data = _load(content)
+    improved_resume = data.get('improved_resume')
+    if not isinstance(improved_resume, str):
+        raise LLMOutputError('improved_resume must be a string')
+    changes = _string_list(data.get('changes', []), 'changes')
+    explanation = data.get('explanation')
+    if isinstance(explanation, str) and explanation.strip():
+        changes.append(explanation.strip())
+    return improved_resume.strip(), changes, _decode_sections(data)
+
+
+class SectionStreamDecoder:
+    """
+    Incremental decoder for a streamed JSON section evaluation.
+
+    Tracks nesting (outside strings) as chunks arrive and decodes each
+    object in the top-level ``sections`` array as soon as its closing brace
+    is seen, so sections can be shown before the whole response is done.
+    ``feed`` and ``close`` mirror SectionEvaluationParser.
+    """
+
+    def __init__(self):
+        self.section_evaluations = {}
+        self._buffer = []
+        self._length = 0
+        self._stack = []
+        self._in_string = False
+        self._escape = False
+        self._key = None
+        self._last_string_start = None
+        self._section_start = None
+        self._in_sections = False
+
+    def feed(self, text):
+        completed = []
+        for char in text:
+            position = self._length
+            self._buffer.append(char)
+            self._length += 1
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == '\\':
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    if len(self._stack) == 1:
+                        self._key = ''.join(self._buffer[self._last_string_start + 1:position])
+                continue
+            if char == '"':
+                self._in_string = True
+                self._last_string_start = position
+            elif char in '{[':
+                if char == '[' and len(self._stack) == 1:
+                    self._in_sections = self._key == 'sections'
+                elif char == '{' and len(self._stack) == 2 and self._in_sections:
+                    self._section_start = position
+                self._stack.append(char)
+            elif char in '}]':
+                if self._stack:
+                    self._stack.pop()
+                if char == '}' and len(self._stack) == 2 and self._section_start is not None:
+                    completed.extend(self._emit(''.join(self._buffer[self._section_start:position + 1])))
+                    self._section_start = None
+        return completed
+
+    def _emit(self, raw):
+        try:
+            name, evaluation = decode_section(_load(raw))
+        except LLMOutputError:
+            return []
+        self.section_evaluations[name] = evaluation
+        return [(name, evaluation)]
+
+    def close(self):
+        """Validate the complete response and return sections not yet emitted."""
+        section_evaluations = decode_section_evaluations(''.join(self._buffer))
+        completed = [
+            (name, evaluation) for name, evaluation in section_evaluations.items()
+            if name not in self.section_evaluations
+        ]
+        self.section_evaluations = section_evaluations
+        return completed
@@ -0,0 +1,208 @@
+import random
+import re
+import time
+from django.core.management.base import BaseCommand, CommandError
+from ml_model.services import analyze_keywords
+
+# Vocabulary for synthetic resumes and job descriptions
+WORDS = [
+    'python', 'java', 'kubernetes', 'docker', 'aws', 'azure', 'sql', 'postgresql', 'react',
+    'django', 'flask', 'spark', 'hadoop', 'tensorflow', 'pytorch', 'analytics', 'pipeline',
+    'designed', 'developed', 'implemented', 'managed', 'delivered', 'optimised', 'scalable',
+    'distributed', 'systems', 'services', 'platform', 'customers', 'stakeholders', 'team',
+    'engineering', 'reliability', 'performance', 'latency', 'throughput', 'migration',
+    'architecture', 'microservices', 'testing', 'automation', 'deployment', 'monitoring',
+    'security', 'compliance', 'reporting', 'dashboards', 'forecasting', 'modelling',
+    'the', 'and', 'with', 'for', 'of', 'to', 'in', 'on', 'a', 'an', 'using', 'across',
+]
+SECTION_HEADERS = ['Summary', 'Experience', 'Education', 'Skills', 'Projects']
+WORDS_PER_PAGE = 500
+
+# Previous implementation, kept verbatim as the baseline for comparison
+def legacy_analyze_keywords(resume_text, job_description):
+    """
+    Analyze keywords in resume and job description to generate detailed matching analysis.
+    Returns a dictionary with keyword relevance scores, section analysis, and matching details.
+    """
+    # Common resume sections to look for
+    sections = {
+        'summary': ['summary', 'profile', 'objective'],
+        'experience': ['experience', 'work history', 'employment'],
+        'education': ['education', 'academic', 'qualification'],
+        'skills': ['skills', 'technical skills', 'competencies'],
+        'projects': ['projects', 'portfolio', 'achievements']
+    }
+    
+    # Extract keywords from both texts
+    resume_keywords = legacy_extract_keywords(resume_text)
+    job_keywords = legacy_extract_keywords(job_description)
+    
+    # Initialize section data
+    section_data = {section: {'keywords': [], 'score': 0} for section in sections}
+    
+    # Split resume into sections
+    resume_sections = {}
+    current_section = 'other'
+    lines = resume_text.lower().split('\n')
+    
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+            
+        # Check if line indicates a new section
+        for section, keywords in sections.items():
+            if any(keyword in line for keyword in keywords):
+                current_section = section
+                break
+        
+        if current_section not in resume_sections:
+            resume_sections[current_section] = []
+        resume_sections[current_section].append(line)
+    
+    # Track matched and missing keywords
+    matched_keywords = []
+    missing_keywords = []
+    
+    # Analyze each section
+    for section, content in resume_sections.items():
+        section_text = ' '.join(content)
+        section_keywords = legacy_extract_keywords(section_text)
+        
+        # Find matching keywords
+        matching_keywords = []
+        for keyword in job_keywords:
+            if keyword in section_keywords:
+                count = section_keywords.count(keyword)
+                matching_keywords.append({
+                    'keyword': keyword,
+                    'count': count,
+                    'relevance': 1.0  # Full relevance for exact matches
+                })
+                
+                # Add to matched keywords if not already there
+                if not any(k['keyword'] == keyword for k in matched_keywords):
+                    matched_keywords.append({
+                        'keyword': keyword,
+                        'sections': [{
+                            'name': section,
+                            'count': count
+                        }]
+                    })
+                else:
+                    # Add section to existing matched keyword
+                    for k in matched_keywords:
+                        if k['keyword'] == keyword:
+                            k['sections'].append({
+                                'name': section,
+                                'count': count
+                            })
+        
+        # Calculate section score
+        section_score = len(matching_keywords) / len(job_keywords) if job_keywords else 0
+        
+        if section in section_data:
+            section_data[section]['keywords'] = matching_keywords
+            section_data[section]['score'] = section_score
+    
+    # Find missing keywords
+    missing_keywords = [keyword for keyword in job_keywords 
+                       if not any(k['keyword'] == keyword for k in matched_keywords)]
+    
+    # Calculate overall match percentage
+    match_percentage = (len(matched_keywords) / len(job_keywords) * 100) if job_keywords else 0
+    
+    return {
+        'section_analysis': section_data,
+        'matched_keywords': matched_keywords,
+        'missing_keywords': missing_keywords,
+        'match_percentage': round(match_percentage, 1),
+        'resume_keywords': {k: resume_keywords.count(k) for k in set(resume_keywords)},
+        'job_keywords': {k: job_keywords.count(k) for k in set(job_keywords)}
+    }
+
+def legacy_extract_keywords(text):
+    """
+    Extract important keywords from text.
+    """
+    # Convert to lowercase and remove special characters
+    text = text.lower()
+    text = re.sub(r'[^\w\s]', ' ', text)
+    
+    # Split into words and remove common words
+    words = text.split()
+    stop_words = set([
+        'the', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'with', 'by', 'of', 'a', 'an',
+        'is', 'are', 'was', 'were', 'be', 'been', 'being', 'have', 'has', 'had', 'do', 'does',
+        'did', 'will', 'would', 'shall', 'should', 'can', 'could', 'may', 'might', 'must',
+        'this', 'that', 'these', 'those', 'i', 'you', 'he', 'she', 'it', 'we', 'they',
+        'me', 'him', 'her', 'us', 'them', 'my', 'your', 'his', 'its', 'our', 'their',
+        'mine', 'yours', 'hers', 'ours', 'theirs', 'who', 'whom', 'whose', 'which', 'what',
+        'where', 'when', 'why', 'how', 'all', 'any', 'both', 'each', 'few', 'more', 'most',
+        'other', 'some', 'such', 'no', 'nor', 'not', 'only', 'own', 'same', 'so', 'than',
+        'too', 'very', 's', 't', 'can', 'will', 'just', 'don', 'should', 'now'
+    ])
+    
+    # Filter out stop words and short words
+    words = [word for word in words if word not in stop_words and len(word) > 2]
+    
+    # Count word frequencies
+    word_freq = {}
+    for word in words:
+        word_freq[word] = word_freq.get(word, 0) + 1
+    
+    # Return top keywords (words that appear more than once)
+    return [word for word, freq in word_freq.items() if freq > 1]
+
+
+def synthetic_text(rng, word_count, headers=True):
+    """Generate text with ``word_count`` words, optionally split into resume sections."""
+    # Half common words, half from a vocabulary that grows with the text, so
+    # long documents have many distinct repeated keywords (the quadratic case)
+    vocabulary_size = max(1, word_count // 4)
+    words = rng.choices(WORDS, k=word_count // 2) + [f'term{rng.randrange(vocabulary_size)}' for _ in range(word_count - word_count // 2)]
+    rng.shuffle(words)
+    lines = [' '.join(words[i:i + 12]) + '.' for i in range(0, len(words), 12)]
+    if headers:
+        step = max(1, len(lines) // len(SECTION_HEADERS))
+        for index, header in enumerate(SECTION_HEADERS):
+            lines.insert(min(index * (step + 1), len(lines)), header)
+    return '\n'.join(lines)
+
+def _time(fn, *args, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+class Command(BaseCommand):
+    help = 'Benchmark analyze_keywords against the previous quadratic implementation'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--pages', type=int, nargs='+', default=[1, 5, 10, 20],
+                            help='Resume sizes in pages (~500 words each)')
+        parser.add_argument('--jd-words', type=int, nargs='+', default=[200, 1000, 3000],
+                            help='Job description sizes in words')
+        parser.add_argument('--repeat', type=int, default=3, help='Runs per case (best time is reported)')
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        self.stdout.write(f"{'pages':>5} {'jd words':>8} {'legacy ms':>10} {'current ms':>10} {'speedup':>8}")
+        
+        for pages in options['pages']:
+            resume_text = synthetic_text(rng, pages * WORDS_PER_PAGE)
+            for jd_words in options['jd_words']:
+                job_description = synthetic_text(rng, jd_words, headers=False)
+                
+                legacy_time, expected = _time(legacy_analyze_keywords, resume_text, job_description, repeat=options['repeat'])
+                current_time, actual = _time(analyze_keywords, resume_text, job_description, repeat=options['repeat'])
+                if actual != expected:
+                    raise CommandError(f'Output differs from the legacy implementation ({pages} pages, {jd_words} JD words)')
+                
+                self.stdout.write(
+                    f'{pages:>5} {jd_words:>8} {legacy_time * 1000:>10.2f} {current_time * 1000:>10.2f} '
+                    f'{legacy_time / current_time:>7.1f}x'
+                )
@@ -0,0 +1,184 @@
+import json
+import os
+import platform
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime, timezone
+from unittest import mock
+
+import pandas as pd
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+
+from analyser.management.commands.benchmark_parsing import write_docx, write_pdf
+from analyser.utils import parse_resume
+from ml_model import services
+from ml_model.fake_llm import FakeOllamaClient
+from ml_model.train_model import fit_model, predict_resume_match
+from ml_model.utils import extract_skills_from_text, get_skill_matcher
+
+FILLER = [
+    'designed', 'developed', 'implemented', 'managed', 'delivered', 'scalable', 'distributed',
+    'systems', 'services', 'platform', 'customers', 'stakeholders', 'team', 'engineering',
+    'performance', 'migration', 'architecture', 'reporting', 'the', 'and', 'with', 'for',
+    'of', 'to', 'in', 'on', 'using', 'across',
+]
+SECTION_HEADERS = ['Summary', 'Experience', 'Education', 'Skills', 'Projects']
+WORDS_PER_LINE = 12
+LINES_PER_PAGE = 40
+
+def synthetic_resume(rng, skills, pages):
+    """Resume text with section headers and taxonomy skills mixed into filler prose."""
+    lines = []
+    line_count = pages * LINES_PER_PAGE
+    step = max(1, line_count // len(SECTION_HEADERS))
+    for index in range(line_count):
+        if index % step == 0 and index // step < len(SECTION_HEADERS):
+            lines.append(SECTION_HEADERS[index // step])
+        words = rng.choices(FILLER, k=WORDS_PER_LINE - 2) + rng.sample(skills, 2)
+        rng.shuffle(words)
+        lines.append(' '.join(words) + '.')
+    return '\n'.join(lines)
+
+
+def synthetic_job_description(rng, skills, word_count):
+    words = rng.choices(FILLER, k=word_count - word_count // 5) + rng.choices(skills, k=word_count // 5)
+    rng.shuffle(words)
+    return ' '.join(words)
+
+
+def measure(fn, *args, repeat):
+    """Run ``fn`` ``repeat`` times; returns (timings in seconds, last result)."""
+    timings = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(*args)
+        timings.append(time.perf_counter() - start)
+    return timings, result
+
+
+def summarise(timings):
+    ordered = sorted(timings)
+    return {
+        'runs': len(ordered),
+        'min_ms': round(ordered[0] * 1000, 3),
+        'median_ms': round(statistics.median(ordered) * 1000, 3),
+        'p95_ms': round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000, 3),
+        'max_ms': round(ordered[-1] * 1000, 3),
+    }
+
+
+class Command(BaseCommand):
+    help = 'Benchmark each stage of the analysis pipeline with synthetic inputs and a stubbed LLM'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dataset', default=os.path.join(settings.BASE_DIR, 'AI_Resume_Screening.csv'),
+                            help='CSV used to train the benchmark model')
+        parser.add_argument('--train-rows', type=int, default=300, help='Rows of the dataset to train on')
+        parser.add_argument('--pages', type=int, nargs='+', default=[1, 3, 10],
+                            help='Resume sizes in pages')
+        parser.add_argument('--jd-words', type=int, nargs='+', default=[150, 600],
+                            help='Job description sizes in words')
+        parser.add_argument('--repeat', type=int, default=5, help='Runs per stage and case')
+        parser.add_argument('--llm-latency', type=float, default=0.0,
+                            help='Seconds the stub LLM waits before answering')
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--output', default='benchmark_pipeline.json',
+                            help='JSON file the results are written to')
+
+    def handle(self, *args, **options):
+        if not os.path.exists(options['dataset']):
+            raise CommandError(f"Dataset not found: {options['dataset']}")
+        rng = random.Random(options['seed'])
+        repeat = options['repeat']
+        skills = sorted(get_skill_matcher().aliases)
+
+        start = time.perf_counter()
+        model, accuracy = fit_model(pd.read_csv(options['dataset'], nrows=options['train_rows']))
+        self.stdout.write(f"Trained benchmark model on {options['train_rows']} rows in "
+                          f"{time.perf_counter() - start:.2f}s (accuracy {accuracy:.2f})")
+
+        results = []
+
+        def record(stage, timings, **case):
+            summary = summarise(timings)
+            results.append({'stage': stage, **case, **summary})
+            label = ' '.join(f'{key}={value}' for key, value in case.items())
+            self.stdout.write(f"{stage:<32} {label:<24} median {summary['median_ms']:>10.3f} ms  "
+                              f"p95 {summary['p95_ms']:>10.3f} ms")
+
+        # Keep cached LLM responses out of the timings and don't persist them
+        with tempfile.TemporaryDirectory() as tmpdir, override_settings(LLM_CACHE_ENABLED=False):
+            for pages in options['pages']:
+                resume_text = synthetic_resume(rng, skills, pages)
+                page_lines = resume_text.split('\n')
+                page_chunks = [page_lines[i:i + LINES_PER_PAGE] for i in range(0, len(page_lines), LINES_PER_PAGE)]
+
+                paths = {
+                    'txt': os.path.join(tmpdir, f'resume_{pages}.txt'),
+                    'pdf': os.path.join(tmpdir, f'resume_{pages}.pdf'),
+                    'docx': os.path.join(tmpdir, f'resume_{pages}.docx'),
+                }
+                with open(paths['txt'], 'w', encoding='utf-8') as file:
+                    file.write(resume_text)
+                write_pdf(paths['pdf'], page_chunks)
+                write_docx(paths['docx'], page_chunks, rng)
+                for file_format, path in paths.items():
+                    timings, _ = measure(parse_resume, path, repeat=repeat)
+                    record('parse_resume', timings, pages=pages, format=file_format)
+
+                timings, resume_skills = measure(extract_skills_from_text, resume_text, repeat=repeat)
+                record('extract_skills_from_text', timings, pages=pages)
+
+                for jd_words in options['jd_words']:
+                    job_description = synthetic_job_description(rng, skills, jd_words)
+                    case = {'pages': pages, 'jd_words': jd_words}
+
+                    timings, _ = measure(predict_resume_match, resume_skills, job_description, model, repeat=repeat)
+                    record('predict_resume_match', timings, **case)
+
+                    timings, _ = measure(services.analyze_keywords, resume_text, job_description, repeat=repeat)
+                    record('analyze_keywords', timings, **case)
+
+                    client = FakeOllamaClient(resume_text, skills, latency=options['llm_latency'])
+                    timings, _ = measure(services.parse_section_evaluations, client.section_evaluation, repeat=repeat)
+                    record('parse_section_evaluations', timings, **case)
+                    timings, _ = measure(services.parse_improved_resume, client.improved_resume, repeat=repeat)
+                    record('parse_improved_resume', timings, **case)
+                    timings, _ = measure(services.parse_section_evaluations, client.section_evaluation_json,
+                                         repeat=repeat)
+                    record('parse_section_evaluations_json', timings, **case)
+                    timings, _ = measure(services.parse_improved_resume, client.improved_resume_json, repeat=repeat)
+                    record('parse_improved_resume_json', timings, **case)
+
+                    with mock.patch.object(services, 'get_ollama_client', return_value=client), \
+                            mock.patch.object(services, 'get_active_model', return_value=(object(), model)):
+                        timings, result = measure(services.predict_resume_success, resume_text, job_description,
+                                                  repeat=repeat)
+                        if 'error' in result:
+                            raise CommandError(f"predict_resume_success failed: {result['error']}")
+                        record('predict_resume_success', timings, **case)
+
+                        timings, result = measure(services.generate_improved_resume, resume_text, job_description,
+                                                  repeat=repeat)
+                        if isinstance(result, tuple):
+                            raise CommandError(f'generate_improved_resume failed: {result[1]}')
+                        record('generate_improved_resume', timings, **case)
+
+        report = {
+            'created_at': datetime.now(timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'options': {key: options[key] for key in (
+                'train_rows', 'pages', 'jd_words', 'repeat', 'llm_latency', 'seed'
+            )},
+            'model_accuracy': accuracy,
+            'results': results,
+        }
+        with open(options['output'], 'w', encoding='utf-8') as file:
+            json.dump(report, file, indent=2)
+        self.stdout.write(self.style.SUCCESS(f"Wrote {len(results)} results to {options['output']}"))
@@ -0,0 +1,132 @@
+import json
+import re
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from django.core.management.base import BaseCommand
+
+from ml_model.fake_llm import response_for_prompt
+
+# Roughly one Ollama token per word piece
+TOKEN_RE = re.compile(r'\s*\S+')
+
+
+def _timestamp():
+    return datetime.now(timezone.utc).isoformat()
+
+
+class FakeOllamaHandler(BaseHTTPRequestHandler):
+    """
+    Serves ``/api/generate`` like Ollama, with canned section-formatted
+    responses, or JSON ones when the request sets ``format``.
+    """
+
+    protocol_version = 'HTTP/1.1'
+    latency = 0.0
+    tokens_per_second = 0.0
+    quiet = False
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _token_delay(self):
+        if self.tokens_per_second > 0:
+            time.sleep(1.0 / self.tokens_per_second)
+
+    def do_GET(self):
+        if self.path == '/api/tags':
+            self._send_json(200, {'models': [{'name': 'fake'}]})
+        else:
+            self._send_json(404, {'error': 'not found'})
+
+    def do_POST(self):
+        if self.path != '/api/generate':
+            self._send_json(404, {'error': 'not found'})
+            return
+        try:
+            request = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))))
+        except ValueError:
+            self._send_json(400, {'error': 'invalid JSON body'})
+            return
+
+        model = request.get('model', 'fake')
+        tokens = TOKEN_RE.findall(response_for_prompt(request.get('prompt', ''), request.get('format')))
+        start = time.perf_counter()
+        time.sleep(self.latency)
+
+        if request.get('stream', True):
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/x-ndjson')
+            self.send_header('Transfer-Encoding', 'chunked')
+            self.end_headers()
+            try:
+                for token in tokens:
+                    self._token_delay()
+                    self._write_chunk({'model': model, 'created_at': _timestamp(), 'response': token, 'done': False})
+                self._write_chunk(self._final(model, tokens, start))
+                self.wfile.write(b'0\r\n\r\n')
+            except (BrokenPipeError, ConnectionResetError):
+                # The client stopped reading, as Ollama clients do once they have enough
+                self.close_connection = True
+        else:
+            for _ in tokens:
+                self._token_delay()
+            self._send_json(200, dict(self._final(model, tokens, start), response=''.join(tokens)))
+
+    def _write_chunk(self, payload):
+        line = json.dumps(payload).encode('utf-8') + b'\n'
+        self.wfile.write(f'{len(line):x}\r\n'.encode('ascii') + line + b'\r\n')
+        self.wfile.flush()
+
+    def _final(self, model, tokens, start):
+        return {
+            'model': model,
+            'created_at': _timestamp(),
+            'response': '',
+            'done': True,
+            'done_reason': 'stop',
+            'total_duration': int((time.perf_counter() - start) * 1e9),
+            'eval_count': len(tokens),
+        }
+
+    def log_message(self, format, *args):
+        if not self.quiet:
+            super().log_message(format, *args)
+
+
+class Command(BaseCommand):
+    help = 'Run a local stand-in for the Ollama /api/generate endpoint for load testing'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--host', default='127.0.0.1')
+        parser.add_argument('--port', type=int, default=11434)
+        parser.add_argument('--latency', type=float, default=0.5,
+                            help='Seconds before the first token (prompt processing time)')
+        parser.add_argument('--tokens-per-second', type=float, default=50.0,
+                            help='Generation speed; 0 returns the whole response at once')
+        parser.add_argument('--quiet', action='store_true', help='Do not log each request')
+
+    def handle(self, *args, **options):
+        handler = type('ConfiguredFakeOllamaHandler', (FakeOllamaHandler,), {
+            'latency': options['latency'],
+            'tokens_per_second': options['tokens_per_second'],
+            'quiet': options['quiet'],
+        })
+        server = ThreadingHTTPServer((options['host'], options['port']), handler)
+        server.daemon_threads = True
+        self.stdout.write(
+            f"Fake Ollama listening on http://{options['host']}:{options['port']} "
+            f"(latency {options['latency']}s, {options['tokens_per_second']} tokens/s)"
+        )
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
@@ -0,0 +1,66 @@
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from ml_model.jobs import claim_next_job, requeue_stale_jobs, run_job
+
+# Seconds between checks for jobs whose worker died mid-run
+REQUEUE_INTERVAL = 60
+
+class Command(BaseCommand):
+    help = 'Process queued background jobs (e.g. improved resume generation)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--concurrency', type=int,
+            default=getattr(settings, 'JOB_WORKER_CONCURRENCY', 2),
+            help='Maximum number of jobs run at the same time'
+        )
+        parser.add_argument(
+            '--poll-interval', type=float,
+            default=getattr(settings, 'JOB_WORKER_POLL_INTERVAL', 1.0),
+            help='Seconds to wait before checking an empty queue again'
+        )
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Exit once the queue is empty instead of polling forever'
+        )
+
+    def handle(self, *args, **options):
+        concurrency = max(1, options['concurrency'])
+        poll_interval = options['poll_interval']
+        stale_after = getattr(settings, 'JOB_STALE_AFTER', 3600)
+        next_requeue = 0
+        
+        self.stdout.write(f'Job worker started with concurrency {concurrency}')
+        running = set()
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='job-worker') as executor:
+            try:
+                while True:
+                    # Jobs left running by a crashed worker go back to the queue
+                    # while this one is up, not only when a worker restarts
+                    if time.monotonic() >= next_requeue:
+                        requeued = requeue_stale_jobs(stale_after)
+                        if requeued:
+                            self.stdout.write(f'Requeued {requeued} stale job(s)')
+                        next_requeue = time.monotonic() + min(REQUEUE_INTERVAL, stale_after)
+                    
+                    # Only claim work when there is a free slot, so load stays bounded
+                    job = claim_next_job() if len(running) < concurrency else None
+                    if job is not None:
+                        self.stdout.write(f'Running {job}')
+                        running.add(executor.submit(run_job, job))
+                        continue
+                    
+                    if running:
+                        done, running = wait(running, timeout=poll_interval, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            finished = future.result()
+                            style = self.style.SUCCESS if finished.status == finished.STATUS_SUCCEEDED else self.style.ERROR
+                            self.stdout.write(style(f'Finished {finished}'))
+                    elif options['once']:
+                        break
+                    else:
+                        time.sleep(poll_interval)
+            except KeyboardInterrupt:
+                self.stdout.write('Stopping job worker, waiting for running jobs...')
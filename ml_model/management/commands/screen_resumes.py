@@ -0,0 +1,157 @@
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+import csv
+import json
+import os
+import sys
+import time
+import django
+from django.core.management.base import BaseCommand, CommandError
+from analyser.utils import parse_resume
+from ml_model.registry import get_active_model
+from ml_model.services import evaluate_sections
+from ml_model.train_model import predict_resume_matches
+from ml_model.utils import extract_skills
+
+SUPPORTED_EXTENSIONS = ('.pdf', '.docx', '.txt')
+FIELDS = ['file', 'prediction', 'skills_found', 'matching_skills', 'overall_score', 'error']
+
+def _parse_file(file_path):
+    """Parse one resume and extract its skills (runs in a worker process)."""
+    try:
+        text = parse_resume(file_path)
+        return file_path, text, extract_skills(text), None
+    except Exception as e:
+        return file_path, None, [], str(e)
+
+class Command(BaseCommand):
+    help = 'Score every resume in a directory against one job description'
+
+    def add_arguments(self, parser):
+        parser.add_argument('directory', help='Directory containing PDF, DOCX or TXT resumes')
+        parser.add_argument('--jd', required=True, help='Text file with the job description')
+        parser.add_argument('--output', default='-', help='Output file (default: stdout)')
+        parser.add_argument(
+            '--format', choices=['csv', 'jsonl'],
+            help='Output format (default: from the output file extension, else jsonl)'
+        )
+        parser.add_argument('--workers', type=int, default=os.cpu_count(), help='Parser processes')
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help='Maximum resumes scored per predict_proba call'
+        )
+        parser.add_argument(
+            '--flush-every', type=int, default=100,
+            help='Score and write results at least every N resumes'
+        )
+        parser.add_argument(
+            '--flush-interval', type=float, default=5.0,
+            help='Score and write results at least every N seconds'
+        )
+        parser.add_argument(
+            '--with-llm', action='store_true',
+            help='Also run the LLM section evaluation for every resume (slow)'
+        )
+        parser.add_argument('--llm-concurrency', type=int, default=2, help='Parallel LLM requests with --with-llm')
+
+    def handle(self, *args, **options):
+        directory = options['directory']
+        if not os.path.isdir(directory):
+            raise CommandError(f'Directory not found: {directory}')
+        
+        try:
+            with open(options['jd'], 'r', encoding='utf-8') as file:
+                job_description = file.read().strip()
+        except OSError as e:
+            raise CommandError(f'Could not read job description: {str(e)}')
+        
+        model_record, model = get_active_model()
+        if not model:
+            raise CommandError('No active model found. Please train the model first.')
+        
+        file_paths = sorted(
+            entry.path for entry in os.scandir(directory)
+            if entry.is_file() and entry.name.lower().endswith(SUPPORTED_EXTENSIONS)
+        )
+        self.stderr.write(f'Screening {len(file_paths)} resume(s) with {model_record}')
+        
+        output_format = options['format']
+        if output_format is None:
+            output_format = 'csv' if options['output'].lower().endswith('.csv') else 'jsonl'
+        
+        output = sys.stdout if options['output'] == '-' else open(options['output'], 'w', newline='', encoding='utf-8')
+        try:
+            writer = csv.DictWriter(output, fieldnames=FIELDS) if output_format == 'csv' else None
+            if writer:
+                writer.writeheader()
+            
+            job_skills = extract_skills(job_description)
+            job_skill_set = set(job_skills)
+            llm_executor = ThreadPoolExecutor(max_workers=options['llm_concurrency']) if options['with_llm'] else None
+            
+            def write_rows(rows):
+                for row in rows:
+                    if writer:
+                        writer.writerow({**row, 'skills_found': ', '.join(row['skills_found']),
+                                         'matching_skills': ', '.join(row['matching_skills'])})
+                    else:
+                        output.write(json.dumps(row) + '\n')
+                output.flush()
+            
+            def score_batch(batch):
+                rows = []
+                parsed = [item for item in batch if item[3] is None]
+                # Score the skills string, as score_resume does for a single upload
+                skill_strings = [', '.join(skills) for _, _, skills, _ in parsed]
+                probabilities = predict_resume_matches(
+                    skill_strings, job_description, model,
+                    resume_skills=[skills for _, _, skills, _ in parsed],
+                    job_skills=job_skills
+                )
+                scores = dict(zip((item[0] for item in parsed), probabilities))
+                
+                evaluations = {}
+                if llm_executor:
+                    futures = {
+                        llm_executor.submit(evaluate_sections, text, job_description): path
+                        for path, text, _, _ in parsed
+                    }
+                    for future in as_completed(futures):
+                        evaluations[futures[future]] = future.result()
+                
+                for path, _, skills, error in batch:
+                    evaluation = evaluations.get(path, {})
+                    overall = evaluation.get('section_evaluations', {}).get('Overall Resume Score', {})
+                    rows.append({
+                        'file': os.path.relpath(path, directory),
+                        'prediction': round(scores[path] * 100, 1) if path in scores else None,
+                        'skills_found': skills,
+                        'matching_skills': [skill for skill in skills if skill in job_skill_set],
+                        'overall_score': overall.get('score'),
+                        'error': error or evaluation.get('error'),
+                    })
+                return rows
+            
+            done = 0
+            batch = []
+            flush_every = max(1, min(options['batch_size'], options['flush_every']))
+            last_flush = time.monotonic()
+            with ProcessPoolExecutor(max_workers=max(1, options['workers']), initializer=django.setup) as executor:
+                for future in as_completed(executor.submit(_parse_file, path) for path in file_paths):
+                    batch.append(future.result())
+                    if len(batch) >= flush_every or time.monotonic() - last_flush >= options['flush_interval']:
+                        write_rows(score_batch(batch))
+                        done += len(batch)
+                        batch = []
+                        last_flush = time.monotonic()
+                        self.stderr.write(f'Scored {done}/{len(file_paths)}')
+            if batch:
+                write_rows(score_batch(batch))
+                done += len(batch)
+            
+            if llm_executor:
+                llm_executor.shutdown()
+        finally:
+            if output is not sys.stdout:
+                output.close()
+        
+        self.stderr.write(self.style.SUCCESS(f'Screened {done} resume(s)'))
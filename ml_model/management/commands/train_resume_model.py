@@ -1,41 +1,204 @@
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
 from django.conf import settings
+from django.utils import timezone
+import json
 import os
+import joblib
+import pandas as pd
 from ml_model.models import ResumePredictor
-from ml_model.train_model import train_model
+from ml_model.registry import activate
+from ml_model.model_search import SEARCH_MODES, load_param_grid, search_model
+from ml_model.model_selection import (
+    MODEL_FAMILIES, PROFILE_FIELDS, latency_budget_ms, memory_budget_mb, profile_model, select_model,
+)
+from ml_model.streaming_train import DEFAULT_CHUNK_SIZE, DEFAULT_HASH_FEATURES, train_streaming
+from ml_model.train_model import preprocess_data, save_model, train_model
+
+# Feature rows the inference cost of a trained model is profiled on
+PROFILE_ROWS = 200
+
+def profile_on_dataset(pipeline, df):
+    X, _ = preprocess_data(df.head(PROFILE_ROWS).copy())
+    return profile_model(pipeline, X)
+
+def format_bytes(size):
+    return f'{size / 1024 / 1024:.1f} MB'
+
+def describe_cost(profile):
+    return (f"p95 {profile['latency_p95_ms']:.2f} ms/row, batch of 64 p95 {profile['batch_latency_p95_ms']:.2f} ms, "
+            f"{format_bytes(profile['memory_bytes'])} loaded, {profile['artifact_size'] / 1024:.0f} KB on disk, "
+            f"load {profile['load_time'] * 1000:.0f} ms")
 
 class Command(BaseCommand):
     help = 'Train the resume prediction model using the dataset'
 
+    def add_arguments(self, parser):
+        parser.add_argument('--dataset', default=os.path.join(settings.BASE_DIR, 'AI_Resume_Screening.csv'))
+        parser.add_argument('--search', choices=SEARCH_MODES, default=None,
+                            help='Run a cross-validated hyperparameter search instead of the default fit')
+        parser.add_argument('--param-grid', default=None,
+                            help='JSON file mapping tfidf__/classifier__ parameters to lists of values')
+        parser.add_argument('--n-iter', type=int, default=20, help='Candidates sampled in random search')
+        parser.add_argument('--cv', type=int, default=5, help='Cross-validation folds')
+        parser.add_argument('--n-jobs', type=int, default=-1, help='Parallel workers (-1 = all cores)')
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--report', default=None,
+                            help='Search/selection report path (default: next to the model artifact)')
+        parser.add_argument('--select', action='store_true',
+                            help='Train several model families and keep the most accurate one within the budgets')
+        parser.add_argument('--families', nargs='+', choices=sorted(MODEL_FAMILIES), default=None,
+                            help='Model families to compare with --select (default: all)')
+        parser.add_argument('--max-latency-ms', type=float, default=None,
+                            help='Single-row predict_proba p95 budget (default: ML_MODEL_MAX_LATENCY_MS)')
+        parser.add_argument('--max-memory-mb', type=float, default=None,
+                            help='Loaded model size budget (default: ML_MODEL_MAX_MEMORY_MB)')
+        parser.add_argument('--streaming', action='store_true',
+                            help='Train out of core: read the CSV in chunks, hash skills, fit incrementally')
+        parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help='Rows per chunk with --streaming')
+        parser.add_argument('--epochs', type=int, default=5, help='Passes over the dataset with --streaming')
+        parser.add_argument('--hash-features', type=int, default=DEFAULT_HASH_FEATURES,
+                            help='Hashed skill feature dimensions with --streaming')
+        parser.add_argument('--no-activate', action='store_true',
+                            help='Register the search, selection or streaming model without making it active')
+
     def handle(self, *args, **options):
-        dataset_path = os.path.join(settings.BASE_DIR, 'AI_Resume_Screening.csv')
-        
+        dataset_path = options['dataset']
+
         if not os.path.exists(dataset_path):
             self.stdout.write(self.style.ERROR(f'Dataset not found at {dataset_path}'))
             return
-        
+
+        if sum(bool(options[mode]) for mode in ('search', 'select', 'streaming')) > 1:
+            raise CommandError('--search, --select and --streaming are mutually exclusive')
+        if options['search']:
+            self._search(dataset_path, options)
+            return
+        if options['select']:
+            self._select(dataset_path, options)
+            return
+        if options['streaming']:
+            self._streaming(dataset_path, options)
+            return
+
         self.stdout.write('Training model...')
         try:
             accuracy, model_path = train_model(dataset_path)
-            
+            profile = profile_on_dataset(joblib.load(model_path), pd.read_csv(dataset_path))
+
             # Create or update the model record
-            model, created = ResumePredictor.objects.get_or_create(
+            model, created = ResumePredictor.objects.update_or_create(
                 name='Resume Predictor v1',
                 defaults={
                     'model_file': os.path.relpath(model_path, settings.MEDIA_ROOT),
                     'accuracy': accuracy,
-                    'is_active': True
-                }
+                    'family': 'random_forest',
+                    **profile,
+                },
             )
-            
-            if not created:
-                model.model_file = os.path.relpath(model_path, settings.MEDIA_ROOT)
-                model.accuracy = accuracy
-                model.save()
-            
+            activate(model)
+
             self.stdout.write(self.style.SUCCESS(
-                f'Model trained successfully! Accuracy: {accuracy:.2%}'
+                f'Model trained successfully! Accuracy: {accuracy:.2%}; {describe_cost(profile)}'
             ))
-            
+
         except Exception as e:
-            self.stdout.write(self.style.ERROR(f'Error training model: {str(e)}')) 
\ No newline at end of file
+            self.stdout.write(self.style.ERROR(f'Error training model: {str(e)}'))
+
+    def _search(self, dataset_path, options):
+        param_grid = None
+        if options['param_grid']:
+            try:
+                with open(options['param_grid'], 'r', encoding='utf-8') as file:
+                    param_grid = load_param_grid(json.load(file))
+            except (OSError, ValueError) as e:
+                raise CommandError(f"Invalid parameter grid {options['param_grid']}: {str(e)}")
+
+        self.stdout.write(f"Running {options['search']} search with {options['cv']}-fold cross-validation...")
+        df = pd.read_csv(dataset_path)
+        pipeline, report = search_model(
+            df.copy(), param_grid, mode=options['search'], n_iter=options['n_iter'],
+            cv=options['cv'], n_jobs=options['n_jobs'], random_state=options['seed'],
+            verbose=10 if options['verbosity'] > 1 else 0,
+        )
+
+        for result in report['results'][:10]:
+            self.stdout.write(
+                f"{result['rank']:>3}. {result['mean_score']:.4f} ± {result['std_score']:.4f}  "
+                f"fit {result['mean_fit_time']:.2f}s  {json.dumps(result['params'])}"
+            )
+        self.stdout.write(
+            f"{report['candidates']} candidates, {report['classifier_fits']} fits on {report['n_jobs']} workers "
+            f"in {report['search_time_s']:.1f}s ({report['feature_fits']} TF-IDF fits)"
+        )
+
+        profile = profile_on_dataset(pipeline, df)
+        self._register(pipeline, f"{options['search']} search", report['holdout_accuracy'], 'random_forest',
+                       profile, dict(report, profile=profile), 'search', options)
+
+    def _select(self, dataset_path, options):
+        max_latency_ms = options['max_latency_ms'] if options['max_latency_ms'] is not None else latency_budget_ms()
+        max_memory_mb = options['max_memory_mb'] if options['max_memory_mb'] is not None else memory_budget_mb()
+        self.stdout.write(f'Training and profiling candidate model families '
+                          f'(budget: p95 {max_latency_ms} ms/row, {max_memory_mb} MB)...')
+        pipeline, candidates = select_model(
+            pd.read_csv(dataset_path), options['families'], max_latency_ms, max_memory_mb,
+            random_state=options['seed'],
+        )
+        for candidate in candidates:
+            marker = '*' if candidate['selected'] else ' ' if candidate['within_budget'] else 'x'
+            self.stdout.write(f"{marker} {candidate['family']:<24} accuracy {candidate['accuracy']:.4f}  "
+                              f"{describe_cost(candidate)}")
+        if pipeline is None:
+            raise CommandError('No model family fits the latency and memory budgets')
+
+        best = next(candidate for candidate in candidates if candidate['selected'])
+        profile = {key: best[key] for key in PROFILE_FIELDS}
+        report = {
+            'max_latency_ms': max_latency_ms,
+            'max_memory_mb': max_memory_mb,
+            'candidates': candidates,
+        }
+        self._register(pipeline, best['family'], best['accuracy'], best['family'], profile, report,
+                       'selection', options)
+
+    def _streaming(self, dataset_path, options):
+        self.stdout.write(f"Streaming {dataset_path} in chunks of {options['chunk_size']} rows...")
+        pipeline, report = train_streaming(
+            dataset_path, chunk_size=options['chunk_size'], epochs=options['epochs'],
+            n_features=options['hash_features'], random_state=options['seed'],
+        )
+        self.stdout.write(
+            f"{report['rows']} rows, {report['epochs']} epochs in {report['train_time_s']:.1f}s "
+            f"({report['rows_per_second']:.0f} rows/s), peak memory {format_bytes(report['peak_memory_bytes'])}"
+        )
+        if report['accuracy'] is None:
+            raise CommandError('The dataset is empty')
+
+        profile = profile_on_dataset(pipeline, pd.read_csv(dataset_path, nrows=PROFILE_ROWS))
+        self._register(pipeline, 'streaming', report['accuracy'], 'sgd_hashing', profile,
+                       dict(report, profile=profile), 'streaming', options)
+
+    def _register(self, pipeline, label, accuracy, family, profile, report, report_kind, options):
+        """Save ``pipeline`` as a new timestamped artifact and ResumePredictor, plus its JSON report."""
+        stamp = timezone.now().strftime('%Y%m%d%H%M%S')
+        model_path = save_model(pipeline, f'resume_predictor_{stamp}.joblib')
+        model = ResumePredictor.objects.create(
+            name=f'Resume Predictor {label} {stamp}',
+            model_file=os.path.relpath(model_path, settings.MEDIA_ROOT),
+            accuracy=accuracy,
+            family=family,
+            is_active=False,
+            **profile,
+        )
+        if not options['no_activate']:
+            activate(model)
+
+        report_path = options['report'] or f'{os.path.splitext(model_path)[0]}.{report_kind}.json'
+        report = dict(report, dataset=options['dataset'], model_id=model.pk, model_file=model.model_file.name)
+        with open(report_path, 'w', encoding='utf-8') as file:
+            json.dump(report, file, indent=2)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Registered {model.name} (id {model.pk}, holdout accuracy {accuracy:.2%}"
+            f"{'' if model.is_active else ', inactive'}); report written to {report_path}"
+        ))
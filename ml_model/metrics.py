@@ -0,0 +1,110 @@
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+
+# Histogram buckets in seconds, from sub-millisecond regex work to multi-minute LLM calls
+DEFAULT_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+    1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0,
+)
+
+
+# Buckets for LLM prompt sizes in (estimated) tokens, and for budget fractions
+TOKEN_BUCKETS = (128, 256, 512, 1024, 2048, 4096, 8192, 16384, 32768)
+RATIO_BUCKETS = (0.1, 0.25, 0.5, 0.75, 0.9, 0.95, 1.0)
+
+
+class Histogram:
+    """
+    Cumulative histogram keyed by a single label (``stage`` by default).
+
+    Values are kept per process; in a multi-process deployment each worker
+    reports its own series.
+    """
+
+    def __init__(self, name, documentation, buckets=DEFAULT_BUCKETS, label='stage'):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = tuple(buckets)
+        self.label = label
+        self._lock = threading.Lock()
+        self._series = {}
+
+    def observe(self, stage, value):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(stage)
+            if series is None:
+                series = self._series[stage] = {'counts': [0] * (len(self.buckets) + 1), 'sum': 0.0}
+            series['counts'][index] += 1
+            series['sum'] += value
+
+    def snapshot(self):
+        with self._lock:
+            return {stage: {'counts': list(s['counts']), 'sum': s['sum']} for stage, s in self._series.items()}
+
+    def clear(self):
+        with self._lock:
+            self._series.clear()
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} histogram']
+        for stage, series in sorted(self.snapshot().items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), series['counts']):
+                cumulative += count
+                le = '+Inf' if bound == float('inf') else repr(bound)
+                lines.append(f'{self.name}_bucket{{{self.label}="{stage}",le="{le}"}} {cumulative}')
+            lines.append(f'{self.name}_sum{{{self.label}="{stage}"}} {series["sum"]!r}')
+            lines.append(f'{self.name}_count{{{self.label}="{stage}"}} {cumulative}')
+        return lines
+
+
+STAGE_SECONDS = Histogram(
+    'resume_stage_duration_seconds', 'Time spent in each resume processing stage.'
+)
+LLM_PROMPT_TOKENS = Histogram(
+    'resume_llm_prompt_tokens', 'Estimated tokens in each LLM prompt after compaction.',
+    buckets=TOKEN_BUCKETS, label='kind',
+)
+LLM_BUDGET_USED = Histogram(
+    'resume_llm_context_budget_used_ratio', 'Fraction of the context window used by prompt plus num_predict.',
+    buckets=RATIO_BUCKETS, label='kind',
+)
+HISTOGRAMS = (STAGE_SECONDS, LLM_PROMPT_TOKENS, LLM_BUDGET_USED)
+
+# Callables returning {name: value} added to the metrics output as gauges
+_collectors = {}
+
+
+@contextmanager
+def stage_timer(stage):
+    """Time the enclosed block (or decorated function) as ``stage``."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        STAGE_SECONDS.observe(stage, time.perf_counter() - start)
+
+
+def register_collector(prefix, collect):
+    """
+    Export the numeric values of ``collect()`` (a dict of counters) as
+    gauges named ``<prefix>_<key>``, e.g. cache hit counters.
+    """
+    _collectors[prefix] = collect
+
+
+def render_metrics():
+    """Return all metrics in the Prometheus text exposition format."""
+    lines = []
+    for histogram in HISTOGRAMS:
+        lines.extend(histogram.render())
+    for prefix, collect in sorted(_collectors.items()):
+        for key, value in sorted(collect().items()):
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                continue
+            lines.append(f'# TYPE {prefix}_{key} gauge')
+            lines.append(f'{prefix}_{key} {value!r}')
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.1 on 2026-10-17 19:50
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ml_model', '0003_job'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StoredResume',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255)),
+                ('text', models.TextField()),
+                ('skills', models.JSONField(default=list)),
+                ('keywords', models.JSONField(default=list)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='SkillPosting',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('skill', models.CharField(max_length=100)),
+                ('resume', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='postings', to='ml_model.storedresume')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('skill', 'resume'), name='unique_skill_posting')],
+            },
+        ),
+    ]
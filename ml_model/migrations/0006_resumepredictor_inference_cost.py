@@ -0,0 +1,58 @@
+# Generated by Django 5.2.1 on 2026-10-17 20:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ml_model', '0005_parsedresume'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='resumepredictor',
+            name='artifact_size',
+            field=models.PositiveBigIntegerField(blank=True, help_text='Bytes on disk', null=True),
+        ),
+        migrations.AddField(
+            model_name='resumepredictor',
+            name='batch_latency_p50_ms',
+            field=models.FloatField(blank=True, help_text='predict_proba on a 64-row batch', null=True),
+        ),
+        migrations.AddField(
+            model_name='resumepredictor',
+            name='batch_latency_p95_ms',
+            field=models.FloatField(blank=True, help_text='predict_proba on a 64-row batch', null=True),
+        ),
+        migrations.AddField(
+            model_name='resumepredictor',
+            name='family',
+            field=models.CharField(blank=True, max_length=50),
+        ),
+        migrations.AddField(
+            model_name='resumepredictor',
+            name='latency_p50_ms',
+            field=models.FloatField(blank=True, help_text='Single-row predict_proba', null=True),
+        ),
+        migrations.AddField(
+            model_name='resumepredictor',
+            name='latency_p95_ms',
+            field=models.FloatField(blank=True, help_text='Single-row predict_proba', null=True),
+        ),
+        migrations.AddField(
+            model_name='resumepredictor',
+            name='latency_p99_ms',
+            field=models.FloatField(blank=True, help_text='Single-row predict_proba', null=True),
+        ),
+        migrations.AddField(
+            model_name='resumepredictor',
+            name='load_time',
+            field=models.FloatField(blank=True, help_text='Seconds to load the artifact', null=True),
+        ),
+        migrations.AddField(
+            model_name='resumepredictor',
+            name='memory_bytes',
+            field=models.PositiveBigIntegerField(blank=True, help_text='Bytes allocated when loaded', null=True),
+        ),
+    ]
@@ -0,0 +1,33 @@
+import uuid
+
+from django.db import migrations, models
+
+
+def gen_tokens(apps, schema_editor):
+    Job = apps.get_model('ml_model', 'Job')
+    for job in Job.objects.only('pk'):
+        job.token = uuid.uuid4()
+        job.save(update_fields=['token'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ml_model', '0006_resumepredictor_inference_cost'),
+    ]
+
+    # Existing jobs each need their own token before the unique constraint
+    # is added, so the field is added nullable, filled in, then tightened.
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='token',
+            field=models.UUIDField(editable=False, null=True),
+        ),
+        migrations.RunPython(gen_tokens, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='job',
+            name='token',
+            field=models.UUIDField(default=uuid.uuid4, editable=False, unique=True),
+        ),
+    ]
@@ -0,0 +1,168 @@
+import time
+
+import numpy as np
+from joblib import Parallel, delayed, effective_n_jobs
+from sklearn.model_selection import ParameterGrid, ParameterSampler, StratifiedKFold, train_test_split
+
+from .train_model import build_classifier, build_preprocessor, fit_pipeline, preprocess_data
+
+SEARCH_MODES = ('grid', 'random')
+TFIDF_PREFIX = 'tfidf__'
+CLASSIFIER_PREFIX = 'classifier__'
+# Set by the search itself (train_resume_model --seed / --n-jobs), not per candidate
+RESERVED_PARAMS = ('classifier__random_state', 'classifier__n_jobs')
+
+DEFAULT_PARAM_GRID = {
+    'tfidf__max_features': [500, 1000, 2000],
+    'tfidf__ngram_range': [(1, 1), (1, 2)],
+    'classifier__n_estimators': [100, 300],
+    'classifier__max_depth': [None, 20],
+    'classifier__min_samples_leaf': [1, 3],
+}
+
+
+def load_param_grid(data):
+    """
+    Validate a search space given as ``{"tfidf__<param>" | "classifier__<param>": [values]}``,
+    e.g. loaded from JSON. Lists inside the value lists become tuples (``ngram_range``).
+    """
+    if not isinstance(data, dict) or not data:
+        raise ValueError('The parameter grid must be a non-empty object')
+    grid = {}
+    for name, values in data.items():
+        if not name.startswith((TFIDF_PREFIX, CLASSIFIER_PREFIX)):
+            raise ValueError(f'Unknown parameter {name!r}: names start with {TFIDF_PREFIX!r} or {CLASSIFIER_PREFIX!r}')
+        if name in RESERVED_PARAMS:
+            raise ValueError(f'{name} cannot be searched: it is set by the --seed and --n-jobs options')
+        if not isinstance(values, list) or not values:
+            raise ValueError(f'{name} must be a non-empty list of values')
+        grid[name] = [tuple(value) if isinstance(value, list) else value for value in values]
+    return grid
+
+
+def split_params(params):
+    """Split candidate params into ``(tfidf_params, classifier_params)``."""
+    tfidf_params = {}
+    classifier_params = {}
+    for name, value in params.items():
+        if name.startswith(TFIDF_PREFIX):
+            tfidf_params[name[len(TFIDF_PREFIX):]] = value
+        else:
+            classifier_params[name[len(CLASSIFIER_PREFIX):]] = value
+    return tfidf_params, classifier_params
+
+
+def _features_key(tfidf_params):
+    return tuple(sorted((name, repr(value)) for name, value in tfidf_params.items()))
+
+
+def _fit_features(X, train_index, test_index, tfidf_params):
+    """Fit the preprocessor on one training fold; returns the transformed fold."""
+    preprocessor = build_preprocessor(tfidf_params)
+    return preprocessor.fit_transform(X.iloc[train_index]), preprocessor.transform(X.iloc[test_index])
+
+
+def _evaluate(X_train, y_train, X_test, y_test, classifier_params, random_state):
+    """Fit one candidate classifier on precomputed features; returns (score, fit_time, score_time)."""
+    classifier = build_classifier(classifier_params, random_state, n_jobs=1)
+    start = time.perf_counter()
+    classifier.fit(X_train, y_train)
+    fit_time = time.perf_counter() - start
+    start = time.perf_counter()
+    score = classifier.score(X_test, y_test)
+    return score, fit_time, time.perf_counter() - start
+
+
+def _jsonable(params):
+    return {name: list(value) if isinstance(value, tuple) else value for name, value in params.items()}
+
+
+def search_model(df, param_grid=None, mode='grid', n_iter=20, cv=5, n_jobs=-1, random_state=42, verbose=0):
+    """
+    Cross-validated hyperparameter search for the resume predictor.
+
+    Holds out 20% of ``df`` as in ``fit_model``, then scores every candidate
+    from ``param_grid`` (all of them, or ``n_iter`` sampled ones in
+    ``random`` mode) with stratified ``cv``-fold cross-validation on the
+    rest. TF-IDF features are fitted once per distinct TF-IDF setting and
+    fold and shared by every candidate using them; the fits run in parallel
+    on ``n_jobs`` joblib workers, each classifier single-threaded.
+
+    The best candidate (highest mean accuracy, then fastest to fit) is
+    refitted on the whole training split. Returns ``(pipeline, report)``.
+    """
+    if mode not in SEARCH_MODES:
+        raise ValueError(f'Unknown search mode {mode!r}')
+    start = time.perf_counter()
+    param_grid = param_grid or DEFAULT_PARAM_GRID
+    if mode == 'grid':
+        candidates = list(ParameterGrid(param_grid))
+    else:
+        candidates = list(ParameterSampler(param_grid, n_iter=n_iter, random_state=random_state))
+    candidates = [split_params(params) for params in candidates]
+
+    X, y = preprocess_data(df)
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=random_state)
+    folds = list(StratifiedKFold(n_splits=cv, shuffle=True, random_state=random_state).split(X_train, y_train))
+
+    feature_params = {}
+    for tfidf_params, _ in candidates:
+        feature_params.setdefault(_features_key(tfidf_params), tfidf_params)
+    feature_jobs = [(key, fold) for key in feature_params for fold in range(len(folds))]
+    fit_jobs = [(index, fold) for index in range(len(candidates)) for fold in range(len(folds))]
+
+    with Parallel(n_jobs=n_jobs, verbose=verbose) as parallel:
+        features = dict(zip(feature_jobs, parallel(
+            delayed(_fit_features)(X_train, *folds[fold], feature_params[key]) for key, fold in feature_jobs
+        )))
+
+        def evaluate(index, fold):
+            X_fold_train, X_fold_test = features[(_features_key(candidates[index][0]), fold)]
+            train_index, test_index = folds[fold]
+            return delayed(_evaluate)(
+                X_fold_train, y_train.iloc[train_index], X_fold_test, y_train.iloc[test_index],
+                candidates[index][1], random_state,
+            )
+
+        outcomes = parallel(evaluate(index, fold) for index, fold in fit_jobs)
+    search_time = time.perf_counter() - start
+
+    results = []
+    for index, (tfidf_params, classifier_params) in enumerate(candidates):
+        scores, fit_times, score_times = zip(*outcomes[index * len(folds):(index + 1) * len(folds)])
+        results.append((index, {
+            'params': _jsonable({
+                **{TFIDF_PREFIX + name: value for name, value in tfidf_params.items()},
+                **{CLASSIFIER_PREFIX + name: value for name, value in classifier_params.items()},
+            }),
+            'mean_score': float(np.mean(scores)),
+            'std_score': float(np.std(scores)),
+            'fold_scores': [float(score) for score in scores],
+            'mean_fit_time': float(np.mean(fit_times)),
+            'mean_score_time': float(np.mean(score_times)),
+        }))
+    results.sort(key=lambda item: (-item[1]['mean_score'], item[1]['mean_fit_time']))
+    best_tfidf, best_classifier = candidates[results[0][0]]
+    results = [dict(result, rank=rank) for rank, (_, result) in enumerate(results, start=1)]
+
+    refit_start = time.perf_counter()
+    pipeline = fit_pipeline(X_train, y_train, best_tfidf, best_classifier, random_state, n_jobs=n_jobs)
+    refit_time = time.perf_counter() - refit_start
+    accuracy = pipeline.score(X_test, y_test)
+
+    report = {
+        'mode': mode,
+        'cv': cv,
+        'n_jobs': effective_n_jobs(n_jobs),
+        'rows': len(X),
+        'candidates': len(candidates),
+        'feature_fits': len(feature_jobs),
+        'classifier_fits': len(fit_jobs),
+        'search_time_s': round(search_time, 3),
+        'refit_time_s': round(refit_time, 3),
+        'best_params': results[0]['params'],
+        'best_cv_score': results[0]['mean_score'],
+        'holdout_accuracy': accuracy,
+        'results': results,
+    }
+    return pipeline, report
@@ -0,0 +1,175 @@
+import gc
+import math
+import os
+import tempfile
+import time
+import tracemalloc
+
+import joblib
+import pandas as pd
+from django.conf import settings
+from sklearn.ensemble import HistGradientBoostingClassifier, RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.model_selection import train_test_split
+
+from .train_model import artifact_compression, fit_classifier_pipeline, preprocess_data
+
+DEFAULT_MAX_LATENCY_MS = 50.0
+DEFAULT_MAX_MEMORY_MB = 200.0
+BATCH_SIZE = 64
+# profile_model() keys, which are also ResumePredictor fields
+PROFILE_FIELDS = (
+    'artifact_size', 'memory_bytes', 'load_time', 'latency_p50_ms', 'latency_p95_ms',
+    'latency_p99_ms', 'batch_latency_p50_ms', 'batch_latency_p95_ms',
+)
+
+
+def _random_forest(random_state):
+    return RandomForestClassifier(n_estimators=100, random_state=random_state, n_jobs=-1), {}, False
+
+
+def _small_forest(random_state):
+    classifier = RandomForestClassifier(
+        n_estimators=30, max_depth=12, min_samples_leaf=2, random_state=random_state, n_jobs=-1
+    )
+    return classifier, {}, False
+
+
+def _logistic_regression(random_state):
+    return LogisticRegression(max_iter=1000, random_state=random_state), {}, False
+
+
+def _hist_gradient_boosting(random_state):
+    # Needs dense input, so keep the TF-IDF vocabulary small
+    classifier = HistGradientBoostingClassifier(max_iter=100, random_state=random_state)
+    return classifier, {'max_features': 300}, True
+
+
+# Family name -> factory returning (classifier, tfidf params, dense features)
+MODEL_FAMILIES = {
+    'random_forest': _random_forest,
+    'small_forest': _small_forest,
+    'logistic_regression': _logistic_regression,
+    'hist_gradient_boosting': _hist_gradient_boosting,
+}
+
+
+def latency_budget_ms():
+    return getattr(settings, 'ML_MODEL_MAX_LATENCY_MS', DEFAULT_MAX_LATENCY_MS)
+
+
+def memory_budget_mb():
+    return getattr(settings, 'ML_MODEL_MAX_MEMORY_MB', DEFAULT_MAX_MEMORY_MB)
+
+
+def fit_family(family, X, y, random_state=42):
+    classifier, tfidf_params, dense = MODEL_FAMILIES[family](random_state)
+    return fit_classifier_pipeline(X, y, classifier, tfidf_params, dense)
+
+
+def _percentile_ms(timings, fraction):
+    ordered = sorted(timings)
+    return round(ordered[min(len(ordered) - 1, max(0, math.ceil(fraction * len(ordered)) - 1))] * 1000, 3)
+
+
+def _timed(fn, arg, runs):
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn(arg)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def profile_model(pipeline, X, single_runs=200, batch_runs=30, loads=3):
+    """
+    Measure what serving ``pipeline`` costs, from a compressed artifact as
+    ``save_model`` writes it. ``X`` supplies feature rows to predict on.
+
+    Returns a dict keyed by the ResumePredictor cost fields: artifact size,
+    memory allocated by loading it (tracemalloc), median load time, and
+    single-row and ``BATCH_SIZE``-row ``predict_proba`` latency percentiles.
+    """
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, 'model.joblib')
+        joblib.dump(pipeline, path, compress=artifact_compression())
+        artifact_size = os.path.getsize(path)
+        load_times = _timed(joblib.load, path, loads)
+
+        gc.collect()
+        tracing = tracemalloc.is_tracing()
+        if not tracing:
+            tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        model = joblib.load(path)
+        memory_bytes = max(0, tracemalloc.get_traced_memory()[0] - before)
+        if not tracing:
+            tracemalloc.stop()
+
+    rows = [X.iloc[[index % len(X)]] for index in range(single_runs)]
+    batch = pd.concat([X] * math.ceil(BATCH_SIZE / len(X))).iloc[:BATCH_SIZE]
+    model.predict_proba(rows[0])  # Warm-up
+    single = []
+    for row in rows:
+        start = time.perf_counter()
+        model.predict_proba(row)
+        single.append(time.perf_counter() - start)
+    batched = _timed(model.predict_proba, batch, batch_runs)
+
+    return {
+        'artifact_size': artifact_size,
+        'memory_bytes': memory_bytes,
+        'load_time': round(sorted(load_times)[len(load_times) // 2], 4),
+        'latency_p50_ms': _percentile_ms(single, 0.5),
+        'latency_p95_ms': _percentile_ms(single, 0.95),
+        'latency_p99_ms': _percentile_ms(single, 0.99),
+        'batch_latency_p50_ms': _percentile_ms(batched, 0.5),
+        'batch_latency_p95_ms': _percentile_ms(batched, 0.95),
+    }
+
+
+def within_budget(profile, max_latency_ms, max_memory_mb):
+    return (profile['latency_p95_ms'] <= max_latency_ms
+            and profile['memory_bytes'] <= max_memory_mb * 1024 * 1024)
+
+
+def select_model(df, families=None, max_latency_ms=None, max_memory_mb=None, random_state=42):
+    """
+    Train each model family on the same 80/20 split as ``fit_model``, profile
+    it, and pick the most accurate one whose single-row p95 latency and
+    loaded size fit the budgets (ties go to the faster model).
+
+    Returns ``(pipeline, candidates)``; ``pipeline`` is None if no family
+    fits. Each candidate is a dict with family, accuracy, fit time, the
+    ``profile_model`` fields, ``within_budget`` and ``selected``.
+    """
+    families = families or list(MODEL_FAMILIES)
+    max_latency_ms = latency_budget_ms() if max_latency_ms is None else max_latency_ms
+    max_memory_mb = memory_budget_mb() if max_memory_mb is None else max_memory_mb
+
+    X, y = preprocess_data(df)
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=random_state)
+
+    candidates = []
+    pipelines = {}
+    for family in families:
+        start = time.perf_counter()
+        pipeline = fit_family(family, X_train, y_train, random_state)
+        fit_time = time.perf_counter() - start
+        profile = profile_model(pipeline, X_test)
+        pipelines[family] = pipeline
+        candidates.append({
+            'family': family,
+            'accuracy': pipeline.score(X_test, y_test),
+            'fit_time': round(fit_time, 3),
+            **profile,
+            'within_budget': within_budget(profile, max_latency_ms, max_memory_mb),
+            'selected': False,
+        })
+
+    eligible = [candidate for candidate in candidates if candidate['within_budget']]
+    if not eligible:
+        return None, candidates
+    best = min(eligible, key=lambda candidate: (-candidate['accuracy'], candidate['latency_p95_ms']))
+    best['selected'] = True
+    return pipelines[best['family']], candidates
@@ -1,6 +1,6 @@
 from django.db import models
-import joblib
 import os
+import uuid
 from django.conf import settings
 
 # Create your models here.
@@ -10,17 +10,121 @@ class ResumePredictor(models.Model):
     model_file = models.FileField(upload_to='ml_models/')
     created_at = models.DateTimeField(auto_now_add=True)
     accuracy = models.FloatField(null=True, blank=True)
+    # Inference cost, measured when the model is trained (see ml_model.model_selection)
+    family = models.CharField(max_length=50, blank=True)
+    artifact_size = models.PositiveBigIntegerField(null=True, blank=True, help_text='Bytes on disk')
+    memory_bytes = models.PositiveBigIntegerField(null=True, blank=True, help_text='Bytes allocated when loaded')
+    load_time = models.FloatField(null=True, blank=True, help_text='Seconds to load the artifact')
+    latency_p50_ms = models.FloatField(null=True, blank=True, help_text='Single-row predict_proba')
+    latency_p95_ms = models.FloatField(null=True, blank=True, help_text='Single-row predict_proba')
+    latency_p99_ms = models.FloatField(null=True, blank=True, help_text='Single-row predict_proba')
+    batch_latency_p50_ms = models.FloatField(null=True, blank=True, help_text='predict_proba on a 64-row batch')
+    batch_latency_p95_ms = models.FloatField(null=True, blank=True, help_text='predict_proba on a 64-row batch')
     is_active = models.BooleanField(default=True)
 
     def __str__(self):
         return f"{self.name} ({self.created_at.strftime('%Y-%m-%d')})"
 
+    @property
+    def model_path(self):
+        """Absolute path of the model artifact, or None if no file is set."""
+        if not self.model_file:
+            return None
+        return os.path.join(settings.MEDIA_ROOT, self.model_file.name)
+
     def get_model(self):
         """Load the trained model from the file."""
         if not self.model_file:
             return None
-        model_path = os.path.join(settings.MEDIA_ROOT, self.model_file.name)
-        return joblib.load(model_path)
+        import joblib
+        return joblib.load(self.model_path)
 
     class Meta:
         ordering = ['-created_at']
+
+
+class CachedLLMResponse(models.Model):
+    """Persistent tier of the LLM response cache (see ml_model.llm_cache)."""
+    key = models.CharField(max_length=64, unique=True)
+    kind = models.CharField(max_length=50)
+    model_name = models.CharField(max_length=100)
+    response = models.TextField()
+    size = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_accessed = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    def __str__(self):
+        return f"{self.kind} {self.key[:12]} ({self.model_name})"
+
+
+class ParsedResume(models.Model):
+    """Persistent tier of the parsed resume cache (see analyser.parse_cache)."""
+    key = models.CharField(max_length=64, unique=True)
+    text = models.TextField()
+    skills = models.JSONField(default=list)
+    skills_version = models.CharField(max_length=16)
+    size = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_accessed = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    def __str__(self):
+        return f"{self.key[:12]} ({len(self.skills)} skills)"
+
+
+class Job(models.Model):
+    """A unit of background work processed by the ``run_job_worker`` command."""
+    STATUS_PENDING = 'pending'
+    STATUS_RUNNING = 'running'
+    STATUS_SUCCEEDED = 'succeeded'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_RUNNING, 'Running'),
+        (STATUS_SUCCEEDED, 'Succeeded'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+
+    # Unguessable id for the job's URLs; the result holds the user's resume
+    token = models.UUIDField(default=uuid.uuid4, unique=True, editable=False)
+    kind = models.CharField(max_length=50)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    payload = models.JSONField(default=dict)
+    result = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.kind} #{self.pk} ({self.status})"
+
+    @property
+    def is_finished(self):
+        return self.status in (self.STATUS_SUCCEEDED, self.STATUS_FAILED)
+
+    class Meta:
+        ordering = ['created_at']
+        indexes = [models.Index(fields=['status', 'created_at'])]
+
+
+class StoredResume(models.Model):
+    """A parsed resume kept for later candidate search."""
+    name = models.CharField(max_length=255)
+    text = models.TextField()
+    skills = models.JSONField(default=list)
+    keywords = models.JSONField(default=list)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.name} ({self.created_at.strftime('%Y-%m-%d')})"
+
+
+class SkillPosting(models.Model):
+    """Inverted index entry: ``resume`` mentions the canonical skill ``skill``."""
+    skill = models.CharField(max_length=100)
+    resume = models.ForeignKey(StoredResume, on_delete=models.CASCADE, related_name='postings')
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['skill', 'resume'], name='unique_skill_posting'),
+        ]
@@ -0,0 +1,163 @@
+import json
+import threading
+import time
+
+from django.conf import settings
+
+from .metrics import STAGE_SECONDS, stage_timer
+
+DEFAULT_BASE_URL = 'http://10.1.1.126:11434'
+DEFAULT_MODEL = 'llama3.1'
+DEFAULT_CONNECT_TIMEOUT = 5
+DEFAULT_READ_TIMEOUT = 300
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_RETRY_BACKOFF = 0.5
+DEFAULT_POOL_SIZE = 10
+
+
+class OllamaError(Exception):
+    """Raised when the Ollama API cannot be reached or returns an error."""
+
+
+class OllamaClient:
+    """
+    Thin client for Ollama's ``/api/generate`` endpoint.
+
+    Uses one pooled keep-alive session with connect/read timeouts. Only
+    connection failures are retried (with backoff), since a generation that
+    reached the server must not be submitted twice.
+
+    ``requests`` is imported by the methods, so importing this module (for
+    OllamaError) does not load the HTTP stack.
+    """
+
+    def __init__(self, base_url=DEFAULT_BASE_URL, model=DEFAULT_MODEL,
+                 connect_timeout=DEFAULT_CONNECT_TIMEOUT, read_timeout=DEFAULT_READ_TIMEOUT,
+                 max_retries=DEFAULT_MAX_RETRIES, retry_backoff=DEFAULT_RETRY_BACKOFF,
+                 pool_size=DEFAULT_POOL_SIZE):
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        self.base_url = base_url.rstrip('/')
+        self.model = model
+        self.timeout = (connect_timeout, read_timeout)
+
+        retry = Retry(
+            total=max_retries,
+            connect=max_retries,
+            read=0,
+            status=0,
+            other=0,
+            backoff_factor=retry_backoff,
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    @property
+    def generate_url(self):
+        return f'{self.base_url}/api/generate'
+
+    def _post(self, payload, stream=False):
+        import requests
+
+        try:
+            response = self.session.post(self.generate_url, json=payload, timeout=self.timeout, stream=stream)
+        except requests.RequestException as e:
+            raise OllamaError(f"Could not reach Ollama at {self.base_url}: {str(e)}") from e
+        if response.status_code != 200:
+            text = response.text
+            response.close()
+            raise OllamaError(f"Error from Ollama API: {text}")
+        return response
+
+    @staticmethod
+    def _payload(model, prompt, options, stream, format):
+        payload = {
+            'model': model,
+            'prompt': prompt,
+            'stream': stream,
+            'options': options
+        }
+        if format is not None:
+            payload['format'] = format
+        return payload
+
+    def generate(self, prompt, options, format=None):
+        """
+        Run a generation and return the full response text.
+
+        ``format`` is passed through to Ollama: ``'json'`` or a JSON schema
+        constrains the output to valid JSON.
+        """
+        with stage_timer('llm_request'):
+            response = self._post(self._payload(self.model, prompt, options, False, format))
+            try:
+                return response.json()['response']
+            except (ValueError, KeyError) as e:
+                raise OllamaError(f"Unexpected response from Ollama API: {str(e)}") from e
+
+    def generate_stream(self, prompt, options, format=None):
+        """Run a streaming generation, yielding response text as it arrives."""
+        import requests
+
+        start = time.perf_counter()
+        first_token = True
+        response = self._post(self._payload(self.model, prompt, options, True, format), stream=True)
+
+        with response:
+            try:
+                for raw_line in response.iter_lines():
+                    if not raw_line:
+                        continue
+                    chunk = json.loads(raw_line)
+                    if chunk.get('error'):
+                        raise OllamaError(f"Error from Ollama API: {chunk['error']}")
+                    if first_token:
+                        STAGE_SECONDS.observe('llm_first_token', time.perf_counter() - start)
+                        first_token = False
+                    yield chunk.get('response', '')
+                    if chunk.get('done'):
+                        STAGE_SECONDS.observe('llm_request', time.perf_counter() - start)
+                        break
+            except requests.RequestException as e:
+                raise OllamaError(f"Lost connection to Ollama at {self.base_url}: {str(e)}") from e
+
+    def ping(self, timeout=2.0):
+        """
+        Check that the server answers ``/api/tags``; raises OllamaError if not.
+
+        Bypasses the session's connection retries so a health check fails fast.
+        """
+        import requests
+
+        try:
+            response = requests.get(f'{self.base_url}/api/tags', timeout=timeout)
+        except requests.RequestException as e:
+            raise OllamaError(f"Could not reach Ollama at {self.base_url}: {str(e)}") from e
+        if response.status_code != 200:
+            raise OllamaError(f"Error from Ollama API: HTTP {response.status_code}")
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_ollama_client():
+    """Return the process-wide OllamaClient configured from settings."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = OllamaClient(
+                    base_url=getattr(settings, 'OLLAMA_BASE_URL', DEFAULT_BASE_URL),
+                    model=getattr(settings, 'OLLAMA_MODEL', DEFAULT_MODEL),
+                    connect_timeout=getattr(settings, 'OLLAMA_CONNECT_TIMEOUT', DEFAULT_CONNECT_TIMEOUT),
+                    read_timeout=getattr(settings, 'OLLAMA_READ_TIMEOUT', DEFAULT_READ_TIMEOUT),
+                    max_retries=getattr(settings, 'OLLAMA_MAX_RETRIES', DEFAULT_MAX_RETRIES),
+                    retry_backoff=getattr(settings, 'OLLAMA_RETRY_BACKOFF', DEFAULT_RETRY_BACKOFF),
+                    pool_size=getattr(settings, 'OLLAMA_POOL_SIZE', DEFAULT_POOL_SIZE),
+                )
+    return _client
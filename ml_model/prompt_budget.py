@@ -0,0 +1,213 @@
+import math
+import re
+import threading
+import unicodedata
+from collections import Counter, namedtuple
+
+from django.conf import settings
+
+from .metrics import LLM_BUDGET_USED, LLM_PROMPT_TOKENS
+from .utils import get_skill_matcher
+
+DEFAULT_CONTEXT_TOKENS = 8192
+
+# Output allowance per prompt kind: (fixed tokens, tokens per resume token).
+# Improved resumes echo a rewritten resume, so their output grows with the input.
+OUTPUT_BUDGETS = {
+    'section_evaluation': (1536, 0.0),
+    'improved_resume': (1536, 1.3),
+}
+
+# Share of the input budget the job description keeps when both inputs must be trimmed
+JOB_DESCRIPTION_SHARE = 0.35
+
+# Rough offline stand-in for a BPE tokenizer: short letter runs, digit groups and
+# single symbols. It errs high for English prose, which keeps budgets safe.
+TOKEN_RE = re.compile(r'[^\W\d_]{1,6}|\d{1,3}|[^\w\s]')
+SPACE_RE = re.compile(r'[^\S\n]+')
+CONTROL_RE = re.compile(r'[\x00-\x08\x0b-\x1f\x7f\u200b-\u200f\ufeff]')
+# "Page 2", "Page 2 of 3", "2 of 3", "- 2 -"; not bare numbers or dates, which are resume content
+PAGE_MARKER_RE = re.compile(
+    r'^(?:-\s*)?(?:page\s*\d+(?:\s*(?:of|/)\s*\d+)?|\d+\s+of\s+\d+)(?:\s*-)?$|^-\s*\d+\s*-$', re.IGNORECASE
+)
+DECORATION_RE = re.compile(r'^[\W_]+$')
+BOILERPLATE_RE = re.compile(
+    r'equal (?:employment )?opportunity|\beeo\b|reasonable accommodation|without regard to'
+    r'|background check|drug[- ]free|privacy (?:policy|notice)|all rights reserved|\bconfidential\b'
+    r'|benefits? (?:include|package)|401\s*\(?k\)?|paid time off|\bpto\b|apply (?:now|today)',
+    re.IGNORECASE,
+)
+# Running headers and footers sit within this many lines of a page marker or either end of the text
+PAGE_BOUNDARY_LINES = 2
+# A line seen this often at page boundaries is a running page header or footer
+REPEATED_LINE_COUNT = 2
+
+_lock = threading.Lock()
+_stats = {
+    'prompts': 0,
+    'trimmed_prompts': 0,
+    'tokens_removed': 0,
+}
+
+BudgetedPrompt = namedtuple('BudgetedPrompt', 'prompt resume_text job_description num_predict prompt_tokens')
+
+
+def context_tokens():
+    return getattr(settings, 'LLM_CONTEXT_TOKENS', DEFAULT_CONTEXT_TOKENS)
+
+
+def estimate_tokens(text):
+    """Approximate the number of LLM tokens in ``text``."""
+    return len(TOKEN_RE.findall(text or ''))
+
+
+def _page_boundaries(lines):
+    """
+    Indexes of the lines within PAGE_BOUNDARY_LINES non-empty lines of a page
+    marker or of either end of ``lines``, where running headers and footers are.
+    """
+    content = [index for index, line in enumerate(lines) if line]
+    markers = [position for position, index in enumerate(content) if PAGE_MARKER_RE.match(lines[index])]
+    boundaries = set()
+    for anchor in [-1, *markers, len(content)]:
+        for position in range(anchor - PAGE_BOUNDARY_LINES, anchor + PAGE_BOUNDARY_LINES + 1):
+            if 0 <= position < len(content) and position != anchor:
+                boundaries.add(content[position])
+    return boundaries
+
+
+def normalise_text(text):
+    """
+    Clean extracted text before it goes into a prompt: unicode and whitespace
+    normalisation, page markers and decoration lines removed, consecutive
+    duplicate lines and running headers/footers kept once.
+
+    Only lines repeated at page boundaries count as headers or footers, so
+    headings repeated in the body ("Responsibilities:" per job) are kept.
+    """
+    text = CONTROL_RE.sub('', unicodedata.normalize('NFKC', text or ''))
+    lines = [SPACE_RE.sub(' ', line).strip() for line in text.split('\n')]
+    lines = [line for line in lines if not DECORATION_RE.match(line)]
+    boundaries = _page_boundaries(lines)
+    counts = Counter(lines[index].lower() for index in boundaries)
+
+    kept = []
+    seen = set()
+    for index, line in enumerate(lines):
+        key = line.lower()
+        if not line:
+            if kept and kept[-1]:
+                kept.append('')
+            continue
+        if PAGE_MARKER_RE.match(line) or (kept and kept[-1].lower() == key):
+            continue
+        if index in boundaries and counts[key] >= REPEATED_LINE_COUNT:
+            if key in seen:
+                continue
+            seen.add(key)
+        kept.append(line)
+    return '\n'.join(kept).strip()
+
+
+def _line_priority(line, wanted_skills, matcher):
+    """0 = boilerplate, 1 = other prose, 2 = mentions a skill, 3 = heading or wanted skill."""
+    if BOILERPLATE_RE.search(line):
+        return 0
+    skills = matcher.find(line)
+    if wanted_skills.intersection(skills):
+        return 3
+    words = line.split()
+    if len(words) <= 4 and not line.endswith(('.', ',', ';')):
+        return 3
+    return 2 if skills else 1
+
+
+def trim_to_budget(text, budget, wanted_skills=()):
+    """
+    Drop the lowest-priority lines of ``text`` (latest first) until it fits in
+    ``budget`` tokens; lines mentioning ``wanted_skills`` and section headings
+    go last. Returns ``(text, tokens_removed)``.
+    """
+    lines = text.split('\n')
+    tokens = [estimate_tokens(line) for line in lines]
+    total = sum(tokens)
+    if total <= budget:
+        return text, 0
+
+    matcher = get_skill_matcher()
+    wanted_skills = set(wanted_skills)
+    priorities = [_line_priority(line, wanted_skills, matcher) if line else 1 for line in lines]
+    keep = [True] * len(lines)
+    remaining = total
+    for index in sorted(range(len(lines)), key=lambda i: (priorities[i], -i)):
+        if remaining <= budget:
+            break
+        keep[index] = False
+        remaining -= tokens[index]
+
+    trimmed = '\n'.join(line for line, kept in zip(lines, keep) if kept)
+    if remaining > budget:
+        # Only possible when one line is longer than the budget itself
+        matches = list(TOKEN_RE.finditer(trimmed))
+        trimmed = trimmed[:matches[budget - 1].end()] if budget > 0 else ''
+        remaining = estimate_tokens(trimmed)
+    trimmed = re.sub(r'\n{3,}', '\n\n', trimmed).strip()
+    return trimmed, total - remaining
+
+
+def num_predict_for(kind, resume_tokens):
+    fixed, per_resume_token = OUTPUT_BUDGETS[kind]
+    return fixed + math.ceil(per_resume_token * resume_tokens)
+
+
+def build_prompt(kind, build, resume_text, job_description):
+    """
+    Build the ``kind`` prompt with ``build(resume_text, job_description)``
+    from compacted inputs that, together with the output allowance, fit in
+    LLM_CONTEXT_TOKENS.
+
+    Inputs are normalised first. If they still don't fit, the job
+    description is held to its share of the budget and both are trimmed by
+    line priority (see ``trim_to_budget``). ``num_predict`` is sized to the
+    prompt kind and the resume that is actually sent.
+    """
+    resume_text = normalise_text(resume_text)
+    job_description = normalise_text(job_description)
+    fixed, per_resume_token = OUTPUT_BUDGETS[kind]
+    resume_cost = 1 + per_resume_token
+    available = max(0, context_tokens() - estimate_tokens(build('', '')) - fixed)
+
+    resume_tokens = estimate_tokens(resume_text)
+    job_tokens = estimate_tokens(job_description)
+    removed = 0
+    if resume_tokens * resume_cost + job_tokens > available:
+        job_budget = min(job_tokens, max(int(available * JOB_DESCRIPTION_SHARE),
+                                         available - math.ceil(resume_tokens * resume_cost)))
+        wanted_skills = get_skill_matcher().find(job_description)
+        resume_text, resume_removed = trim_to_budget(
+            resume_text, int((available - job_budget) / resume_cost), wanted_skills
+        )
+        resume_tokens -= resume_removed
+        # Hand whatever the resume didn't need back to the job description
+        job_description, job_removed = trim_to_budget(
+            job_description, available - math.ceil(resume_tokens * resume_cost)
+        )
+        removed = resume_removed + job_removed
+
+    prompt = build(resume_text, job_description)
+    prompt_tokens = estimate_tokens(prompt)
+    num_predict = num_predict_for(kind, resume_tokens)
+    LLM_PROMPT_TOKENS.observe(kind, prompt_tokens)
+    LLM_BUDGET_USED.observe(kind, (prompt_tokens + num_predict) / context_tokens())
+    with _lock:
+        _stats['prompts'] += 1
+        if removed:
+            _stats['trimmed_prompts'] += 1
+            _stats['tokens_removed'] += removed
+    return BudgetedPrompt(prompt, resume_text, job_description, num_predict, prompt_tokens)
+
+
+def budget_stats():
+    """Return a snapshot of the prompt budget counters."""
+    with _lock:
+        return dict(_stats)
@@ -0,0 +1,115 @@
+import os
+import threading
+import time
+
+from django.conf import settings
+from django.db import transaction
+
+from .metrics import STAGE_SECONDS
+from .models import ResumePredictor
+
+# How long (in seconds) the active model lookup is trusted before the
+# database is consulted again. Saves in this process invalidate immediately
+# via signals; the interval only bounds how stale other processes can be.
+DEFAULT_CHECK_INTERVAL = 5.0
+
+_lock = threading.Lock()
+_state = {
+    'key': None,
+    'record': None,
+    'model': None,
+    'checked_at': 0.0,
+}
+_stats = {
+    'hits': 0,
+    'misses': 0,
+    'loads': 0,
+    'invalidations': 0,
+    'load_time_total': 0.0,
+    'last_load_time': None,
+}
+
+
+def _check_interval():
+    return getattr(settings, 'ML_MODEL_REGISTRY_CHECK_INTERVAL', DEFAULT_CHECK_INTERVAL)
+
+
+def _artifact_key(record):
+    """Build the cache key for a model record: id plus artifact mtime and size."""
+    path = record.model_path
+    try:
+        stat = os.stat(path)
+    except (OSError, TypeError):
+        return (record.pk, None, None)
+    return (record.pk, stat.st_mtime_ns, stat.st_size)
+
+
+def get_active_model():
+    """
+    Return ``(model_record, model)`` for the active ResumePredictor.
+
+    The deserialised pipeline is kept for the lifetime of the process and only
+    reloaded when the active record changes or its artifact is rewritten.
+    Returns ``(None, None)`` if no model is active.
+    """
+    now = time.monotonic()
+    with _lock:
+        record = _state['record']
+        if record is None or now - _state['checked_at'] >= _check_interval():
+            record = ResumePredictor.objects.filter(is_active=True).first()
+            _state['record'] = record
+            _state['checked_at'] = now
+
+        if record is None:
+            return None, None
+
+        key = _artifact_key(record)
+        if key == _state['key'] and _state['model'] is not None:
+            _stats['hits'] += 1
+            return record, _state['model']
+
+        _stats['misses'] += 1
+        start = time.perf_counter()
+        model = record.get_model()
+        elapsed = time.perf_counter() - start
+        STAGE_SECONDS.observe('model_load', elapsed)
+
+        _stats['loads'] += 1
+        _stats['load_time_total'] += elapsed
+        _stats['last_load_time'] = elapsed
+
+        _state['key'] = key if model is not None else None
+        _state['model'] = model
+        return record, model
+
+
+def activate(record):
+    """Make ``record`` the one active ResumePredictor, deactivating every other model."""
+    with transaction.atomic():
+        ResumePredictor.objects.exclude(pk=record.pk).filter(is_active=True).update(is_active=False)
+        ResumePredictor.objects.filter(pk=record.pk).update(is_active=True)
+    record.is_active = True
+    # Queryset updates send no post_save, so drop the cached model here
+    invalidate()
+
+
+def invalidate():
+    """Drop the cached record and model so the next lookup hits the database."""
+    with _lock:
+        _state['key'] = None
+        _state['record'] = None
+        _state['model'] = None
+        _state['checked_at'] = 0.0
+        _stats['invalidations'] += 1
+
+
+def registry_stats():
+    """Return a snapshot of the registry counters."""
+    with _lock:
+        stats = dict(_stats)
+        stats['model_id'] = _state['key'][0] if _state['key'] else None
+        # Inference cost of the active model, as measured at training time
+        record = _state['record']
+        for field in ('artifact_size', 'memory_bytes', 'latency_p95_ms', 'batch_latency_p95_ms'):
+            stats[f'active_{field}'] = getattr(record, field, None)
+        return stats
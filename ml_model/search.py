@@ -0,0 +1,236 @@
+import functools
+import re
+import threading
+
+from django.conf import settings
+from django.db import transaction
+
+from .models import SkillPosting, StoredResume
+from .utils import get_skill_matcher
+
+QUERY_TOKEN_RE = re.compile(r'\(|\)|[^\s()]+')
+OPERATORS = {'AND', 'OR', 'NOT'}
+
+# Ids below the highest indexed one that sync() re-checks for late commits
+DEFAULT_SYNC_LOOKBACK = 1000
+
+
+class QueryError(ValueError):
+    """Raised for malformed boolean skill queries."""
+
+
+class SkillIndex:
+    """
+    In-memory inverted index from canonical skill id to resume ids.
+
+    Posting lists are sorted numpy arrays, so AND/OR/NOT are vectorised
+    set operations; numpy is imported on first use, not at startup. The index is filled from the SkillPosting table and kept
+    current incrementally: inserts made by this process are added directly,
+    and ``sync`` pulls rows not indexed yet, which picks up resumes stored
+    by other workers.
+
+    Concurrent transactions can commit ids out of order, so the index
+    remembers every id it holds rather than a high-water mark, and posting
+    lists are merged in sorted order.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._postings = {}
+        self._pending = {}
+        self._all_ids = None
+        self._pending_ids = []
+        self._deleted = set()
+        self._ids = set()
+        self.last_id = 0
+
+    def _add(self, resume_id, skills):
+        self._ids.add(resume_id)
+        self._pending_ids.append(resume_id)
+        for skill in skills:
+            self._pending.setdefault(skill, []).append(resume_id)
+        self.last_id = max(self.last_id, resume_id)
+
+    def _consolidate(self):
+        if self._all_ids is None:
+            self._all_ids = _empty()
+        if self._pending_ids:
+            self._all_ids = _merge(self._all_ids, self._pending_ids)
+            self._pending_ids = []
+        for skill, ids in self._pending.items():
+            self._postings[skill] = _merge(self._postings.get(skill, _empty()), ids)
+        self._pending = {}
+
+    def add(self, resume_id, skills):
+        """Index a newly stored resume, unless ``sync`` already loaded it."""
+        with self._lock:
+            if resume_id not in self._ids:
+                self._add(resume_id, skills)
+
+    def discard(self, resume_ids):
+        """Exclude deleted resumes from future results."""
+        with self._lock:
+            self._deleted.update(int(resume_id) for resume_id in resume_ids)
+
+    def sync(self):
+        """
+        Load resumes stored by any process that are not indexed yet.
+
+        Besides ids above the highest one indexed, the last
+        ``SEARCH_SYNC_LOOKBACK`` ids below it are re-checked, for
+        transactions that committed after a higher id was loaded.
+        """
+        lookback = getattr(settings, 'SEARCH_SYNC_LOOKBACK', DEFAULT_SYNC_LOOKBACK)
+        with self._lock:
+            recent_ids = StoredResume.objects.filter(
+                pk__gt=max(0, self.last_id - lookback)
+            ).order_by('pk').values_list('pk', flat=True)
+            new_ids = [resume_id for resume_id in recent_ids if resume_id not in self._ids]
+            if not new_ids:
+                return
+            skills_by_resume = {resume_id: [] for resume_id in new_ids}
+            postings = SkillPosting.objects.filter(resume_id__in=new_ids).values_list('resume_id', 'skill')
+            for resume_id, skill in postings.iterator():
+                skills_by_resume[resume_id].append(skill)
+            for resume_id in new_ids:
+                self._add(resume_id, skills_by_resume[resume_id])
+
+    def _evaluate(self, node):
+        import numpy as np
+
+        kind = node[0]
+        if kind == 'skill':
+            return self._postings.get(node[1], _empty())
+        if kind == 'not':
+            return np.setdiff1d(self._all_ids, self._evaluate(node[1]), assume_unique=True)
+        left, right = self._evaluate(node[1]), self._evaluate(node[2])
+        if kind == 'and':
+            return np.intersect1d(left, right, assume_unique=True)
+        return np.union1d(left, right)
+
+    def search(self, query):
+        """Return matching resume ids (sorted ascending) for a parsed query."""
+        import numpy as np
+
+        with self._lock:
+            self._consolidate()
+            ids = self._evaluate(query)
+            if self._deleted:
+                ids = ids[~np.isin(ids, np.fromiter(self._deleted, dtype=np.int64))]
+            return ids
+
+
+@functools.cache
+def _empty():
+    import numpy as np
+    return np.zeros(0, dtype=np.int64)
+
+
+def _merge(posting_list, ids):
+    """Merge ``ids`` into a sorted posting list, appending when they are all newer."""
+    import numpy as np
+
+    new_ids = np.sort(np.array(ids, dtype=np.int64))
+    if not len(posting_list) or new_ids[0] > posting_list[-1]:
+        return np.concatenate([posting_list, new_ids])
+    return np.union1d(posting_list, new_ids)
+
+
+def _resolve_skill(term):
+    matcher = get_skill_matcher()
+    term = ' '.join(term.lower().split())
+    return matcher.aliases.get(term, term)
+
+
+def parse_query(query):
+    """
+    Parse a boolean skill query such as ``python AND (k8s OR aws) NOT java``.
+
+    Adjacent terms without an operator are joined into one multi-word skill
+    (``machine learning``); synonyms resolve to canonical skill ids. ``NOT``
+    binds tightest, then ``AND``, then ``OR``. A bare ``NOT`` after a term
+    means ``AND NOT``.
+    """
+    tokens = QUERY_TOKEN_RE.findall(query)
+    position = 0
+
+    def peek():
+        return tokens[position] if position < len(tokens) else None
+
+    def take():
+        nonlocal position
+        position += 1
+        return tokens[position - 1]
+
+    def parse_or():
+        node = parse_and()
+        while peek() is not None and peek().upper() == 'OR':
+            take()
+            node = ('or', node, parse_and())
+        return node
+
+    def parse_and():
+        node = parse_not()
+        while peek() is not None and peek().upper() in ('AND', 'NOT'):
+            if peek().upper() == 'AND':
+                take()
+            node = ('and', node, parse_not())
+        return node
+
+    def parse_not():
+        if peek() is not None and peek().upper() == 'NOT':
+            take()
+            return ('not', parse_not())
+        return parse_term()
+
+    def parse_term():
+        token = peek()
+        if token is None:
+            raise QueryError('Query ended unexpectedly')
+        if token == '(':
+            take()
+            node = parse_or()
+            if peek() != ')':
+                raise QueryError('Missing closing parenthesis')
+            take()
+            return node
+        if token == ')' or token.upper() in OPERATORS:
+            raise QueryError(f'Unexpected "{token}"')
+        words = []
+        while peek() is not None and peek() not in ('(', ')') and peek().upper() not in OPERATORS:
+            words.append(take())
+        return ('skill', _resolve_skill(' '.join(words)))
+
+    if not tokens:
+        raise QueryError('Empty query')
+    node = parse_or()
+    if peek() is not None:
+        raise QueryError(f'Unexpected "{peek()}"')
+    return node
+
+
+_index = SkillIndex()
+
+
+def get_skill_index(sync=True):
+    """Return the process-wide SkillIndex, synced with the database."""
+    if sync:
+        _index.sync()
+    return _index
+
+
+def store_resume(name, text, skills, keywords=()):
+    """Persist a parsed resume and add it to the inverted index."""
+    with transaction.atomic():
+        resume = StoredResume.objects.create(name=name, text=text, skills=list(skills), keywords=list(keywords))
+        SkillPosting.objects.bulk_create(
+            SkillPosting(skill=skill, resume=resume) for skill in set(skills)
+        )
+    transaction.on_commit(lambda: _index.add(resume.pk, set(skills)))
+    return resume
+
+
+def search_resumes(query):
+    """Return the ids of stored resumes matching a boolean skill query, newest first."""
+    ids = get_skill_index().search(parse_query(query))
+    return ids[::-1]
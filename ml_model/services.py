@@ -1,33 +1,57 @@
-from .models import ResumePredictor
-from .train_model import predict_resume_match
-from .utils import extract_skills_from_text
+from . import llm_cache
+from . import llm_output
+from . import prompt_budget
+from .metrics import stage_timer
+from .ollama import OllamaError, get_ollama_client
+from .registry import get_active_model
+from .utils import extract_skills
 import re
 import os
-import openai
-from docx import Document
-from docx.shared import Inches
 import io
-import requests
-import json
+import logging
+from collections import Counter
+from django.conf import settings
 
-def predict_resume_success(resume_text, job_description):
-    """Predict if a resume will be successful for a given job description."""
-    # Get the active model
-    model_record = ResumePredictor.objects.filter(is_active=True).first()
-    if not model_record:
-        return {'error': "No active model found. Please train the model first."}
-    
+logger = logging.getLogger(__name__)
+
+# Bump these whenever a prompt template changes so cached responses are not reused
+SECTION_EVALUATION_PROMPT_VERSION = 1
+IMPROVED_RESUME_PROMPT_VERSION = 1
+STRUCTURED_SECTION_EVALUATION_PROMPT_VERSION = 1
+STRUCTURED_IMPROVED_RESUME_PROMPT_VERSION = 1
+
+SECTION_HEADER_RE = re.compile(r'^[#*\s]*(?P<name>[^()*#]+?)[\s*]*\(\s*Score:\s*(?P<score>[^/)]+?)\s*/\s*10\s*\)')
+OVERALL_SCORE_RE = re.compile(r'Overall Resume Score:\s*\**\s*(?P<score>[^*]+)')
+BULLET_PREFIX_RE = re.compile(r'^[-•*\d\.\s+]+')
+CATEGORY_RE = re.compile(r'^[-*\s]*(?P<category>Strengths|Areas for Improvement|Recommendations)\s*:', re.IGNORECASE)
+NUMBERED_ITEM_RE = re.compile(r'^(?:\d+[.)]|[-*•])\s*(?P<item>.*)')
+RESPONSE_HEADER_RE = re.compile(r'^[ \t#*]*===\s*([A-Z][A-Z /]*?)\s*===[ \t*]*$', re.MULTILINE)
+
+
+def score_resume(resume_text, job_description, resume_skills=None):
+    """
+    Score a resume against a job description with the ML model only.
+
+    ``resume_skills`` may be passed when the skills are already known (e.g.
+    from the parse cache) to skip extracting them again.
+    """
     try:
-        # Extract skills from resume text
-        skills = extract_skills_from_text(resume_text)
+        # Get the active model (cached per process, see ml_model.registry)
+        model_record, model = get_active_model()
+        if not model_record:
+            return {'error': "No active model found. Please train the model first."}
+        
+        # Extract canonical skill ids from resume text
+        skills_list = extract_skills(resume_text) if resume_skills is None else list(resume_skills)
+        skills = ', '.join(skills_list)
         
-        # Get the model
-        model = model_record.get_model()
         if not model:
             return {'error': "Error loading model."}
         
-        # Make prediction
-        probability = predict_resume_match(skills, job_description, model)
+        # Make prediction (train_model pulls in pandas and scikit-learn, so it
+        # is imported on first use rather than by every manage.py command)
+        from .train_model import predict_resume_match
+        probability = predict_resume_match(skills, job_description, model, resume_skills=skills_list)
         
         # Convert probability to percentage and round to 1 decimal place
         probability_percentage = round(probability * 100, 1)
@@ -35,11 +59,44 @@ def predict_resume_success(resume_text, job_description):
         # Use the actual probability percentage for both confidence and prediction
         confidence = probability_percentage
         
-        # Convert skills string to list and clean up
-        skills_list = [skill.strip() for skill in skills.split(',') if skill.strip()]
+        return {
+            'prediction': probability_percentage,
+            'confidence': confidence,
+            'skills_found': skills_list
+        }
         
-        # Generate section evaluations
-        prompt = f"""As an expert resume writer, analyze this resume and job description, then provide a comprehensive evaluation of each section.
+    except Exception as e:
+        logger.exception("Error in score_resume")
+        return {'error': f"Error making prediction: {str(e)}"}
+
+CATEGORY_KEYS = {
+    'strengths': 'strengths',
+    'areas for improvement': 'improvements',
+    'recommendations': 'recommendations',
+}
+
+# Section names the structured prompts ask the model to cover
+EVALUATED_SECTIONS = ['Summary/Objective', 'Experience', 'Skills', 'Education', 'Projects/Achievements']
+
+def structured_output_enabled():
+    return getattr(settings, 'LLM_STRUCTURED_OUTPUT', True)
+
+def generation_options(num_predict):
+    """
+    Ollama generation options.
+
+    With LLM_DETERMINISTIC enabled, sampling is fixed (temperature 0 and a
+    constant seed) so a cached response is as valid as a fresh one.
+    ``num_ctx`` is set to the context window the prompt budget assumes.
+    """
+    num_ctx = prompt_budget.context_tokens()
+    if getattr(settings, 'LLM_DETERMINISTIC', False):
+        return {'temperature': 0, 'seed': 0, 'num_predict': num_predict, 'num_ctx': num_ctx}
+    return {'temperature': 0.7, 'num_predict': num_predict, 'num_ctx': num_ctx}
+
+def build_section_evaluation_prompt(resume_text, job_description):
+    """Build the Ollama prompt asking for a per-section resume evaluation."""
+    return f"""As an expert resume writer, analyze this resume and job description, then provide a comprehensive evaluation of each section.
 
         Original Resume:
         {resume_text}
@@ -121,147 +178,253 @@ def predict_resume_success(resume_text, job_description):
           * [Third recommendation]
         
         Overall Resume Score: X/10"""
+
+def build_structured_section_evaluation_prompt(resume_text, job_description):
+    """Compact prompt for a JSON section evaluation (the schema is enforced via ``format``)."""
+    return f"""Evaluate this resume against the job description as an expert resume writer.
+Reply with JSON: {{"sections": [{{"name", "score" (0-10), "strengths", "improvements", "recommendations"}}], "overall_score" (0-10)}}.
+Sections: {', '.join(EVALUATED_SECTIONS)}. Up to 3 short items per list.
+
+Original Resume:
+{resume_text}
+
+Job Description:
+{job_description}"""
+
+def _is_template_line(line):
+    return line.startswith('[') or line.endswith(']')
+
+class SectionEvaluationParser:
+    """
+    Incremental parser for section evaluations in LLM output.
+
+    Text can be fed in arbitrary chunks (e.g. streamed tokens). ``feed`` and
+    ``close`` return the ``(section_name, evaluation)`` pairs that became
+    complete, so each section can be shown as soon as the next one starts.
+    """
+
+    def __init__(self):
+        self.section_evaluations = {}
+        self._buffer = ''
+        self._current_section = None
+        self._current_category = None
+
+    def feed(self, text):
+        """Consume a chunk of text and return newly completed sections."""
+        self._buffer += text
+        *lines, self._buffer = self._buffer.split('\n')
+        completed = []
+        for line in lines:
+            completed.extend(self._process_line(line))
+        return completed
+
+    def close(self):
+        """Flush any buffered text and return the remaining sections."""
+        completed = self._process_line(self._buffer)
+        self._buffer = ''
+        completed.extend(self._finish_section())
+        return completed
+
+    def _finish_section(self):
+        if self._current_section is None:
+            return []
+        name = self._current_section
+        self._current_section = None
+        self._current_category = None
+        return [(name, self.section_evaluations[name])]
+
+    def _start_section(self, name, score):
+        completed = self._finish_section()
+        self._current_section = name
+        self.section_evaluations[name] = {
+            'score': score,
+            'strengths': [],
+            'improvements': [],
+            'recommendations': []
+        }
+        return completed
+
+    def _process_line(self, line):
+        line = line.strip()
+        if not line:
+            return []
+        
+        # Check for section headers with scores
+        match = SECTION_HEADER_RE.match(line)
+        if match:
+            return self._start_section(match.group('name').strip(), match.group('score').strip())
+        match = OVERALL_SCORE_RE.search(line)
+        if match:
+            return self._start_section('Overall Resume Score', match.group('score').strip())
+        
+        # Check for category headers
+        match = CATEGORY_RE.match(line)
+        if match:
+            self._current_category = CATEGORY_KEYS[match.group('category').lower()]
+        elif self._current_section and self._current_category:
+            # Remove any leading dashes, asterisks, or numbers
+            line = BULLET_PREFIX_RE.sub('', line).strip()
+            if line and not _is_template_line(line):  # Only add non-empty, non-template lines
+                self.section_evaluations[self._current_section][self._current_category].append(line)
+        return []
+
+@stage_timer('llm_parse')
+def parse_section_evaluations(content):
+    """
+    Decode a complete section evaluation response into a dict keyed by section.
+
+    JSON responses (structured output mode) are validated against the schema
+    and raise ``LLMOutputError`` if they don't match; text responses go
+    through the regex-based SectionEvaluationParser.
+    """
+    return _parse_section_evaluations(content)
+
+def _parse_section_evaluations(content):
+    # Untimed, for parsers that record their own llm_parse time
+    if llm_output.looks_like_json(content):
+        return llm_output.decode_section_evaluations(content)
+    parser = SectionEvaluationParser()
+    parser.feed(content)
+    parser.close()
+    return parser.section_evaluations
+
+def _section_evaluation_request(resume_text, job_description, client):
+    """
+    Return ``(prompt, format, options, cache_key)`` for a section evaluation,
+    with the inputs compacted to the prompt token budget.
+    """
+    if structured_output_enabled():
+        build = build_structured_section_evaluation_prompt
+        output_format = llm_output.SECTION_EVALUATION_SCHEMA
+        prompt_version = ('json', STRUCTURED_SECTION_EVALUATION_PROMPT_VERSION)
+    else:
+        build = build_section_evaluation_prompt
+        output_format = None
+        prompt_version = SECTION_EVALUATION_PROMPT_VERSION
+    budgeted = prompt_budget.build_prompt('section_evaluation', build, resume_text, job_description)
+    options = generation_options(budgeted.num_predict)
+    cache_key = llm_cache.make_cache_key(
+        'section_evaluation', budgeted.resume_text, budgeted.job_description, prompt_version, client.model, options
+    )
+    return budgeted.prompt, output_format, options, cache_key
+
+def evaluate_sections(resume_text, job_description):
+    """Ask the LLM for a per-section evaluation of the resume."""
+    client = get_ollama_client()
+    prompt, output_format, options, cache_key = _section_evaluation_request(resume_text, job_description, client)
+    
+    try:
+        content = llm_cache.get(cache_key)
+        cached = content is not None
+        if not cached:
+            # Call Ollama API for section evaluations
+            content = client.generate(prompt, options, format=output_format)
+            logger.debug("Section evaluation response:\n%s", content)
         
-        # Call Ollama API for section evaluations
-        response = requests.post(
-            'http://10.1.1.126:11434/api/generate',
-            json={
-                'model': 'llama3.1',
-                'prompt': prompt,
-                'stream': False,
-                'options': {
-                    'temperature': 0.7,
-                    'num_predict': 4000
-                }
-            }
-        )
-        
-        if response.status_code != 200:
-            return {'error': f"Error from Ollama API: {response.text}"}
-        
-        # Parse the response
-        result = response.json()
-        content = result['response']
-        
-        print("\n=== API Response ===")
-        print(content)
-        print("=== End API Response ===\n")
-        
-        # Parse section evaluations
-        section_evaluations = {}
-        current_section = None
-        current_evaluation = None
-        current_category = None
-        
-        # Split content into sections first
-        sections = content.split('\n\n')
-        print("\n=== Processing Sections ===")
-        for section in sections:
-            section = section.strip()
-            if not section:
-                continue
-            
-            print(f"\nProcessing section:\n{section}")
-            
-            # Check for section headers with scores
-            if '**' in section and '(' in section and 'Score:' in section:
-                section_name = section.split('(')[0].strip()
-                score = section.split('(')[1].split('/')[0].strip()
-                current_section = section_name
-                current_evaluation = {
-                    'score': score,
-                    'strengths': [],
-                    'improvements': [],
-                    'recommendations': []
-                }
-                section_evaluations[section_name] = current_evaluation
-                print(f"\nFound section: {section_name} with score {score}")
-                continue
-            elif 'Overall Resume Score:' in section:
-                # Handle overall score section
-                score = section.split(':')[1].strip()
-                current_section = 'Overall Resume Score'
-                current_evaluation = {
-                    'score': score,
-                    'strengths': [],
-                    'improvements': [],
-                    'recommendations': []
-                }
-                section_evaluations[current_section] = current_evaluation
-                print(f"\nFound section: {current_section} with score {score}")
-                continue
-            
-            # Process the section content
-            lines = section.split('\n')
-            for line in lines:
-                line = line.strip()
-                if not line:
-                    continue
-                
-                print(f"\nProcessing line: {line}")
-                
-                # Check for category headers
-                if 'Strengths:' in line:
-                    current_category = 'strengths'
-                    print("Found Strengths category")
-                    continue
-                elif 'Areas for Improvement:' in line:
-                    current_category = 'improvements'
-                    print("Found Improvements category")
-                    continue
-                elif 'Recommendations:' in line:
-                    current_category = 'recommendations'
-                    print("Found Recommendations category")
-                    continue
-                
-                # Add content to current category if we have one
-                if current_category and current_evaluation and line:
-                    # Remove any leading dashes, asterisks, or numbers
-                    line = re.sub(r'^[-•*\d\.\s+]+', '', line).strip()
-                    if line and not line.startswith('[') and not line.endswith(']'):  # Only add non-empty, non-template lines
-                        if current_category == 'strengths':
-                            current_evaluation['strengths'].append(line)
-                        elif current_category == 'improvements':
-                            current_evaluation['improvements'].append(line)
-                        elif current_category == 'recommendations':
-                            current_evaluation['recommendations'].append(line)
-                        print(f"Added to {current_category}: {line}")
-        
-        print("\n=== Final Section Evaluations ===")
-        print(json.dumps(section_evaluations, indent=2))
-        print("=== End Final Section Evaluations ===\n")
+        section_evaluations = parse_section_evaluations(content)
+        if section_evaluations and not cached:
+            llm_cache.store(cache_key, content, kind='section_evaluation', model_name=client.model)
         
-        return {
-            'prediction': probability_percentage,
-            'confidence': confidence,
-            'skills_found': skills_list,
-            'section_evaluations': section_evaluations
-        }
+        logger.debug("Section evaluations: %s", section_evaluations)
+        
+        return {'section_evaluations': section_evaluations}
         
+    except OllamaError as e:
+        return {'error': str(e)}
+    except llm_output.LLMOutputError as e:
+        return {'error': f"Invalid section evaluation from the LLM: {str(e)}"}
     except Exception as e:
-        print("Error in predict_resume_success:", str(e))  # Debug print
-        return {'error': f"Error making prediction: {str(e)}"}
+        logger.exception("Error in evaluate_sections")
+        return {'error': f"Error evaluating sections: {str(e)}"}
+
+def stream_section_evaluations(resume_text, job_description):
+    """
+    Stream the per-section evaluation from Ollama.
+
+    Consumes Ollama's NDJSON token stream and yields ``(section_name,
+    evaluation)`` pairs as soon as each section is complete. Raises
+    ``OllamaError`` if the API cannot be reached or returns an error, and
+    ``LLMOutputError`` if a structured response doesn't match its schema.
+    Cached responses are replayed through the same parser.
+    """
+    client = get_ollama_client()
+    prompt, output_format, options, cache_key = _section_evaluation_request(resume_text, job_description, client)
+    
+    content = llm_cache.get(cache_key)
+    if content is not None:
+        parser = llm_output.SectionStreamDecoder() if llm_output.looks_like_json(content) else SectionEvaluationParser()
+        yield from parser.feed(content)
+        yield from parser.close()
+        return
+    
+    parser = llm_output.SectionStreamDecoder() if output_format is not None else SectionEvaluationParser()
+    pieces = []
+    for piece in client.generate_stream(prompt, options, format=output_format):
+        pieces.append(piece)
+        yield from parser.feed(piece)
+    yield from parser.close()
+    
+    if parser.section_evaluations:
+        llm_cache.store(cache_key, ''.join(pieces), kind='section_evaluation', model_name=client.model)
+
+def predict_resume_success(resume_text, job_description):
+    """
+    Predict if a resume will be successful for a given job description.
+
+    Combines the ML-only score (``score_resume``) with the LLM section
+    evaluation (``evaluate_sections``); callers that only need the score
+    should call ``score_resume`` directly.
 
+    The ML score is computed first: it takes milliseconds and fails fast
+    when no model is active, so no LLM generation is started for a request
+    that cannot succeed.
+    """
+    prediction_result = score_resume(resume_text, job_description)
+    if 'error' in prediction_result:
+        return prediction_result
+    
+    evaluation_result = evaluate_sections(resume_text, job_description)
+    if 'error' in evaluation_result:
+        return evaluation_result
+    
+    prediction_result['section_evaluations'] = evaluation_result['section_evaluations']
+    return prediction_result
+
+# Common resume sections to look for
+RESUME_SECTIONS = {
+    'summary': ['summary', 'profile', 'objective'],
+    'experience': ['experience', 'work history', 'employment'],
+    'education': ['education', 'academic', 'qualification'],
+    'skills': ['skills', 'technical skills', 'competencies'],
+    'projects': ['projects', 'portfolio', 'achievements']
+}
+
+STOP_WORDS = frozenset([
+    'the', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'with', 'by', 'of', 'a', 'an',
+    'is', 'are', 'was', 'were', 'be', 'been', 'being', 'have', 'has', 'had', 'do', 'does',
+    'did', 'will', 'would', 'shall', 'should', 'can', 'could', 'may', 'might', 'must',
+    'this', 'that', 'these', 'those', 'i', 'you', 'he', 'she', 'it', 'we', 'they',
+    'me', 'him', 'her', 'us', 'them', 'my', 'your', 'his', 'its', 'our', 'their',
+    'mine', 'yours', 'hers', 'ours', 'theirs', 'who', 'whom', 'whose', 'which', 'what',
+    'where', 'when', 'why', 'how', 'all', 'any', 'both', 'each', 'few', 'more', 'most',
+    'other', 'some', 'such', 'no', 'nor', 'not', 'only', 'own', 'same', 'so', 'than',
+    'too', 'very', 's', 't', 'can', 'will', 'just', 'don', 'should', 'now'
+])
+
+NON_WORD_RE = re.compile(r'[^\w\s]')
+
+@stage_timer('keyword_analysis')
 def analyze_keywords(resume_text, job_description):
     """
     Analyze keywords in resume and job description to generate detailed matching analysis.
     Returns a dictionary with keyword relevance scores, section analysis, and matching details.
     """
-    # Common resume sections to look for
-    sections = {
-        'summary': ['summary', 'profile', 'objective'],
-        'experience': ['experience', 'work history', 'employment'],
-        'education': ['education', 'academic', 'qualification'],
-        'skills': ['skills', 'technical skills', 'competencies'],
-        'projects': ['projects', 'portfolio', 'achievements']
-    }
-    
     # Extract keywords from both texts
     resume_keywords = extract_keywords(resume_text)
     job_keywords = extract_keywords(job_description)
     
     # Initialize section data
-    section_data = {section: {'keywords': [], 'score': 0} for section in sections}
+    section_data = {section: {'keywords': [], 'score': 0} for section in RESUME_SECTIONS}
     
     # Split resume into sections
     resume_sections = {}
@@ -274,52 +437,37 @@ def analyze_keywords(resume_text, job_description):
             continue
             
         # Check if line indicates a new section
-        for section, keywords in sections.items():
+        for section, keywords in RESUME_SECTIONS.items():
             if any(keyword in line for keyword in keywords):
                 current_section = section
                 break
         
-        if current_section not in resume_sections:
-            resume_sections[current_section] = []
-        resume_sections[current_section].append(line)
+        resume_sections.setdefault(current_section, []).append(line)
     
-    # Track matched and missing keywords
-    matched_keywords = []
-    missing_keywords = []
+    # Track matched keywords, indexed by keyword
+    matched_keywords = {}
     
     # Analyze each section
     for section, content in resume_sections.items():
-        section_text = ' '.join(content)
-        section_keywords = extract_keywords(section_text)
+        section_keywords = set(extract_keywords(' '.join(content)))
         
-        # Find matching keywords
+        # Find matching keywords. extract_keywords returns each keyword once,
+        # so the per-section count is always 1.
         matching_keywords = []
         for keyword in job_keywords:
             if keyword in section_keywords:
-                count = section_keywords.count(keyword)
                 matching_keywords.append({
                     'keyword': keyword,
-                    'count': count,
+                    'count': 1,
                     'relevance': 1.0  # Full relevance for exact matches
                 })
                 
-                # Add to matched keywords if not already there
-                if not any(k['keyword'] == keyword for k in matched_keywords):
-                    matched_keywords.append({
-                        'keyword': keyword,
-                        'sections': [{
-                            'name': section,
-                            'count': count
-                        }]
-                    })
-                else:
+                section_match = {'name': section, 'count': 1}
+                if keyword in matched_keywords:
                     # Add section to existing matched keyword
-                    for k in matched_keywords:
-                        if k['keyword'] == keyword:
-                            k['sections'].append({
-                                'name': section,
-                                'count': count
-                            })
+                    matched_keywords[keyword]['sections'].append(section_match)
+                else:
+                    matched_keywords[keyword] = {'keyword': keyword, 'sections': [section_match]}
         
         # Calculate section score
         section_score = len(matching_keywords) / len(job_keywords) if job_keywords else 0
@@ -329,19 +477,18 @@ def analyze_keywords(resume_text, job_description):
             section_data[section]['score'] = section_score
     
     # Find missing keywords
-    missing_keywords = [keyword for keyword in job_keywords 
-                       if not any(k['keyword'] == keyword for k in matched_keywords)]
+    missing_keywords = [keyword for keyword in job_keywords if keyword not in matched_keywords]
     
     # Calculate overall match percentage
     match_percentage = (len(matched_keywords) / len(job_keywords) * 100) if job_keywords else 0
     
     return {
         'section_analysis': section_data,
-        'matched_keywords': matched_keywords,
+        'matched_keywords': list(matched_keywords.values()),
         'missing_keywords': missing_keywords,
         'match_percentage': round(match_percentage, 1),
-        'resume_keywords': {k: resume_keywords.count(k) for k in set(resume_keywords)},
-        'job_keywords': {k: job_keywords.count(k) for k in set(job_keywords)}
+        'resume_keywords': dict(Counter(resume_keywords)),
+        'job_keywords': dict(Counter(job_keywords))
     }
 
 def extract_keywords(text):
@@ -349,40 +496,61 @@ def extract_keywords(text):
     Extract important keywords from text.
     """
     # Convert to lowercase and remove special characters
-    text = text.lower()
-    text = re.sub(r'[^\w\s]', ' ', text)
-    
-    # Split into words and remove common words
-    words = text.split()
-    stop_words = set([
-        'the', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'with', 'by', 'of', 'a', 'an',
-        'is', 'are', 'was', 'were', 'be', 'been', 'being', 'have', 'has', 'had', 'do', 'does',
-        'did', 'will', 'would', 'shall', 'should', 'can', 'could', 'may', 'might', 'must',
-        'this', 'that', 'these', 'those', 'i', 'you', 'he', 'she', 'it', 'we', 'they',
-        'me', 'him', 'her', 'us', 'them', 'my', 'your', 'his', 'its', 'our', 'their',
-        'mine', 'yours', 'hers', 'ours', 'theirs', 'who', 'whom', 'whose', 'which', 'what',
-        'where', 'when', 'why', 'how', 'all', 'any', 'both', 'each', 'few', 'more', 'most',
-        'other', 'some', 'such', 'no', 'nor', 'not', 'only', 'own', 'same', 'so', 'than',
-        'too', 'very', 's', 't', 'can', 'will', 'just', 'don', 'should', 'now'
-    ])
+    text = NON_WORD_RE.sub(' ', text.lower())
     
-    # Filter out stop words and short words
-    words = [word for word in words if word not in stop_words and len(word) > 2]
-    
-    # Count word frequencies
-    word_freq = {}
-    for word in words:
-        word_freq[word] = word_freq.get(word, 0) + 1
+    # Count frequencies of words that are not stop words or short words
+    word_freq = Counter(word for word in text.split() if len(word) > 2 and word not in STOP_WORDS)
     
     # Return top keywords (words that appear more than once)
     return [word for word, freq in word_freq.items() if freq > 1]
 
-def generate_improved_resume(resume_text, job_description):
+@stage_timer('llm_parse')
+def parse_improved_resume(content):
     """
-    Generate an improved version of the resume using Ollama's Llama3.1 model.
-    Returns the improved resume text, changes made, and section evaluations.
+    Decode an improved resume response into ``(improved_resume, changes,
+    section_evaluations)``.
+
+    JSON responses are validated against the schema (``LLMOutputError`` if
+    they don't match). Text responses are split on ``=== HEADER ===`` lines;
+    the evaluation block goes through SectionEvaluationParser.
     """
-    prompt = f"""As an expert resume writer, analyze this resume and job description, then provide a comprehensive evaluation and improved version.
+    if llm_output.looks_like_json(content):
+        return llm_output.decode_improved_resume(content)
+
+    # Split the response into (header, body) pairs on '=== HEADER ===' lines
+    parts = RESPONSE_HEADER_RE.split(content)
+    improved_resume = ""
+    changes = []
+    explanation = ""
+    section_evaluations = {}
+
+    for header, section in zip(parts[1::2], parts[2::2]):
+        section = section.strip()
+        if not section:
+            continue
+
+        if 'SECTION EVALUATION' in header:
+            section_evaluations = _parse_section_evaluations(section)
+        elif 'CHANGES MADE' in header:
+            for line in section.split('\n'):
+                match = NUMBERED_ITEM_RE.match(line.strip())
+                if match:
+                    change = match.group('item').strip()
+                    if change and not _is_template_line(change):
+                        changes.append(change)
+        elif 'IMPROVED RESUME' in header:
+            improved_resume = section
+        elif 'EXPLANATION' in header and not _is_template_line(section):
+            # Add explanation as additional context
+            explanation = section
+
+    if explanation:
+        changes.append(explanation)
+    return improved_resume, changes, section_evaluations
+
+def build_improved_resume_prompt(resume_text, job_description):
+    """Build the Ollama prompt asking for an evaluation plus an improved resume (text format)."""
+    return f"""As an expert resume writer, analyze this resume and job description, then provide a comprehensive evaluation and improved version.
 
     Original Resume:
     {resume_text}
@@ -464,106 +632,60 @@ def generate_improved_resume(resume_text, job_description):
     === EXPLANATION ===
     [Explain why these changes improve the match with the job description and how they address the identified areas for improvement]
     """
+
+def build_structured_improved_resume_prompt(resume_text, job_description):
+    """Compact prompt for a JSON improved resume (the schema is enforced via ``format``)."""
+    return f"""Evaluate this resume against the job description as an expert resume writer, then rewrite it to fit the job.
+Reply with JSON: {{"sections": [{{"name", "score" (0-10), "strengths", "improvements", "recommendations"}}], "overall_score" (0-10), "changes", "improved_resume", "explanation"}}.
+Sections: {', '.join(EVALUATED_SECTIONS)}. Up to 2 short items per list. "changes": at least 5 specific changes made. "improved_resume": the complete rewritten resume with all its sections. "explanation": why the changes improve the match.
+
+Original Resume:
+{resume_text}
+
+Job Description:
+{job_description}"""
+
+def generate_improved_resume(resume_text, job_description):
+    """
+    Generate an improved version of the resume using Ollama's Llama3.1 model.
+    Returns the improved resume text, changes made, and section evaluations.
+    """
+    
+    client = get_ollama_client()
+    if structured_output_enabled():
+        build = build_structured_improved_resume_prompt
+        output_format = llm_output.IMPROVED_RESUME_SCHEMA
+        prompt_version = ('json', STRUCTURED_IMPROVED_RESUME_PROMPT_VERSION)
+    else:
+        build = build_improved_resume_prompt
+        output_format = None
+        prompt_version = IMPROVED_RESUME_PROMPT_VERSION
+    # num_predict grows with the resume, since the response contains a rewritten copy
+    budgeted = prompt_budget.build_prompt('improved_resume', build, resume_text, job_description)
+    prompt = budgeted.prompt
+    options = generation_options(budgeted.num_predict)
+    cache_key = llm_cache.make_cache_key(
+        'improved_resume', budgeted.resume_text, budgeted.job_description, prompt_version, client.model, options
+    )
     
     try:
-        # Call Ollama API
-        response = requests.post(
-            'http://10.1.1.126:11434/api/generate',
-            json={
-                'model': 'llama3.1',
-                'prompt': prompt,
-                'stream': False,
-                'options': {
-                    'temperature': 0.7,
-                    'num_predict': 4000  # Increased for more detailed response
-                }
-            }
-        )
-        
-        if response.status_code != 200:
-            return None, f"Error from Ollama API: {response.text}"
-        
-        # Parse the response
-        result = response.json()
-        content = result['response']
-        
-        print("\n=== API Response ===")
-        print(content)
-        print("=== End API Response ===\n")
-        
-        # Split the response into sections
-        sections = content.split('===')
-        improved_resume = ""
-        changes = []
-        section_evaluations = {}
-        current_section = None
-        current_evaluation = {}
-        
-        for section in sections:
-            section = section.strip()
-            if not section:
-                continue
-                
-            if 'SECTION EVALUATION' in section:
-                # Parse section evaluations
-                lines = section.split('\n')
-                for line in lines:
-                    line = line.strip()
-                    if not line:
-                        continue
-                        
-                    if '**' in line and '(' in line:
-                        # Extract section name and score
-                        section_name = line.split('(')[0].strip()
-                        section_name = section_name.replace('**', '').strip()
-                        score = line.split('(')[1].split('/')[0].strip()
-                        current_section = section_name
-                        current_evaluation = {
-                            'score': score,
-                            'strengths': [],
-                            'improvements': [],
-                            'recommendations': []
-                        }
-                        section_evaluations[current_section] = current_evaluation
-                    elif '- Strengths:' in line:
-                        current_category = 'strengths'
-                    elif '- Areas for Improvement:' in line:
-                        current_category = 'improvements'
-                    elif '- Recommendations:' in line:
-                        current_category = 'recommendations'
-                    elif line.startswith('*'):
-                        content = re.sub(r'^\*\s*', '', line).strip()
-                        if content and not content.startswith('[') and not content.endswith(']'):
-                            if current_section and current_category:
-                                current_evaluation[current_category].append(content)
-            elif 'CHANGES MADE' in section:
-                # Process changes section
-                lines = section.split('\n')
-                for line in lines:
-                    line = line.strip()
-                    if line.startswith(('1.', '2.', '3.', '4.', '5.')):
-                        change = re.sub(r'^\d+\.\s*', '', line).strip()
-                        if change and not change.startswith('[') and not change.endswith(']'):
-                            changes.append(change)
-            elif 'IMPROVED RESUME' in section:
-                # Extract improved resume
-                improved_resume = section.replace('IMPROVED RESUME', '').strip()
-            elif 'EXPLANATION' in section:
-                # Add explanation as additional context
-                explanation = section.replace('EXPLANATION', '').strip()
-                if explanation and not explanation.startswith('[') and not explanation.endswith(']'):
-                    changes.append(explanation)
+        raw_content = llm_cache.get(cache_key)
+        cached = raw_content is not None
+        if not cached:
+            # Call Ollama API
+            raw_content = client.generate(prompt, options, format=output_format)
+            logger.debug("Improved resume response:\n%s", raw_content)
+        
+        improved_resume, changes, section_evaluations = parse_improved_resume(raw_content)
         
         if not improved_resume:
             return None, "Failed to generate improved resume"
-            
-        print("\n=== Final Section Evaluations ===")
-        print(json.dumps(section_evaluations, indent=2))
-        print("=== End Final Section Evaluations ===\n")
         
-        print("\n=== Final Changes ===")
-        print(json.dumps(changes, indent=2))
-        print("=== End Final Changes ===\n")
+        if not cached:
+            llm_cache.store(cache_key, raw_content, kind='improved_resume', model_name=client.model)
+            
+        logger.debug("Improved resume section evaluations: %s", section_evaluations)
+        logger.debug("Improved resume changes: %s", changes)
         
         return {
             'improved_resume': improved_resume.strip(),
@@ -571,15 +693,50 @@ def generate_improved_resume(resume_text, job_description):
             'section_evaluations': section_evaluations
         }
         
+    except OllamaError as e:
+        return None, str(e)
+    except llm_output.LLMOutputError as e:
+        return None, f"Invalid improved resume from the LLM: {str(e)}"
     except Exception as e:
         return None, f"Error generating improved resume: {str(e)}"
 
+def improve_resume(resume_text, job_description):
+    """
+    Generate an improved resume and re-analyse it against the job description.
+
+    Returns the result page context, or a dict with an ``error`` key.
+    """
+    result = generate_improved_resume(resume_text, job_description)
+    if isinstance(result, tuple) and result[0] is None:
+        return {'error': result[1]}
+    
+    # Re-score the improved resume with the ML model only; the generation
+    # already returned the section evaluations, so a second LLM call would
+    # double the cost for results that are discarded
+    prediction_result = score_resume(result['improved_resume'], job_description)
+    if 'error' in prediction_result:
+        return prediction_result
+    
+    # Get keyword analysis
+    keyword_analysis = analyze_keywords(result['improved_resume'], job_description)
+    
+    return {
+        'resume_text': result['improved_resume'],
+        'job_description': job_description,
+        'prediction': prediction_result,
+        'keyword_analysis': keyword_analysis,
+        'changes_made': result['changes'],
+        'section_evaluations': result['section_evaluations']
+    }
+
 def create_pdf_from_text(text, filename):
     """
     Create a PDF file from the given text.
     Returns the PDF file as bytes.
     """
     try:
+        from docx import Document
+
         # Create a new Word document
         doc = Document()
         
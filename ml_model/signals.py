@@ -0,0 +1,18 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import ResumePredictor, StoredResume
+from . import registry, search
+
+
+@receiver(post_save, sender=ResumePredictor)
+@receiver(post_delete, sender=ResumePredictor)
+def invalidate_model_registry(sender, **kwargs):
+    """Reload the active model after it is retrained, switched or removed."""
+    registry.invalidate()
+
+
+@receiver(post_delete, sender=StoredResume)
+def remove_from_skill_index(sender, instance, **kwargs):
+    """Keep deleted resumes out of skill search results."""
+    search.get_skill_index(sync=False).discard([instance.pk])
@@ -0,0 +1,154 @@
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from sklearn.base import BaseEstimator, TransformerMixin
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.linear_model import SGDClassifier
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+
+from .train_model import NUMERIC_FEATURES
+
+# Dataset columns the model is trained on, read with compact dtypes
+CSV_COLUMNS = {
+    'Skills': 'string',
+    'Experience (Years)': 'float32',
+    'Projects Count': 'float32',
+    'Salary Expectation ($)': 'float32',
+    'Recruiter Decision': 'category',
+}
+FEATURE_COLUMNS = {
+    'Skills': 'skills',
+    'Experience (Years)': 'experience',
+    'Projects Count': 'projects',
+    'Salary Expectation ($)': 'salary',
+}
+DEFAULT_CHUNK_SIZE = 50_000
+DEFAULT_HASH_FEATURES = 2 ** 18
+# Every HOLDOUT_EVERY-th row is held out for scoring, up to HOLDOUT_MAX_ROWS rows
+HOLDOUT_EVERY = 5
+HOLDOUT_MAX_ROWS = 10_000
+
+
+class HashedSkillFeatures(TransformerMixin, BaseEstimator):
+    """
+    Stateless hashing of the skills text plus incrementally standardised
+    numeric features, for the same input frame as the TF-IDF preprocessor.
+
+    Only the numeric mean/variance is learned (``partial_fit``), so memory
+    does not grow with the vocabulary or the number of rows. Missing numeric
+    values become the mean.
+    """
+
+    def __init__(self, n_features=DEFAULT_HASH_FEATURES):
+        self.n_features = n_features
+
+    def _hasher(self):
+        return HashingVectorizer(n_features=self.n_features, alternate_sign=False)
+
+    def partial_fit(self, X, y=None):
+        if not hasattr(self, 'scaler_'):
+            self.scaler_ = StandardScaler()
+        self.scaler_.partial_fit(X[NUMERIC_FEATURES].to_numpy(dtype=np.float64))
+        return self
+
+    def fit(self, X, y=None):
+        if hasattr(self, 'scaler_'):
+            del self.scaler_
+        return self.partial_fit(X)
+
+    def transform(self, X):
+        skills = X['skills'].fillna('').astype(str)
+        numeric = np.nan_to_num(self.scaler_.transform(X[NUMERIC_FEATURES].to_numpy(dtype=np.float64)))
+        return sp.hstack([self._hasher().transform(skills), sp.csr_matrix(numeric)], format='csr')
+
+
+def read_chunks(dataset_path, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Yield ``(features, target, holdout_mask)`` per chunk of the CSV, reading
+    only the model's columns with compact dtypes.
+    """
+    offset = 0
+    reader = pd.read_csv(dataset_path, usecols=list(CSV_COLUMNS), dtype=CSV_COLUMNS, chunksize=chunk_size)
+    for chunk in reader:
+        features = chunk[list(FEATURE_COLUMNS)].rename(columns=FEATURE_COLUMNS)
+        target = (chunk['Recruiter Decision'] == 'Hire').to_numpy(dtype=np.int8)
+        holdout = (np.arange(offset, offset + len(chunk)) % HOLDOUT_EVERY) == 0
+        offset += len(chunk)
+        yield features, target, holdout
+
+
+def train_streaming(dataset_path, chunk_size=DEFAULT_CHUNK_SIZE, epochs=5, n_features=DEFAULT_HASH_FEATURES,
+                    random_state=42):
+    """
+    Train a resume predictor without loading the dataset into memory.
+
+    One pass learns the numeric feature scaling; each of ``epochs`` further
+    passes streams the CSV in chunks and calls ``partial_fit`` on a
+    logistic-loss SGD classifier. Every ``HOLDOUT_EVERY``-th row is kept out
+    of training (a bounded sample of them scores the model), so accuracy is
+    comparable to the other training modes.
+
+    Returns ``(pipeline, report)``; the pipeline takes the same input frame
+    as the TF-IDF pipeline. The report has rows, accuracy, rows/sec and the
+    peak memory traced while training.
+    """
+    rng = np.random.default_rng(random_state)
+    features = HashedSkillFeatures(n_features)
+    classifier = SGDClassifier(loss='log_loss', alpha=1e-4, random_state=random_state)
+    classes = np.array([0, 1])
+
+    tracing = tracemalloc.is_tracing()
+    if not tracing:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    start = time.perf_counter()
+
+    rows = 0
+    for X, _, holdout in read_chunks(dataset_path, chunk_size):
+        features.partial_fit(X[~holdout])
+        rows += len(X)
+
+    trained_rows = 0
+    holdout_frames = []
+    holdout_targets = []
+    holdout_rows = 0
+    for epoch in range(epochs):
+        for X, y, holdout in read_chunks(dataset_path, chunk_size):
+            if epoch == 0 and holdout_rows < HOLDOUT_MAX_ROWS:
+                keep = min(int(holdout.sum()), HOLDOUT_MAX_ROWS - holdout_rows)
+                holdout_frames.append(X[holdout].head(keep))
+                holdout_targets.append(y[holdout][:keep])
+                holdout_rows += keep
+            order = rng.permutation(np.flatnonzero(~holdout))
+            if len(order):
+                classifier.partial_fit(features.transform(X.iloc[order]), y[order], classes=classes)
+                trained_rows += len(order)
+    elapsed = time.perf_counter() - start
+
+    pipeline = Pipeline([('preprocessor', features), ('classifier', classifier)])
+    accuracy = None
+    if holdout_rows:
+        accuracy = float(pipeline.score(pd.concat(holdout_frames), np.concatenate(holdout_targets)))
+
+    peak_memory = tracemalloc.get_traced_memory()[1]
+    if not tracing:
+        tracemalloc.stop()
+
+    report = {
+        'dataset': dataset_path,
+        'rows': rows,
+        'chunk_size': chunk_size,
+        'epochs': epochs,
+        'hash_features': n_features,
+        'trained_rows': trained_rows,
+        'holdout_rows': holdout_rows,
+        'accuracy': accuracy,
+        'train_time_s': round(elapsed, 3),
+        'rows_per_second': round((rows + trained_rows) / elapsed, 1) if elapsed else None,
+        'peak_memory_bytes': peak_memory,
+    }
+    return pipeline, report
@@ -1,3 +1,793 @@
-from django.test import TestCase
+import io
+import os
+import json
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from http.server import ThreadingHTTPServer
+from unittest import mock
 
-# Create your tests here.
+import joblib
+import numpy as np
+import pandas as pd
+from django.conf import settings
+from django.contrib.auth.models import Permission, User
+from django.core.management import CommandError, call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from . import jobs, llm_cache, llm_output, metrics, prompt_budget, registry, search, services, warmup
+from .models import CachedLLMResponse, Job, ResumePredictor, SkillPosting, StoredResume
+from .ollama import OllamaClient, OllamaError
+from .fake_llm import FakeOllamaClient, improved_resume_json, section_evaluation_json
+from .management.commands import screen_resumes
+from .management.commands.fake_ollama import FakeOllamaHandler
+from .model_search import load_param_grid
+from .services import (
+    SectionEvaluationParser, build_section_evaluation_prompt, parse_improved_resume, parse_section_evaluations,
+)
+from .train_model import fit_pipeline, predict_resume_match, predict_resume_matches, preprocess_data
+from .utils import SkillMatcher, extract_skills
+
+
+class ModelRegistryTests(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        self.settings_override.enable()
+        os.makedirs(os.path.join(self.media_root, 'ml_models'))
+        registry.invalidate()
+
+    def tearDown(self):
+        self.settings_override.disable()
+        registry.invalidate()
+
+    def _create_predictor(self, name, payload, is_active=True):
+        relpath = os.path.join('ml_models', f'{name}.joblib')
+        joblib.dump(payload, os.path.join(self.media_root, relpath))
+        return ResumePredictor.objects.create(name=name, model_file=relpath, is_active=is_active)
+
+    def test_model_is_loaded_once(self):
+        record = self._create_predictor('first', {'model': 1})
+        before = registry.registry_stats()
+
+        for _ in range(3):
+            active, model = registry.get_active_model()
+            self.assertEqual(active.pk, record.pk)
+            self.assertEqual(model, {'model': 1})
+
+        stats = registry.registry_stats()
+        self.assertEqual(stats['loads'] - before['loads'], 1)
+        self.assertEqual(stats['hits'] - before['hits'], 2)
+
+    def test_switching_active_model_reloads(self):
+        first = self._create_predictor('first', {'model': 1})
+        registry.get_active_model()
+
+        first.is_active = False
+        first.save()
+        self._create_predictor('second', {'model': 2})
+
+        _, model = registry.get_active_model()
+        self.assertEqual(model, {'model': 2})
+
+    def test_no_active_model(self):
+        self.assertEqual(registry.get_active_model(), (None, None))
+
+    def test_activate_deactivates_other_models(self):
+        first = self._create_predictor('first', {'model': 1})
+        second = self._create_predictor('second', {'model': 2})
+        self.assertEqual(registry.get_active_model()[1], {'model': 2})
+
+        registry.activate(first)
+        self.assertEqual(registry.get_active_model()[1], {'model': 1})
+        self.assertEqual(list(ResumePredictor.objects.filter(is_active=True)), [first])
+        second.refresh_from_db()
+        self.assertFalse(second.is_active)
+
+
+@override_settings(PARSE_POOL_ENABLED=False)
+class WarmUpTests(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        self.settings_override.enable()
+        self.addCleanup(self.settings_override.disable)
+        registry.invalidate()
+        self.addCleanup(registry.invalidate)
+        for state in (warmup._state, warmup._llm):
+            self.addCleanup(state.update, dict(state))
+        warmup._state.update(status=warmup.STATUS_PENDING, steps={}, error=None)
+        warmup._llm.update(checked_at=None)
+        ping = mock.patch.object(OllamaClient, 'ping', side_effect=OllamaError('connection refused'))
+        ping.start()
+        self.addCleanup(ping.stop)
+
+    def test_not_ready_until_warm_up_completes(self):
+        X, y = preprocess_data(pd.read_csv(settings.BASE_DIR / 'AI_Resume_Screening.csv', nrows=100))
+        relpath = os.path.join('ml_models', 'warm.joblib')
+        os.makedirs(os.path.join(self.media_root, 'ml_models'))
+        joblib.dump(fit_pipeline(X, y, classifier_params={'n_estimators': 5}, n_jobs=1),
+                    os.path.join(self.media_root, relpath))
+        record = ResumePredictor.objects.create(name='warm', model_file=relpath)
+
+        response = self.client.get(reverse('readiness'))
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.json()['status'], 'pending')
+
+        warmup.warm_up()
+        response = self.client.get(reverse('readiness'))
+        self.assertEqual(response.status_code, 200)
+        state = response.json()
+        self.assertEqual(state['model_id'], record.pk)
+        self.assertIsNotNone(state['model_load_time'])
+        self.assertEqual(list(state['steps']), ['url_conf', 'database', 'skill_matcher', 'model', 'llm_client', 'parse_pool'])
+        self.assertEqual(state['llm'], {'checked_at': mock.ANY, 'reachable': False, 'error': 'connection refused'})
+
+    @override_settings(ML_MODEL_WARM_UP_ATTEMPTS=2)
+    def test_failed_step_keeps_worker_not_ready(self):
+        step = mock.Mock(side_effect=OSError('artifact missing'))
+        with mock.patch.dict(warmup._steps, {'model': step}), mock.patch.object(warmup.time, 'sleep'), \
+                self.assertLogs('ml_model.warmup', 'ERROR'):
+            warmup.warm_up()
+        self.assertEqual(step.call_count, 2)
+        response = self.client.get(reverse('readiness'))
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.json()['error'], 'model: artifact missing')
+
+    def test_transient_failures_are_retried_with_backoff(self):
+        step = mock.Mock(side_effect=[OSError('database is starting'), OSError('database is starting'), None])
+        with mock.patch.dict(warmup._steps, {'database': step}), \
+                mock.patch.object(warmup.time, 'sleep') as sleep, self.assertLogs('ml_model.warmup', 'WARNING'):
+            warmup.warm_up()
+        self.assertEqual(warmup.readiness()['status'], 'ready')
+        self.assertEqual([call.args[0] for call in sleep.call_args_list], [1.0, 2.0])
+
+    @override_settings(ML_MODEL_WARM_UP=False)
+    def test_ready_when_warm_up_is_disabled(self):
+        warmup.start()
+        response = self.client.get(reverse('readiness'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['status'], 'disabled')
+
+    def test_each_process_warms_up_on_its_first_request(self):
+        self.addCleanup(setattr, warmup, '_started_pid', None)
+        application = warmup.wsgi_application(mock.Mock(return_value=[b'ok']))
+        with mock.patch.object(warmup.threading, 'Thread') as thread:
+            application({}, None)
+            application({}, None)
+            self.assertEqual(thread.call_count, 1)
+            # gunicorn --preload: a forked worker inherits the state but not the thread
+            warmup._state.update(status=warmup.STATUS_RUNNING)
+            warmup._reset_after_fork()
+            with mock.patch.object(warmup.os, 'getpid', return_value=os.getpid() + 1):
+                application({}, None)
+            self.assertEqual(thread.call_count, 2)
+
+    def test_llm_check_does_not_block_other_probes(self):
+        pinging, release = threading.Event(), threading.Event()
+
+        def slow_ping(timeout=2.0):
+            pinging.set()
+            release.wait(5)
+
+        with mock.patch.object(OllamaClient, 'ping', side_effect=slow_ping):
+            checker = threading.Thread(target=warmup.llm_status)
+            checker.start()
+            pinging.wait(5)
+            self.assertEqual(warmup.llm_status()['reachable'], None)
+            release.set()
+            checker.join(5)
+        self.assertTrue(warmup.llm_status()['reachable'])
+
+
+class ImportTimeTests(SimpleTestCase):
+    """
+    ``manage.py`` commands and worker boot must not import the training and
+    LLM stacks; request code paths import them on first use.
+    """
+    # Seconds for a whole ``manage.py check`` run (about 0.4s lazily, 3.5s eagerly)
+    CHECK_BUDGET = 1.5
+    HEAVY_MODULES = ('numpy', 'sklearn', 'pandas', 'scipy', 'joblib', 'openai', 'requests', 'docx', 'PyPDF2')
+
+    def _python(self, *args):
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join(path for path in sys.path if path))
+        return subprocess.run([sys.executable, *args], cwd=settings.BASE_DIR, env=env,
+                              capture_output=True, text=True, check=True)
+
+    def test_url_conf_does_not_import_heavy_modules(self):
+        result = self._python('-c', (
+            'import sys, django; django.setup(); '
+            'from django.urls import get_resolver; get_resolver().url_patterns; '
+            f'print(sorted(name for name in {self.HEAVY_MODULES!r} if name in sys.modules))'
+        ))
+        self.assertEqual(result.stdout.strip(), '[]')
+
+    def test_manage_py_check_within_budget(self):
+        timings = []
+        for _ in range(3):
+            start = time.perf_counter()
+            self._python('manage.py', 'check')
+            timings.append(time.perf_counter() - start)
+        self.assertLess(min(timings), self.CHECK_BUDGET)
+
+
+class SkillMatcherTests(SimpleTestCase):
+    def test_synonyms_map_to_canonical_ids(self):
+        skills = extract_skills('Deployed services on K8s and AWS using Python3 and Node.js')
+        self.assertEqual(skills, ['python', 'aws', 'kubernetes', 'node'])
+
+    def test_symbol_terms_and_word_boundaries(self):
+        matcher = SkillMatcher(['c++', 'java', 'machine learning'], {
+            'c++': 'c++', 'java': 'java', 'machine learning': 'machine learning',
+        })
+        self.assertEqual(matcher.find('C++ and Machine\n  Learning, not JavaScript'), ['c++', 'machine learning'])
+
+
+class SectionEvaluationParserTests(SimpleTestCase):
+    RESPONSE = (
+        "SECTION EVALUATION:\n"
+        "**Summary/Objective (Score: 7/10)**\n"
+        "- Strengths:\n"
+        "  * Clear career goal\n"
+        "  * [Second strength]\n"
+        "- Areas for Improvement:\n"
+        "  * Too generic\n"
+        "- Recommendations:\n"
+        "  * Tailor to the role\n"
+        "\n"
+        "Experience (Score: 8/10):\n"
+        "- Strengths:\n"
+        "  * Relevant projects\n"
+        "Overall Resume Score: 7/10"
+    )
+
+    def test_sections_are_emitted_as_they_complete(self):
+        parser = SectionEvaluationParser()
+        emitted = []
+        for start in range(0, len(self.RESPONSE), 5):
+            emitted.extend(name for name, _ in parser.feed(self.RESPONSE[start:start + 5]))
+        # The final line has no newline yet, so Experience is still open
+        self.assertEqual(emitted, ['Summary/Objective'])
+
+        emitted.extend(name for name, _ in parser.close())
+        self.assertEqual(emitted, ['Summary/Objective', 'Experience', 'Overall Resume Score'])
+
+        evaluations = parser.section_evaluations
+        self.assertEqual(evaluations['Summary/Objective'], {
+            'score': '7',
+            'strengths': ['Clear career goal'],
+            'improvements': ['Too generic'],
+            'recommendations': ['Tailor to the role'],
+        })
+        self.assertEqual(evaluations['Overall Resume Score']['score'], '7/10')
+
+    def test_improved_resume_sections_follow_headers(self):
+        content = (
+            "Here is the evaluation:\n"
+            "=== CHANGES MADE ===\n1. Added AWS\n2. [Second specific change]\n"
+            "=== IMPROVED RESUME ===\nJane Doe\nPython engineer\n\n"
+            "=== EXPLANATION ===\nMatches the role.\n"
+        )
+        improved, changes, _ = parse_improved_resume(content)
+        self.assertEqual(improved, 'Jane Doe\nPython engineer')
+        self.assertEqual(changes, ['Added AWS', 'Matches the role.'])
+
+    def test_improved_resume_evaluation_without_bold_markers(self):
+        content = (
+            "=== SECTION EVALUATION ===\n"
+            "Skills (Score: 6/10):\n- Strengths:\n  * Broad stack\n"
+            "Overall Resume Score: 6/10\n"
+            "=== CHANGES MADE ===\n1) Grouped skills\n"
+            "=== IMPROVED RESUME ===\nJane Doe\n"
+        )
+        improved, changes, evaluations = parse_improved_resume(content)
+        self.assertEqual(improved, 'Jane Doe')
+        self.assertEqual(changes, ['Grouped skills'])
+        self.assertEqual(evaluations['Skills']['strengths'], ['Broad stack'])
+        self.assertEqual(evaluations['Overall Resume Score']['score'], '6/10')
+
+
+class StructuredOutputTests(SimpleTestCase):
+    def test_json_evaluation_matches_text_parser(self):
+        text = parse_section_evaluations(FakeOllamaClient('', ['python']).section_evaluation)
+        self.assertEqual(parse_section_evaluations(section_evaluation_json(['python'])), text)
+
+    def test_json_improved_resume(self):
+        improved, changes, evaluations = parse_improved_resume(improved_resume_json('Jane Doe', ['python']))
+        self.assertEqual(improved, 'Jane Doe')
+        self.assertEqual(len(changes), 6)
+        self.assertEqual(evaluations['Overall Resume Score']['score'], '7/10')
+
+    def test_invalid_json_is_rejected(self):
+        for content in ('{"sections": [', '{"sections": {}, "overall_score": 7}',
+                        '{"sections": [{"name": "Skills", "score": 12}], "overall_score": 7}'):
+            with self.subTest(content=content), self.assertRaises(llm_output.LLMOutputError):
+                llm_output.decode_section_evaluations(content)
+
+    def test_stream_decoder_emits_sections_as_they_complete(self):
+        content = json.dumps({'sections': [
+            {'name': 'Skills', 'score': 8, 'strengths': ['Uses {braces} and "quotes"'],
+             'improvements': [], 'recommendations': []},
+            {'name': 'Education', 'score': 6, 'strengths': [], 'improvements': [], 'recommendations': []},
+        ], 'overall_score': 7})
+        decoder = llm_output.SectionStreamDecoder()
+        emitted = []
+        for start in range(0, len(content), 3):
+            emitted.extend(name for name, _ in decoder.feed(content[start:start + 3]))
+        self.assertEqual(emitted, ['Skills', 'Education'])
+        emitted.extend(name for name, _ in decoder.close())
+        self.assertEqual(emitted, ['Skills', 'Education', 'Overall Resume Score'])
+        self.assertEqual(decoder.section_evaluations['Skills']['strengths'], ['Uses {braces} and "quotes"'])
+
+
+@override_settings(LLM_DETERMINISTIC=True)
+class LLMCacheTests(TestCase):
+    def setUp(self):
+        llm_cache.clear()
+
+    def tearDown(self):
+        llm_cache.clear()
+
+    def test_key_ignores_whitespace_but_not_options(self):
+        key = llm_cache.make_cache_key('kind', 'Python  developer\n', 'Job', 1, 'llama3.1', {'temperature': 0})
+        same = llm_cache.make_cache_key('kind', 'Python developer', ' Job ', 1, 'llama3.1', {'temperature': 0})
+        other = llm_cache.make_cache_key('kind', 'Python developer', 'Job', 1, 'llama3.1', {'temperature': 0.7})
+        self.assertEqual(key, same)
+        self.assertNotEqual(key, other)
+
+    def test_persistent_tier_survives_memory_clear(self):
+        llm_cache.store('abc', 'cached response', kind='test', model_name='llama3.1')
+        llm_cache.clear()
+        self.assertEqual(llm_cache.get('abc'), 'cached response')
+        self.assertIsNone(llm_cache.get('missing'))
+
+    @override_settings(LLM_CACHE_MAX_BYTES=10, LLM_CACHE_EVICT_EVERY=1)
+    def test_size_limit_evicts_least_recently_used(self):
+        llm_cache.store('old', 'x' * 6)
+        llm_cache.store('new', 'y' * 6)
+        self.assertEqual(list(CachedLLMResponse.objects.values_list('key', flat=True)), ['new'])
+
+    @override_settings(LLM_CACHE_MAX_BYTES=10, LLM_CACHE_EVICT_EVERY=3)
+    def test_eviction_is_amortised_over_stores(self):
+        self.addCleanup(setattr, llm_cache, '_stores_since_evict', 0)
+        llm_cache._stores_since_evict = 0
+        with mock.patch.object(llm_cache, 'evict') as evict:
+            for n in range(7):
+                llm_cache.store(f'key{n}', 'response')
+        self.assertEqual(evict.call_count, 2)
+
+    @override_settings(LLM_DETERMINISTIC=False)
+    def test_sampled_responses_are_not_cached(self):
+        llm_cache.store('abc', 'one sample of many')
+        self.assertIsNone(llm_cache.get('abc'))
+        self.assertFalse(CachedLLMResponse.objects.exists())
+
+    @override_settings(LLM_CACHE_MEMORY_ENTRIES=1)
+    def test_memory_limit_is_read_from_current_settings(self):
+        llm_cache.store('first', 'one')
+        llm_cache.store('second', 'two')
+        self.assertEqual(llm_cache.cache_stats()['memory_entries'], 1)
+
+
+class PromptBudgetTests(SimpleTestCase):
+    def test_normalise_drops_noise_and_running_footers(self):
+        text = ('Jane  Doe\t\u200b\n\n\n\nPython developer\nPython developer\n'
+                'ACME Corp confidential\nPage 1 of 3\n-----\nExperience\n'
+                'ACME Corp confidential\nPage 2 of 3\nSkills\nACME Corp confidential')
+        self.assertEqual(
+            prompt_budget.normalise_text(text),
+            'Jane Doe\n\nPython developer\nACME Corp confidential\nExperience\nSkills',
+        )
+
+    def test_normalise_keeps_dates_and_numbers(self):
+        text = 'Experience\nAcme Corp\n2019\n05/2020\nProjects delivered:\n12\nEducation'
+        self.assertEqual(prompt_budget.normalise_text(text), text)
+
+    def test_normalise_keeps_headings_repeated_in_the_body(self):
+        jobs = [f'Engineer at Company {n}\nResponsibilities:\nBuilt service {n}.\nMentored team {n}.' for n in range(4)]
+        text = 'Jane Doe\nExperience\n' + '\n'.join(jobs) + '\nEducation\nBSc Computer Science'
+        self.assertEqual(prompt_budget.normalise_text(text), text)
+
+    def test_trim_drops_boilerplate_and_irrelevant_lines_first(self):
+        text = '\n'.join([
+            'Experience',
+            'Built Kubernetes operators in Go for the platform team.',
+            'Organised the office book club and quarterly social events.',
+            'Maintained Django services.',
+            'We are an equal opportunity employer and value diversity.',
+        ])
+        trimmed, removed = prompt_budget.trim_to_budget(text, 20, wanted_skills=['kubernetes'])
+        self.assertEqual(trimmed, 'Experience\nBuilt Kubernetes operators in Go for the platform team.')
+        self.assertEqual(removed, prompt_budget.estimate_tokens(text) - prompt_budget.estimate_tokens(trimmed))
+
+    @override_settings(LLM_CONTEXT_TOKENS=2500)
+    def test_prompts_fit_the_context_window(self):
+        resume = '\n'.join(f'Delivered project {i} using Python and SQL for reporting.' for i in range(300))
+        job = 'Python engineer\n' + 'Benefits include paid time off and a 401(k).\n' * 5
+
+        def build(resume_text, job_description):
+            return f'Resume:\n{resume_text}\nJob:\n{job_description}'
+
+        for kind in prompt_budget.OUTPUT_BUDGETS:
+            budgeted = prompt_budget.build_prompt(kind, build, resume, job)
+            self.assertLessEqual(budgeted.prompt_tokens + budgeted.num_predict, 2500)
+            self.assertEqual(budgeted.num_predict, prompt_budget.num_predict_for(
+                kind, prompt_budget.estimate_tokens(budgeted.resume_text)))
+            self.assertIn('Python engineer', budgeted.job_description)
+        self.assertIn('resume_llm_prompt_tokens_count{kind="improved_resume"}', metrics.render_metrics())
+
+
+class OllamaClientTests(SimpleTestCase):
+    def _response(self, status_code=200, lines=(), text=''):
+        response = mock.MagicMock(status_code=status_code, text=text)
+        response.iter_lines.return_value = [json.dumps(line).encode() for line in lines]
+        response.__enter__.return_value = response
+        return response
+
+    def test_generate_stream_yields_tokens_until_done(self):
+        client = OllamaClient(base_url='http://ollama.test')
+        response = self._response(lines=[
+            {'response': 'Skills ', 'done': False},
+            {'response': '(Score: 7/10)', 'done': False},
+            {'response': '', 'done': True},
+        ])
+        with mock.patch.object(client.session, 'post', return_value=response) as post:
+            self.assertEqual(''.join(client.generate_stream('prompt', {})), 'Skills (Score: 7/10)')
+        self.assertEqual(post.call_args.kwargs['timeout'], client.timeout)
+
+    def test_http_errors_raise_ollama_error(self):
+        client = OllamaClient(base_url='http://ollama.test')
+        response = self._response(status_code=500, text='model not found')
+        with mock.patch.object(client.session, 'post', return_value=response):
+            with self.assertRaisesMessage(OllamaError, 'model not found'):
+                client.generate('prompt', {})
+
+
+class FakeOllamaServerTests(SimpleTestCase):
+    def setUp(self):
+        handler = type('Handler', (FakeOllamaHandler,), {'quiet': True, 'tokens_per_second': 0})
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.client = OllamaClient(base_url=f'http://127.0.0.1:{self.server.server_port}')
+
+    def test_stream_and_non_stream_responses_parse(self):
+        prompt = build_section_evaluation_prompt('Python and Kubernetes engineer', 'Python role')
+        full = self.client.generate(prompt, {})
+        self.assertEqual(''.join(self.client.generate_stream(prompt, {})), full)
+        evaluations = parse_section_evaluations(full)
+        self.assertEqual(evaluations['Experience']['score'], '7')
+        self.assertRegex(evaluations['Experience']['strengths'][0], 'python|kubernetes')
+
+    def test_format_requests_get_json(self):
+        prompt = services.build_structured_section_evaluation_prompt('Python engineer', 'Python role')
+        full = self.client.generate(prompt, {}, format=llm_output.SECTION_EVALUATION_SCHEMA)
+        self.assertEqual(parse_section_evaluations(full)['Experience']['strengths'][0],
+                         'Clear description of python experience')
+
+
+class JobQueueTests(TestCase):
+    def test_jobs_are_claimed_once_in_order(self):
+        first = jobs.enqueue(jobs.JOB_IMPROVE_RESUME, {'n': 1})
+        second = jobs.enqueue(jobs.JOB_IMPROVE_RESUME, {'n': 2})
+
+        self.assertEqual(jobs.claim_next_job().pk, first.pk)
+        self.assertEqual(jobs.claim_next_job().pk, second.pk)
+        self.assertIsNone(jobs.claim_next_job())
+
+    def test_run_job_records_result_and_errors(self):
+        jobs.enqueue(jobs.JOB_IMPROVE_RESUME, {'resume_text': 'r', 'job_description': 'j'})
+        jobs.enqueue(jobs.JOB_IMPROVE_RESUME, {'resume_text': 'r', 'job_description': 'j'})
+
+        with mock.patch('ml_model.services.improve_resume', side_effect=[{'resume_text': 'better'}, {'error': 'LLM down'}]):
+            succeeded = jobs.run_job(jobs.claim_next_job())
+            failed = jobs.run_job(jobs.claim_next_job())
+
+        self.assertEqual((succeeded.status, succeeded.result), (Job.STATUS_SUCCEEDED, {'resume_text': 'better'}))
+        self.assertEqual((failed.status, failed.error), (Job.STATUS_FAILED, 'LLM down'))
+
+    def test_job_urls_use_unguessable_tokens(self):
+        job = jobs.enqueue(jobs.JOB_IMPROVE_RESUME, {'resume_text': 'r', 'job_description': 'j'})
+        self.assertEqual(self.client.get(f'/jobs/{job.pk}/status/').status_code, 404)
+        response = self.client.get(reverse('job_status', args=[job.token]))
+        self.assertEqual(response.json()['job_id'], str(job.token))
+        self.assertEqual(response.json()['result_url'], f'/jobs/{job.token}/')
+
+    def test_worker_requeues_stale_jobs(self):
+        job = jobs.enqueue(jobs.JOB_IMPROVE_RESUME, {'resume_text': 'r', 'job_description': 'j'})
+        Job.objects.filter(pk=job.pk).update(
+            status=Job.STATUS_RUNNING, started_at=timezone.now() - timedelta(hours=2)
+        )
+        with mock.patch('ml_model.management.commands.run_job_worker.claim_next_job', return_value=None):
+            call_command('run_job_worker', once=True, stdout=io.StringIO())
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.started_at), (Job.STATUS_PENDING, None))
+
+
+class FixedProbabilityModel:
+    """Stand-in for the pipeline: probability of a hire is 0.5 for every row."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def predict_proba(self, features):
+        self.calls += 1
+        return np.tile([0.5, 0.5], (len(features), 1))
+
+
+class PredictResumeMatchesTests(SimpleTestCase):
+    def test_batch_matches_single_predictions_with_one_model_call(self):
+        model = FixedProbabilityModel()
+        resumes = ['Python and AWS', 'Java only', 'No skills here']
+        job = 'Python, AWS and Kubernetes'
+
+        batch = predict_resume_matches(resumes, job, model)
+        self.assertEqual(model.calls, 1)
+
+        singles = [predict_resume_match(resume, job, model) for resume in resumes]
+        np.testing.assert_allclose(batch, singles)
+        np.testing.assert_allclose(batch, [(0.5 + 2 / 3) / 2, 0.25, 0.25])
+
+    def test_one_job_description_per_resume(self):
+        model = FixedProbabilityModel()
+        batch = predict_resume_matches(['Python', 'Python'], ['Python', 'Java'], model)
+        np.testing.assert_allclose(batch, [0.75, 0.25])
+
+
+class SkillSearchTests(TestCase):
+    def setUp(self):
+        patcher = mock.patch.object(search, '_index', search.SkillIndex())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_boolean_queries(self):
+        python_aws = search.store_resume('a.pdf', 'text', ['python', 'aws'])
+        python_k8s = search.store_resume('b.pdf', 'text', ['python', 'kubernetes'])
+        java = search.store_resume('c.pdf', 'text', ['java', 'aws'])
+
+        def ids(query):
+            return list(search.search_resumes(query))
+
+        self.assertEqual(ids('python AND aws'), [python_aws.pk])
+        self.assertEqual(ids('Python AND (k8s OR aws)'), [python_k8s.pk, python_aws.pk])
+        self.assertEqual(ids('aws NOT python'), [java.pk])
+        self.assertEqual(ids('golang'), [])
+
+    def test_deleted_resumes_are_excluded(self):
+        resume = search.store_resume('a.pdf', 'text', ['python'])
+        search.get_skill_index().sync()
+        resume.delete()
+        self.assertEqual(list(search.search_resumes('python')), [])
+
+    def _store_as(self, resume_id, skills):
+        # Stand-in for a resume another worker committed
+        resume = StoredResume.objects.create(pk=resume_id, name=f'{resume_id}.pdf', text='text', skills=skills)
+        SkillPosting.objects.bulk_create(SkillPosting(skill=skill, resume=resume) for skill in skills)
+        return resume
+
+    def _indexed(self, query):
+        # Search the index as it is, without syncing it first
+        return list(search.get_skill_index(sync=False).search(search.parse_query(query)))
+
+    def test_stored_resume_is_added_on_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            resume = search.store_resume('a.pdf', 'text', ['python'])
+        self.assertEqual(self._indexed('python'), [resume.pk])
+
+    def test_out_of_order_commits(self):
+        self._store_as(102, ['python'])
+        search.get_skill_index().sync()
+        # 101 commits after 102 was loaded: a later sync still finds it
+        self._store_as(101, ['python', 'aws'])
+        search.get_skill_index().sync()
+        # ... and so does this process's on-commit add, below the highest id
+        search.get_skill_index(sync=False).add(100, {'python'})
+        self.assertEqual(self._indexed('python'), [100, 101, 102])
+        self.assertEqual(self._indexed('python AND aws'), [101])
+        self.assertEqual(self._indexed('python NOT aws'), [100, 102])
+        self.assertEqual(list(search.search_resumes('python')), [102, 101, 100])
+
+    def test_search_view_requires_permission(self):
+        url = reverse('search_resumes') + '?q=python'
+        self.assertEqual(self.client.get(url).status_code, 403)
+        user = User.objects.create_user('recruiter', password='secret')
+        user.user_permissions.add(Permission.objects.get(codename='view_storedresume'))
+        self.client.force_login(user)
+        self.assertEqual(self.client.get(url).status_code, 200)
+
+    def test_malformed_queries(self):
+        for query in ['', 'python AND', '(python', 'python)']:
+            with self.assertRaises(search.QueryError):
+                search.parse_query(query)
+
+
+class MetricsTests(SimpleTestCase):
+    def setUp(self):
+        metrics.STAGE_SECONDS.clear()
+
+    def test_stage_timer_records_histogram(self):
+        with metrics.stage_timer('parse'):
+            pass
+
+        @metrics.stage_timer('render')
+        def render():
+            return 'done'
+
+        self.assertEqual(render(), 'done')
+        self.assertEqual(render(), 'done')
+        snapshot = metrics.STAGE_SECONDS.snapshot()
+        self.assertEqual(sum(snapshot['parse']['counts']), 1)
+        self.assertEqual(sum(snapshot['render']['counts']), 2)
+
+    def test_improved_resume_parse_is_timed_once(self):
+        parse_improved_resume(
+            "=== SECTION EVALUATION ===\nSkills (Score: 6/10):\n- Strengths:\n  * Broad stack\n"
+            "=== IMPROVED RESUME ===\nJane Doe\n"
+        )
+        self.assertEqual(sum(metrics.STAGE_SECONDS.snapshot()['llm_parse']['counts']), 1)
+
+    def test_metrics_endpoint(self):
+        metrics.STAGE_SECONDS.observe('predict_proba', 0.003)
+        response = self.client.get(reverse('metrics'))
+        self.assertEqual(response.status_code, 200)
+        body = response.content.decode()
+        self.assertIn('resume_stage_duration_seconds_bucket{stage="predict_proba",le="0.0025"} 0', body)
+        self.assertIn('resume_stage_duration_seconds_bucket{stage="predict_proba",le="0.005"} 1', body)
+        self.assertIn('resume_stage_duration_seconds_count{stage="predict_proba"} 1', body)
+        self.assertIn('resume_model_registry_loads ', body)
+        self.assertIn('resume_parse_cache_misses ', body)
+
+
+class BenchmarkPipelineTests(TestCase):
+    def test_writes_results_for_every_stage(self):
+        output = os.path.join(tempfile.mkdtemp(), 'results.json')
+        call_command(
+            'benchmark_pipeline', pages=[1], jd_words=[50], repeat=1, train_rows=100,
+            output=output, stdout=io.StringIO(),
+        )
+        with open(output) as f:
+            report = json.load(f)
+        self.assertEqual(
+            {result['stage'] for result in report['results']},
+            {'parse_resume', 'extract_skills_from_text', 'predict_resume_match', 'analyze_keywords',
+             'parse_section_evaluations', 'parse_improved_resume', 'parse_section_evaluations_json',
+             'parse_improved_resume_json', 'predict_resume_success', 'generate_improved_resume'},
+        )
+
+
+class ScreenResumesTests(SimpleTestCase):
+    def _screen(self, count, **options):
+        directory = tempfile.mkdtemp()
+        for n in range(count):
+            with open(os.path.join(directory, f'resume{n}.txt'), 'w') as f:
+                f.write('Python and Django developer')
+        jd_path = os.path.join(directory, 'jd.text')
+        with open(jd_path, 'w') as f:
+            f.write('Python developer')
+        output = os.path.join(directory, 'results.jsonl')
+        with mock.patch.object(screen_resumes, 'ProcessPoolExecutor', ThreadPoolExecutor), \
+                mock.patch.object(screen_resumes, 'get_active_model', return_value=('model', object())), \
+                mock.patch.object(screen_resumes, 'predict_resume_matches',
+                                  side_effect=lambda strings, *args, **kwargs: [0.5] * len(strings)) as predict:
+            call_command('screen_resumes', directory, jd=jd_path, output=output, workers=1, stderr=io.StringIO(),
+                         **options)
+        with open(output) as f:
+            self.assertEqual(len(f.readlines()), count)
+        return [len(call.args[0]) for call in predict.call_args_list]
+
+    def test_results_are_written_every_flush_rows(self):
+        self.assertEqual(self._screen(5, flush_every=2, flush_interval=60), [2, 2, 1])
+
+    def test_results_are_written_after_flush_interval(self):
+        self.assertEqual(self._screen(3, flush_every=100, flush_interval=0), [1, 1, 1])
+
+
+class ModelSearchTests(TestCase):
+    def test_search_registers_winner_and_writes_report(self):
+        tmpdir = tempfile.mkdtemp()
+        grid_path = os.path.join(tmpdir, 'grid.json')
+        report_path = os.path.join(tmpdir, 'report.json')
+        with open(grid_path, 'w') as f:
+            json.dump({
+                'tfidf__ngram_range': [[1, 1], [1, 2]],
+                'classifier__n_estimators': [5, 10],
+                'classifier__max_depth': [4],
+            }, f)
+        with override_settings(MEDIA_ROOT=tmpdir):
+            call_command('train_resume_model', search='grid', param_grid=grid_path, cv=2, n_jobs=2,
+                         report=report_path, stdout=io.StringIO())
+            record = ResumePredictor.objects.get()
+            model = record.get_model()
+
+        with open(report_path) as f:
+            report = json.load(f)
+        self.assertEqual(report['candidates'], 4)
+        self.assertEqual(report['classifier_fits'], 8)
+        # One TF-IDF fit per distinct TF-IDF setting and fold, shared by the classifiers
+        self.assertEqual(report['feature_fits'], 4)
+        self.assertEqual([result['rank'] for result in report['results']], [1, 2, 3, 4])
+        self.assertEqual(report['best_params'], report['results'][0]['params'])
+        self.assertTrue(record.is_active)
+        self.assertEqual(record.accuracy, report['holdout_accuracy'])
+        self.assertEqual(model.named_steps['classifier'].n_estimators, report['best_params']['classifier__n_estimators'])
+        self.assertIsNone(model.named_steps['classifier'].n_jobs)
+
+
+    def test_reserved_classifier_params_are_rejected(self):
+        for name in ('classifier__random_state', 'classifier__n_jobs'):
+            with self.assertRaisesMessage(ValueError, f'{name} cannot be searched'):
+                load_param_grid({name: [1, 2]})
+
+
+class ModelSelectionTests(TestCase):
+    def test_selection_registers_best_model_within_budget(self):
+        tmpdir = tempfile.mkdtemp()
+        report_path = os.path.join(tmpdir, 'report.json')
+        with override_settings(MEDIA_ROOT=tmpdir):
+            with self.assertRaisesMessage(CommandError, 'No model family fits'):
+                call_command('train_resume_model', select=True, families=['logistic_regression'],
+                             max_latency_ms=0, stdout=io.StringIO())
+            self.assertFalse(ResumePredictor.objects.exists())
+
+            call_command('train_resume_model', select=True, families=['small_forest', 'logistic_regression'],
+                         max_latency_ms=1000, max_memory_mb=100, report=report_path, stdout=io.StringIO())
+            record = ResumePredictor.objects.get()
+            self.assertIsNotNone(record.get_model())
+
+        with open(report_path) as f:
+            candidates = json.load(f)['candidates']
+        selected = [candidate for candidate in candidates if candidate['selected']]
+        self.assertEqual(len(selected), 1)
+        self.assertEqual(selected[0]['accuracy'], max(candidate['accuracy'] for candidate in candidates))
+        self.assertEqual(record.family, selected[0]['family'])
+        self.assertEqual(record.latency_p95_ms, selected[0]['latency_p95_ms'])
+        self.assertGreater(record.artifact_size, 0)
+        self.assertLessEqual(record.latency_p50_ms, record.latency_p99_ms)
+
+
+class StreamingTrainTests(TestCase):
+    def test_streaming_model_is_a_regular_predictor(self):
+        tmpdir = tempfile.mkdtemp()
+        report_path = os.path.join(tmpdir, 'report.json')
+        with override_settings(MEDIA_ROOT=tmpdir):
+            call_command('train_resume_model', streaming=True, chunk_size=128, epochs=2, hash_features=2 ** 12,
+                         report=report_path, stdout=io.StringIO())
+            record = ResumePredictor.objects.get()
+            model = record.get_model()
+
+        with open(report_path) as f:
+            report = json.load(f)
+        self.assertEqual(report['rows'], 1000)
+        self.assertEqual(report['holdout_rows'], 200)
+        self.assertEqual(report['trained_rows'], 2 * 800)
+        self.assertGreater(report['peak_memory_bytes'], 0)
+        self.assertGreater(report['rows_per_second'], 0)
+        self.assertEqual(record.family, 'sgd_hashing')
+        self.assertEqual(record.accuracy, report['accuracy'])
+        probability = predict_resume_match('Python and SQL developer', 'Python role', model)
+        self.assertTrue(0 <= probability <= 1)
+
+
+@override_settings(LLM_CACHE_ENABLED=False)
+class ImproveResumeTests(SimpleTestCase):
+    def test_improve_flow_makes_a_single_llm_call(self):
+        client = FakeOllamaClient('Improved Python and AWS resume', ['python', 'aws'])
+        with mock.patch.object(services, 'get_ollama_client', return_value=client), \
+                mock.patch.object(services, 'get_active_model', return_value=(object(), FixedProbabilityModel())):
+            result = services.improve_resume('Python resume', 'Python and AWS role')
+
+        self.assertEqual(client.calls, 1)
+        self.assertEqual(result['resume_text'], 'Improved Python and AWS resume')
+        self.assertEqual(result['prediction']['skills_found'], ['python', 'aws'])
+        self.assertIn('Experience', result['section_evaluations'])
+
+    @override_settings(LLM_STRUCTURED_OUTPUT=False)
+    def test_improve_flow_with_text_output(self):
+        self.test_improve_flow_makes_a_single_llm_call()
@@ -9,7 +9,8 @@ from sklearn.compose import ColumnTransformer
 import joblib
 import os
 from django.conf import settings
-from .utils import extract_skills_from_text
+from .metrics import stage_timer
+from .utils import extract_skills
 
 def preprocess_data(df):
     """Preprocess the dataset for training."""
@@ -37,72 +38,159 @@ def preprocess_data(df):
     
     return features, df['Target']
 
-def train_model(dataset_path):
-    """Train the model using the dataset."""
-    # Load and preprocess data
-    df = pd.read_csv(dataset_path)
-    X, y = preprocess_data(df)
-    
-    # Split data
-    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
-    
-    # Create preprocessing steps
-    text_features = ['skills']
-    numeric_features = ['experience', 'projects', 'salary']
-    
-    # Create column transformer
-    preprocessor = ColumnTransformer(
+NUMERIC_FEATURES = ['experience', 'projects', 'salary']
+MODEL_FILENAME = 'resume_predictor.joblib'
+
+def build_preprocessor(tfidf_params=None, dense=False):
+    """
+    Skills TF-IDF plus scaled numeric features, as fed to the classifier.
+    ``dense`` forces a dense matrix for classifiers without sparse support.
+    """
+    return ColumnTransformer(
         transformers=[
-            ('text', TfidfVectorizer(max_features=1000), 'skills'),
-            ('num', StandardScaler(), numeric_features)
-        ])
-    
-    # Create pipeline
+            ('text', TfidfVectorizer(**{'max_features': 1000, **(tfidf_params or {})}), 'skills'),
+            ('num', StandardScaler(), NUMERIC_FEATURES)
+        ],
+        sparse_threshold=0 if dense else 0.3)
+
+def build_classifier(classifier_params=None, random_state=42, n_jobs=None):
+    return RandomForestClassifier(
+        **{'n_estimators': 100, **(classifier_params or {})}, random_state=random_state, n_jobs=n_jobs
+    )
+
+def fit_pipeline(X, y, tfidf_params=None, classifier_params=None, random_state=42, n_jobs=-1):
+    """
+    Fit the preprocessing + classifier pipeline.
+
+    The forest is grown on ``n_jobs`` cores (all by default), then switched
+    back to single-threaded prediction, which is faster for the small
+    batches the views score.
+    """
+    return fit_classifier_pipeline(
+        X, y, build_classifier(classifier_params, random_state, n_jobs), tfidf_params
+    )
+
+def fit_classifier_pipeline(X, y, classifier, tfidf_params=None, dense=False):
+    """Fit ``classifier`` behind the standard preprocessor; see ``fit_pipeline``."""
     pipeline = Pipeline([
-        ('preprocessor', preprocessor),
-        ('classifier', RandomForestClassifier(n_estimators=100, random_state=42))
+        ('preprocessor', build_preprocessor(tfidf_params, dense)),
+        ('classifier', classifier)
     ])
+    pipeline.fit(X, y)
+    if 'n_jobs' in classifier.get_params():
+        pipeline.set_params(classifier__n_jobs=None)
+    return pipeline
+
+def fit_model(df, random_state=42):
+    """Train and evaluate a model on a dataset frame; returns ``(pipeline, accuracy)``."""
+    X, y = preprocess_data(df)
+    
+    # Split data
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=random_state)
     
     # Train model
-    pipeline.fit(X_train, y_train)
+    pipeline = fit_pipeline(X_train, y_train, random_state=random_state)
     
     # Calculate accuracy
     accuracy = pipeline.score(X_test, y_test)
-    
-    # Save model
+    return pipeline, accuracy
+
+def artifact_compression():
+    """joblib compression level for model artifacts (0 disables compression)."""
+    return getattr(settings, 'ML_MODEL_ARTIFACT_COMPRESSION', 3)
+
+def save_model(pipeline, filename=MODEL_FILENAME):
+    """Write a fitted pipeline under MEDIA_ROOT/ml_models and return its path."""
     model_dir = os.path.join(settings.MEDIA_ROOT, 'ml_models')
     os.makedirs(model_dir, exist_ok=True)
-    model_path = os.path.join(model_dir, 'resume_predictor.joblib')
-    joblib.dump(pipeline, model_path)
+    model_path = os.path.join(model_dir, filename)
+    joblib.dump(pipeline, model_path, compress=artifact_compression())
+    return model_path
+
+def train_model(dataset_path):
+    """Train the model using the dataset."""
+    # Load and preprocess data
+    df = pd.read_csv(dataset_path)
+    pipeline, accuracy = fit_model(df)
+    
+    # Save model
+    model_path = save_model(pipeline)
     
     return accuracy, model_path
 
-def predict_resume_match(resume_text, job_description, model):
-    """Predict if a resume matches a job description."""
-    # Extract skills from both resume and job description
-    resume_skills = extract_skills_from_text(resume_text)
-    job_skills = extract_skills_from_text(job_description)
-    
-    # Calculate skill match percentage
-    resume_skill_list = set(resume_skills.lower().split(', '))
-    job_skill_list = set(job_skills.lower().split(', '))
+def predict_resume_matches(resume_texts, job_descriptions, model, resume_skills=None, job_skills=None):
+    """
+    Predict match probabilities for a batch of resumes.
+
+    ``job_descriptions`` is either one job description shared by every
+    resume or a list with one job description per resume. Skills may be
+    passed pre-extracted: ``resume_skills`` as one list of skill ids per
+    resume, ``job_skills`` as one list (shared job description) or one list
+    per resume. The feature frame is built once and ``predict_proba`` is
+    called once. Returns a numpy array of probabilities in input order.
+    """
+    count = len(resume_texts)
+    if count == 0:
+        return np.zeros(0)
+    shared_job = isinstance(job_descriptions, str)
+    
+    # Extract skills from both resumes and job descriptions
+    if resume_skills is None:
+        resume_skills = [extract_skills(text) for text in resume_texts]
+    if job_skills is None:
+        if shared_job:
+            job_skills = extract_skills(job_descriptions)
+        else:
+            # Many pairs usually share a handful of job descriptions
+            extracted = {jd: extract_skills(jd) for jd in set(job_descriptions)}
+            job_skills = [extracted[jd] for jd in job_descriptions]
+    
+    # One-hot skill matrices over the skills seen in this batch
+    job_skill_lists = [job_skills] if shared_job else job_skills
+    vocabulary = {}
+    for skills in (*resume_skills, *job_skill_lists):
+        for skill in skills:
+            vocabulary.setdefault(skill, len(vocabulary))
+    
+    def skill_matrix(skill_lists):
+        matrix = np.zeros((len(skill_lists), max(len(vocabulary), 1)), dtype=bool)
+        for row, skills in enumerate(skill_lists):
+            matrix[row, [vocabulary[skill] for skill in skills]] = True
+        return matrix
+    
+    resume_matrix = skill_matrix(resume_skills)
+    job_matrix = skill_matrix(job_skill_lists)
     
     # Calculate how many required skills are present
-    matching_skills = resume_skill_list.intersection(job_skill_list)
-    skill_match_ratio = len(matching_skills) / len(job_skill_list) if job_skill_list else 0
+    required = job_matrix.sum(axis=1)
+    matched = (resume_matrix & job_matrix).sum(axis=1)
+    skill_match_ratio = np.divide(matched, required, out=np.zeros(count), where=required > 0)
     
     # Preprocess input
     features = pd.DataFrame({
-        'skills': [resume_skills],
-        'experience': [len(resume_text.split()) / 100],  # Rough estimate based on text length
-        'projects': [resume_text.lower().count('project')],  # Count project mentions
-        'salary': [0]  # This would need to be extracted from the resume
+        'skills': [', '.join(skills) for skills in resume_skills],
+        'experience': [len(text.split()) / 100 for text in resume_texts],  # Rough estimate based on text length
+        'projects': [text.lower().count('project') for text in resume_texts],  # Count project mentions
+        'salary': np.zeros(count)  # This would need to be extracted from the resume
     })
     
     # Make prediction
-    prediction = model.predict_proba(features)[0]
+    with stage_timer('predict_proba'):
+        predictions = model.predict_proba(features)[:, 1]
     
     # Combine model prediction with skill match ratio
-    final_probability = (prediction[1] + skill_match_ratio) / 2
-    
-    return final_probability  # Return combined probability 
\ No newline at end of file
+    return (predictions + skill_match_ratio) / 2
+
+def predict_resume_match(resume_text, job_description, model, resume_skills=None, job_skills=None):
+    """
+    Predict if a resume matches a job description.
+
+    ``resume_skills`` and ``job_skills`` may be passed as lists of canonical
+    skill ids when the caller has already extracted them.
+    """
+    probabilities = predict_resume_matches(
+        [resume_text], job_description, model,
+        resume_skills=None if resume_skills is None else [resume_skills],
+        job_skills=job_skills
+    )
+    return float(probabilities[0])  # Return combined probability
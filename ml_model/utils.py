@@ -1,28 +1,122 @@
+import hashlib
+import json
+import os
 import re
+import threading
+
+from django.conf import settings
+
+from .metrics import stage_timer
+
+# A seed list of about 120 skills covering the training dataset, not a full
+# taxonomy. For production, point SKILL_TAXONOMY_PATH at a complete taxonomy
+# (several thousand skills, e.g. converted from ESCO or O*NET) in the same
+# format, or add skills and synonyms to this file. The compiled matcher scans
+# in one pass whatever the taxonomy size.
+DEFAULT_SKILL_TAXONOMY_PATH = os.path.join(os.path.dirname(__file__), 'data', 'skills.json')
+
+
+def load_skill_taxonomy(path):
+    """
+    Load a skill taxonomy from a JSON file.
+
+    The file maps each canonical skill id to a list of synonyms, e.g.
+    ``{"kubernetes": ["k8s"]}``. Returns an ordered list of canonical ids and
+    a dict mapping every lowercase surface form (including the id itself) to
+    its canonical id. A synonym listed under two ids keeps the first.
+
+    Changing the taxonomy changes ``SkillMatcher.version``, so cached parses
+    re-extract their skills; retrain the model if new ids should become
+    features.
+    """
+    with open(path, 'r', encoding='utf-8') as file:
+        taxonomy = json.load(file)
+
+    skill_ids = []
+    aliases = {}
+    for skill_id, synonyms in taxonomy.items():
+        skill_id = skill_id.strip().lower()
+        skill_ids.append(skill_id)
+        for term in [skill_id, *synonyms]:
+            term = ' '.join(term.lower().split())
+            if term:
+                aliases.setdefault(term, skill_id)
+    return skill_ids, aliases
+
+
+def _trie_to_regex(node):
+    """Render a character trie as a regex so shared prefixes are matched once."""
+    branches = []
+    for char in sorted(key for key in node if key):
+        # Any run of whitespace inside a multi-word skill matches a single space
+        token = r'\s+' if char == ' ' else re.escape(char)
+        branches.append(token + _trie_to_regex(node[char]))
+
+    if not branches:
+        return ''
+    pattern = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+    if '' in node:
+        pattern = '(?:' + pattern + ')?'
+    return pattern
+
+
+class SkillMatcher:
+    """Single-pass matcher for a skill taxonomy with synonyms."""
+
+    def __init__(self, skill_ids, aliases):
+        self.skill_ids = list(skill_ids)
+        self.aliases = dict(aliases)
+        self._order = {skill_id: index for index, skill_id in enumerate(self.skill_ids)}
+
+        trie = {}
+        for term in self.aliases:
+            node = trie
+            for char in term:
+                node = node.setdefault(char, {})
+            node[''] = {}
+
+        # Lookarounds instead of \b so terms ending in symbols (c++, c#) still match
+        self.pattern = re.compile(r'(?<!\w)(' + _trie_to_regex(trie) + r')(?!\w)')
+
+        # Changes whenever the taxonomy does, so results cached elsewhere can be revalidated
+        taxonomy = json.dumps([self.skill_ids, sorted(self.aliases.items())])
+        self.version = hashlib.sha256(taxonomy.encode('utf-8')).hexdigest()[:16]
+
+    @classmethod
+    def from_file(cls, path):
+        return cls(*load_skill_taxonomy(path))
+
+    def find(self, text):
+        """Return the canonical ids of all skills in ``text``, in taxonomy order."""
+        found = set()
+        for match in self.pattern.finditer(text.lower()):
+            term = ' '.join(match.group(1).split())
+            found.add(self.aliases[term])
+        return sorted(found, key=self._order.__getitem__)
+
+
+_matcher = None
+_matcher_lock = threading.Lock()
+
+
+def get_skill_matcher():
+    """Return the process-wide SkillMatcher, compiling it on first use."""
+    global _matcher
+    if _matcher is None:
+        with _matcher_lock:
+            if _matcher is None:
+                path = getattr(settings, 'SKILL_TAXONOMY_PATH', DEFAULT_SKILL_TAXONOMY_PATH)
+                _matcher = SkillMatcher.from_file(path)
+    return _matcher
+
+
+def extract_skills(text):
+    """Extract canonical skill ids from text."""
+    matcher = get_skill_matcher()
+    with stage_timer('skill_extraction'):
+        return matcher.find(text)
+
 
 def extract_skills_from_text(text):
-    """Extract skills from text using common patterns."""
-    # Common programming languages and technologies
-    common_skills = [
-        'python', 'java', 'javascript', 'c++', 'c#', 'ruby', 'php',
-        'html', 'css', 'sql', 'nosql', 'mongodb', 'postgresql', 'mysql',
-        'aws', 'azure', 'gcp', 'docker', 'kubernetes', 'react', 'angular',
-        'vue', 'node', 'django', 'flask', 'spring', 'tensorflow', 'pytorch',
-        'machine learning', 'deep learning', 'ai', 'artificial intelligence',
-        'data science', 'big data', 'hadoop', 'spark', 'scala', 'r',
-        'git', 'agile', 'scrum', 'devops', 'ci/cd', 'jenkins', 'linux',
-        'unix', 'windows', 'macos', 'ios', 'android', 'mobile development',
-        'web development', 'frontend', 'backend', 'full stack', 'cloud',
-        'security', 'cybersecurity', 'networking', 'blockchain', 'iot'
-    ]
-    
-    # Convert text to lowercase for case-insensitive matching
-    text_lower = text.lower()
-    
-    # Find all skills in the text
-    found_skills = []
-    for skill in common_skills:
-        if re.search(r'\b' + re.escape(skill) + r'\b', text_lower):
-            found_skills.append(skill)
-    
-    return ', '.join(found_skills) 
\ No newline at end of file
+    """Extract skills from text as a comma-separated string (model feature format)."""
+    return ', '.join(extract_skills(text))
@@ -0,0 +1,260 @@
+import logging
+import os
+import threading
+import time
+
+from django.conf import settings
+from django.db import connection, connections
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LLM_CHECK_INTERVAL = 10.0
+DEFAULT_ATTEMPTS = 5
+DEFAULT_RETRY_BACKOFF = 1.0
+MAX_RETRY_DELAY = 30.0
+WARM_UP_RESUME = 'Python developer with Django, SQL and AWS experience. Delivered 3 projects.'
+WARM_UP_JOB = 'Backend engineer: Python, Django, SQL, AWS.'
+
+STATUS_PENDING = 'pending'
+STATUS_RUNNING = 'running'
+STATUS_READY = 'ready'
+STATUS_FAILED = 'failed'
+STATUS_DISABLED = 'disabled'
+
+_lock = threading.Lock()
+_state = {
+    'status': STATUS_PENDING,
+    'started_at': None,
+    'duration': None,
+    'steps': {},
+    'error': None,
+}
+# Process that started warm-up; a forked child has a different pid and warms up again
+_started_pid = None
+# Name -> callable run by warm_up(), in registration order
+_steps = {}
+
+_llm_lock = threading.Lock()
+_llm = {
+    'checked_at': None,
+    'reachable': None,
+    'error': None,
+}
+_llm_checking = False
+
+
+def register_warm_up(name, step):
+    """
+    Run ``step()`` during warm-up, after the steps registered before it.
+    Apps register their own steps from ``AppConfig.ready()``.
+    """
+    _steps[name] = step
+
+
+def _load_urlconf():
+    # Resolving the URLconf imports every view module
+    from django.urls import get_resolver
+    get_resolver().url_patterns
+
+
+def _check_database():
+    # Request threads open their own connections; this proves the database
+    # is reachable and warms DNS and server-side authentication
+    connection.ensure_connection()
+
+
+def _compile_skill_matcher():
+    from .utils import get_skill_matcher
+    get_skill_matcher()
+
+
+def _load_model():
+    # Request modules import train_model (pandas, scikit-learn) lazily; load it here
+    from .registry import get_active_model
+    from .train_model import predict_resume_match
+    record, model = get_active_model()
+    if model is not None:
+        # The first predict_proba call pays for lazy initialisation inside sklearn
+        predict_resume_match(WARM_UP_RESUME, WARM_UP_JOB, model)
+
+
+def _create_llm_client():
+    # Imports requests and builds the pooled session; no request is sent
+    from .ollama import get_ollama_client
+    get_ollama_client()
+
+
+register_warm_up('url_conf', _load_urlconf)
+register_warm_up('database', _check_database)
+register_warm_up('skill_matcher', _compile_skill_matcher)
+register_warm_up('model', _load_model)
+register_warm_up('llm_client', _create_llm_client)
+
+
+def warm_up_enabled():
+    return getattr(settings, 'ML_MODEL_WARM_UP', True)
+
+
+def _run_step(name, step):
+    """
+    Run ``step``, retrying with exponential backoff (a database or file
+    share that is briefly unavailable at boot); re-raises the last error.
+    """
+    attempts = max(1, getattr(settings, 'ML_MODEL_WARM_UP_ATTEMPTS', DEFAULT_ATTEMPTS))
+    backoff = getattr(settings, 'ML_MODEL_WARM_UP_RETRY_BACKOFF', DEFAULT_RETRY_BACKOFF)
+    for attempt in range(1, attempts + 1):
+        try:
+            return step()
+        except Exception as e:
+            if attempt == attempts:
+                raise
+            delay = min(backoff * 2 ** (attempt - 1), MAX_RETRY_DELAY)
+            logger.warning("Warm-up step %r failed (attempt %d of %d), retrying in %.1fs: %s",
+                           name, attempt, attempts, delay, e)
+            with _lock:
+                _state['error'] = f'{name}: {str(e)}'
+            time.sleep(delay)
+
+
+def warm_up():
+    """
+    Run every registered warm-up step in the calling thread.
+
+    Each step is retried up to ML_MODEL_WARM_UP_ATTEMPTS times; a step that
+    still fails marks warm-up as failed and stops it, and the process stays
+    not-ready until it is restarted.
+    """
+    with _lock:
+        if _state['status'] != STATUS_PENDING:
+            return
+        _state['status'] = STATUS_RUNNING
+        _state['started_at'] = time.time()
+    start = time.perf_counter()
+    step_times = {}
+    try:
+        for name, step in list(_steps.items()):
+            step_start = time.perf_counter()
+            _run_step(name, step)
+            step_times[name] = round(time.perf_counter() - step_start, 4)
+    except Exception as e:
+        logger.exception("Warm-up step %r failed", name)
+        status, error = STATUS_FAILED, f'{name}: {str(e)}'
+    else:
+        status, error = STATUS_READY, None
+    duration = time.perf_counter() - start
+    with _lock:
+        _state.update(status=status, duration=round(duration, 4), steps=step_times, error=error)
+    logger.info("Warm-up %s in %.2fs %s", status, duration, step_times)
+
+
+def start():
+    """
+    Warm the process up in a background thread so ``/healthz/ready`` can
+    report progress meanwhile. Does nothing when ML_MODEL_WARM_UP is off or
+    warm-up was already started in this process.
+    """
+    global _started_pid
+    pid = os.getpid()
+    if _started_pid == pid or not warm_up_enabled():
+        return
+    with _lock:
+        if _started_pid == pid:
+            return
+        _started_pid = pid
+        if _state['status'] != STATUS_PENDING:
+            return
+    threading.Thread(target=_warm_up_in_background, daemon=True, name='warm-up').start()
+
+
+def wsgi_application(application):
+    """
+    Wrap a WSGI application so that each process starts warming up on the
+    first request it handles (normally the load balancer's readiness probe).
+
+    Starting at import time instead would run the warm-up thread in a
+    pre-fork master (``gunicorn --preload``): workers forked mid-import
+    inherit half-initialised modules and held import locks, and never
+    finish warming up.
+    """
+    def warm_up_on_first_request(environ, start_response):
+        start()
+        return application(environ, start_response)
+    return warm_up_on_first_request
+
+
+def _warm_up_in_background():
+    try:
+        warm_up()
+    finally:
+        # Connections are per thread; don't leave this thread's open
+        connections.close_all()
+
+
+def _reset_after_fork():
+    """
+    Give a forked child fresh locks and state. Threads do not survive fork,
+    so a warm-up the parent ran must not count as this process's.
+    """
+    global _lock, _llm_lock, _llm_checking
+    _lock = threading.Lock()
+    _llm_lock = threading.Lock()
+    _llm_checking = False
+    _state.update(status=STATUS_PENDING, started_at=None, duration=None, steps={}, error=None)
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def llm_status():
+    """
+    Ollama reachability, re-checked at most every ML_MODEL_LLM_CHECK_INTERVAL
+    seconds. Only one caller pings at a time, outside the lock; concurrent
+    callers get the previous result instead of waiting for the network.
+    """
+    from .ollama import OllamaError, get_ollama_client
+
+    global _llm_checking
+    interval = getattr(settings, 'ML_MODEL_LLM_CHECK_INTERVAL', DEFAULT_LLM_CHECK_INTERVAL)
+    with _llm_lock:
+        now = time.time()
+        due = _llm['checked_at'] is None or now - _llm['checked_at'] >= interval
+        if not due or _llm_checking:
+            return dict(_llm)
+        _llm_checking = True
+    try:
+        get_ollama_client().ping()
+        result = {'reachable': True, 'error': None}
+    except OllamaError as e:
+        result = {'reachable': False, 'error': str(e)}
+    except BaseException:
+        with _llm_lock:
+            _llm_checking = False
+        raise
+    with _llm_lock:
+        _llm.update(result, checked_at=now)
+        _llm_checking = False
+        return dict(_llm)
+
+
+def readiness():
+    """
+    Warm-up state, the loaded model and LLM reachability, for ``/healthz/ready``.
+
+    Always ready when ML_MODEL_WARM_UP is off, since nothing would ever
+    finish warming up.
+    """
+    from .registry import registry_stats
+
+    with _lock:
+        state = dict(_state, steps=dict(_state['steps']))
+    if not warm_up_enabled():
+        state['status'] = STATUS_DISABLED
+    stats = registry_stats()
+    return {
+        'ready': state['status'] in (STATUS_READY, STATUS_DISABLED),
+        **state,
+        'model_id': stats['model_id'],
+        'model_load_time': stats['last_load_time'],
+        'llm': llm_status(),
+    }
@@ -105,3 +105,117 @@ MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+# Seconds between checks for a newly activated ResumePredictor in each worker
+ML_MODEL_REGISTRY_CHECK_INTERVAL = 5.0
+
+# Model selection budgets for `train_resume_model --select`: single-row predict_proba p95
+# latency and memory allocated by loading the artifact
+ML_MODEL_MAX_LATENCY_MS = 50.0
+ML_MODEL_MAX_MEMORY_MB = 200.0
+# joblib compression level for saved model artifacts (0 = uncompressed)
+ML_MODEL_ARTIFACT_COMPRESSION = 3
+
+# Warm up each web worker (URLconf, model, skill matcher, parser pool) at startup; see /healthz/ready
+ML_MODEL_WARM_UP = True
+ML_MODEL_WARM_UP_ATTEMPTS = 5  # tries per warm-up step, with exponential backoff
+ML_MODEL_WARM_UP_RETRY_BACKOFF = 1.0  # seconds before the first retry
+ML_MODEL_LLM_CHECK_INTERVAL = 10.0  # seconds between Ollama reachability checks
+
+# JSON file mapping canonical skill ids to synonyms. The default ml_model/data/skills.json
+# is a seed list of about 120 skills; point this at a full taxonomy (thousands of skills,
+# e.g. converted from ESCO or O*NET) in the same format for production
+SKILL_TAXONOMY_PATH = os.path.join(BASE_DIR, 'ml_model', 'data', 'skills.json')
+
+# Stream LLM section evaluations to the result page instead of waiting for the full response
+STREAM_SECTION_EVALUATIONS = True
+
+# LLM response cache: in-memory LRU per worker backed by the CachedLLMResponse table
+LLM_CACHE_ENABLED = True
+LLM_CACHE_MEMORY_ENTRIES = 128
+LLM_CACHE_TTL = 7 * 24 * 60 * 60  # seconds
+LLM_CACHE_MAX_BYTES = 50 * 1024 * 1024
+LLM_CACHE_EVICT_EVERY = 50  # stores between size/TTL eviction passes on the persistent tier
+
+# Use temperature 0 and a fixed seed so identical inputs give identical answers. Off by
+# default (temperature 0.7); enable it to get LLM response caching, which only stores
+# responses in this mode
+LLM_DETERMINISTIC = False
+
+# Ask Ollama for JSON constrained to a schema (its ``format`` option) instead of free text
+LLM_STRUCTURED_OUTPUT = True
+
+# Context window (num_ctx) prompts are budgeted against; inputs are compacted and trimmed to fit
+LLM_CONTEXT_TOKENS = 8192
+
+# Ollama LLM server
+OLLAMA_BASE_URL = os.environ.get('OLLAMA_BASE_URL', 'http://10.1.1.126:11434')
+OLLAMA_MODEL = 'llama3.1'
+OLLAMA_CONNECT_TIMEOUT = 5  # seconds
+OLLAMA_READ_TIMEOUT = 300  # seconds without data before a generation is abandoned
+OLLAMA_MAX_RETRIES = 3  # connection failures only
+OLLAMA_RETRY_BACKOFF = 0.5
+OLLAMA_POOL_SIZE = 10
+
+# Threads per worker for blocking I/O (LLM calls) that runs alongside local ML work
+BACKGROUND_IO_WORKERS = 8
+
+# Background job worker (python manage.py run_job_worker)
+JOB_WORKER_CONCURRENCY = 2  # jobs run at once per worker process
+JOB_WORKER_POLL_INTERVAL = 1.0  # seconds
+JOB_STALE_AFTER = 60 * 60  # seconds before a running job is assumed lost and requeued
+
+# Keep every analysed resume (text, skills, keywords) for skill-based candidate search
+STORE_ANALYSED_RESUMES = True
+# Ids below the newest indexed resume that each search re-checks, for transactions that commit out of order
+SEARCH_SYNC_LOOKBACK = 1000
+
+# Resume text extraction limits, so a huge upload cannot stall a worker
+RESUME_MAX_PAGES = 20
+RESUME_MAX_CHARS = 100000
+
+# Hash uploads while they stream in so analyser.parse_cache can skip re-parsing known resumes
+FILE_UPLOAD_HANDLERS = [
+    'analyser.upload_handlers.HashingUploadHandler',
+    'django.core.files.uploadhandler.MemoryFileUploadHandler',
+    'django.core.files.uploadhandler.TemporaryFileUploadHandler',
+]
+
+# Parsed resume cache: in-memory LRU per worker backed by the ParsedResume table
+PARSE_CACHE_ENABLED = True
+PARSE_CACHE_MEMORY_ENTRIES = 256
+PARSE_CACHE_MAX_BYTES = 100 * 1024 * 1024
+PARSE_CACHE_EVICT_EVERY = 50  # stores between size eviction passes on the persistent tier
+
+# Resume parsing runs in a pool of separate processes (see analyser.parse_pool)
+PARSE_POOL_ENABLED = True
+PARSE_POOL_SIZE = 2  # parser processes per web worker
+PARSE_TIMEOUT = 30  # seconds before a parse is abandoned and its process killed
+PARSE_ACQUIRE_TIMEOUT = 10  # seconds a parse waits for a free parser process
+PARSE_WORKER_MAX_TASKS = 100  # parses before a parser process is replaced
+PARSE_WORKER_MEMORY_LIMIT = 1024 * 1024 * 1024  # bytes of address space per parser process
+
+# Serve per-stage latency histograms and cache counters at /metrics
+METRICS_ENABLED = True
+
+# Debug output (raw LLM responses, parsed results) is logged at DEBUG level;
+# set LOG_LEVEL=DEBUG to see it
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'analyser': {
+            'handlers': ['console'],
+            'level': os.environ.get('LOG_LEVEL', 'INFO'),
+        },
+        'ml_model': {
+            'handlers': ['console'],
+            'level': os.environ.get('LOG_LEVEL', 'INFO'),
+        },
+    },
+}
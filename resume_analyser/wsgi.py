@@ -14,3 +14,11 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'resume_analyser.settings')
 
 application = get_wsgi_application()
+
+# Each worker starts loading the model, skill matcher and parser pool in the
+# background on its first request (usually the readiness probe). Requests are
+# not held back meanwhile: the load balancer or orchestrator must only route
+# traffic to a worker once /healthz/ready answers 200. See ml_model.warmup
+from ml_model import warmup  # noqa: E402
+
+application = warmup.wsgi_application(application)